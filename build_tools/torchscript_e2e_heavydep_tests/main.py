@@ -4,11 +4,15 @@
 # Also available under a BSD-style license. See LICENSE.
 
 import argparse
+import hashlib
+import inspect
+import multiprocessing
 import os
 import pickle
 
 import torch
 
+from torch_mlir_e2e_test.file_utils import write_file_atomically
 from torch_mlir_e2e_test.torchscript.registry import GLOBAL_TEST_REGISTRY
 from torch_mlir_e2e_test.torchscript.framework import SerializableTest, generate_golden_trace
 from torch_mlir_e2e_test.torchscript.annotations import extract_serializable_annotations
@@ -20,27 +24,85 @@ def _get_argparse():
     parser = argparse.ArgumentParser(
         description="Generate assets for TorchScript E2E tests")
     parser.add_argument("--output_dir", help="The directory to put assets in.")
+    parser.add_argument("-j", "--jobs",
+                        default=os.cpu_count(),
+                        type=int,
+                        help="Number of tests to generate in parallel.")
+    parser.add_argument("--force",
+                        default=False,
+                        action="store_true",
+                        help="""
+Regenerate all tests, even those whose source and PyTorch version are
+unchanged since the last run.
+""")
     return parser
 
 
+def _compute_test_stamp(test) -> str:
+    """Compute a stamp identifying the inputs used to generate `test`.
+
+    The stamp covers the source file defining the test and the PyTorch
+    version, which together determine the generated program and trace.
+    """
+    h = hashlib.sha256()
+    h.update(torch.__version__.encode())
+    with open(inspect.getsourcefile(test.program_invoker), "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def _generate_serialized_test(test_index_and_output_dir):
+    test_index, output_dir = test_index_and_output_dir
+    # Tests are not picklable (they hold arbitrary callables), so workers look
+    # them up in the registry inherited from the parent process.
+    test = GLOBAL_TEST_REGISTRY[test_index]
+    trace = generate_golden_trace(test)
+    module = torch.jit.script(test.program_factory())
+    torchscript_module_bytes = module.save_to_buffer({
+        "annotations.pkl":
+        pickle.dumps(extract_serializable_annotations(module))
+    })
+    serializable_test = SerializableTest(unique_name=test.unique_name,
+                                         program=torchscript_module_bytes,
+                                         trace=trace)
+    # Write the stamp only after the test itself, so that an interrupted run
+    # never leaves a stamp for a stale or missing test.
+    write_file_atomically(
+        os.path.join(output_dir, f"{test.unique_name}.pkl"),
+        pickle.dumps(serializable_test))
+    write_file_atomically(
+        os.path.join(output_dir, f"{test.unique_name}.stamp"),
+        _compute_test_stamp(test).encode())
+    return test.unique_name
+
+
+def _is_up_to_date(test, output_dir: str) -> bool:
+    stamp_path = os.path.join(output_dir, f"{test.unique_name}.stamp")
+    if not os.path.exists(os.path.join(output_dir, f"{test.unique_name}.pkl")):
+        return False
+    if not os.path.exists(stamp_path):
+        return False
+    with open(stamp_path, "rb") as f:
+        return f.read().decode() == _compute_test_stamp(test)
+
+
 def main():
     args = _get_argparse().parse_args()
-    serializable_tests = []
-    for test in GLOBAL_TEST_REGISTRY:
-        trace = generate_golden_trace(test)
-        module = torch.jit.script(test.program_factory())
-        torchscript_module_bytes = module.save_to_buffer({
-            "annotations.pkl":
-            pickle.dumps(extract_serializable_annotations(module))
-        })
-        serializable_tests.append(
-            SerializableTest(unique_name=test.unique_name,
-                             program=torchscript_module_bytes,
-                             trace=trace))
-    for test in serializable_tests:
-        with open(os.path.join(args.output_dir, f"{test.unique_name}.pkl"),
-                  "wb") as f:
-            pickle.dump(test, f)
+    os.makedirs(args.output_dir, exist_ok=True)
+    work_items = []
+    for i, test in enumerate(GLOBAL_TEST_REGISTRY):
+        if not args.force and _is_up_to_date(test, args.output_dir):
+            print(f"Skipping up-to-date test {test.unique_name}")
+            continue
+        work_items.append((i, args.output_dir))
+    if not work_items:
+        return
+    # Use "fork" so that workers inherit the registry populated by the test
+    # imports above.
+    with multiprocessing.get_context("fork").Pool(args.jobs) as pool:
+        for unique_name in pool.imap_unordered(_generate_serialized_test,
+                                               work_items):
+            print(f"Generated test {unique_name}")
 
 
 if __name__ == "__main__":
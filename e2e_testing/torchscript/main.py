@@ -10,7 +10,7 @@ import re
 import sys
 
 from torch_mlir_e2e_test.torchscript.framework import TestConfig, run_tests
-from torch_mlir_e2e_test.torchscript.reporting import report_results
+from torch_mlir_e2e_test.torchscript.reporting import report_results, report_compile_profile, report_fast_compile_savings
 from torch_mlir_e2e_test.torchscript.registry import GLOBAL_TEST_REGISTRY
 
 # Available test configs.
@@ -87,6 +87,32 @@ Regular expression specifying which tests to include in this run.
                         default=False,
                         action='store_true',
                         help='report test results with additional detail')
+    parser.add_argument('--profile-compile',
+                        default=False,
+                        action='store_true',
+                        help='''
+Profile the pass pipelines run while compiling each test, and report the
+compile time of the suite aggregated by pass.
+''')
+    parser.add_argument('--fast-compile',
+                        default=False,
+                        action='store_true',
+                        help='''
+Only run the optimizations needed for correctness when lowering (for the
+"refbackend" and "tosa" configs), to minimize compile time. Together with
+`--profile-compile`, the tests are also compiled with the default
+optimizations, and the compile time saved is reported.
+''')
+    parser.add_argument('--cache-dir', default=None, type=str, help='''
+A directory to cache the Torch backend contract IR of each test in (for the
+"refbackend" and "tosa" configs). Tests whose program is unchanged since an
+earlier run then skip importing and lowering it to that form.
+''')
+    parser.add_argument('--backend-legal-ops', default='', type=str, help='''
+A comma-separated list of ops (e.g. "torch.aten.softmax.int") to keep intact
+instead of decomposing them when lowering to the Torch backend contract (for
+the "refbackend" and "tosa" configs).
+''')
     parser.add_argument('--serialized-test-dir', default=None, type=str, help='''
 The directory containing serialized pre-built tests.
 Right now, these are additional tests which require heavy Python dependencies
@@ -97,6 +123,21 @@ for more information on building these artifacts.
 ''')
     return parser
 
+def _create_backend_config(config_name, fast_compile, cache_dir,
+                           backend_legal_ops):
+    """Creates the "refbackend" or "tosa" config with a fresh backend."""
+    if config_name == 'refbackend':
+        return LinalgOnTensorsBackendTestConfig(
+            RefBackendLinalgOnTensorsBackend(cache_pass_managers=True),
+            fast_compile=fast_compile,
+            cache_dir=cache_dir,
+            backend_legal_ops=backend_legal_ops)
+    return TosaBackendTestConfig(
+        LinalgOnTensorsTosaBackend(cache_pass_managers=True),
+        fast_compile=fast_compile,
+        cache_dir=cache_dir,
+        backend_legal_ops=backend_legal_ops)
+
 def main():
     args = _get_argparse().parse_args()
 
@@ -104,16 +145,23 @@ def main():
     if args.serialized_test_dir:
         for root, dirs, files in os.walk(args.serialized_test_dir):
             for filename in files:
+                # Skip bookkeeping files (such as the `.stamp` files used for
+                # incremental generation) written next to the tests.
+                if not filename.endswith('.pkl'):
+                    continue
                 with open(os.path.join(root, filename), 'rb') as f:
                     all_tests.append(pickle.load(f).as_test())
     all_test_unique_names = set(test.unique_name for test in all_tests)
+    backend_legal_ops = [op for op in args.backend_legal_ops.split(',') if op]
 
     # Find the selected config.
     if args.config == 'refbackend':
-        config = LinalgOnTensorsBackendTestConfig(RefBackendLinalgOnTensorsBackend())
+        config = _create_backend_config(args.config, args.fast_compile,
+                                        args.cache_dir, backend_legal_ops)
         xfail_set = REFBACKEND_XFAIL_SET
     if args.config == 'tosa':
-        config = TosaBackendTestConfig(LinalgOnTensorsTosaBackend())
+        config = _create_backend_config(args.config, args.fast_compile,
+                                        args.cache_dir, backend_legal_ops)
         xfail_set = all_test_unique_names - TOSA_PASS_SET
     elif args.config == 'native_torch':
         config = NativeTorchTestConfig()
@@ -155,10 +203,25 @@ def main():
         sys.exit(1)
 
     # Run the tests.
-    results = run_tests(tests, config)
+    results = run_tests(tests, config, profile_compile=args.profile_compile)
 
     # Report the test results.
     failed = report_results(results, xfail_set, args.verbose)
+    if args.profile_compile:
+        report_compile_profile(results)
+    if args.profile_compile and args.fast_compile and \
+            args.config in ('refbackend', 'tosa'):
+        # Compile the same tests with the default optimizations for comparison.
+        # The baseline gets its own backend and session, so that it doesn't
+        # reuse the pass managers built for the fast pipelines, and doesn't
+        # use the cache, which would skip the lowering being compared.
+        default_config = _create_backend_config(
+            args.config, fast_compile=False, cache_dir=None,
+            backend_legal_ops=backend_legal_ops)
+        default_results = run_tests(tests, default_config,
+                                    profile_compile=True,
+                                    compile_only=True)
+        report_fast_compile_savings(results, default_results)
     sys.exit(1 if failed else 0)
 
 if __name__ == '__main__':
@@ -10,6 +10,7 @@ import torchvision.models as models
 from torchvision import transforms
 
 from torch_mlir.dialects.torch.importer.jit_ir import ClassAnnotator, ModuleBuilder
+from torch_mlir.dialects.torch.importer.jit_ir.torchscript_annotations import annotate_args_from_example_inputs
 
 from torch_mlir.passmanager import PassManager
 from torch_mlir_e2e_test.linalg_on_tensors_backends import refbackend
@@ -96,14 +97,11 @@ torch.jit.save(recursivescriptmodule, "/tmp/foo.pt")
 
 class_annotator.exportNone(recursivescriptmodule._c._type())
 class_annotator.exportPath(recursivescriptmodule._c._type(), ["forward"])
-class_annotator.annotateArgs(
-    recursivescriptmodule._c._type(),
-    ["forward"],
-    [
-        None,
-        ([-1, -1, -1, -1], torch.float32, True),
-    ],
-)
+# Use static shapes from the example image, except for the batch dimension.
+# ResNet doesn't mutate its input, so the input has value semantics.
+annotate_args_from_example_inputs(recursivescriptmodule, class_annotator,
+                                  [img], dynamic_dims={0: [0]},
+                                  value_semantics=True)
 # TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
 mb.import_module(recursivescriptmodule._c, class_annotator)
 
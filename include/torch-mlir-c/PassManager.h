@@ -0,0 +1,36 @@
+/*===-- torch-mlir-c/PassManager.h - PassManager extensions -------*- C -*-===*\
+|*                                                                            *|
+|* Part of the LLVM Project, under the Apache License v2.0 with LLVM          *|
+|* Exceptions.                                                                *|
+|* See https://llvm.org/LICENSE.txt for license information.                  *|
+|* SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception                    *|
+|*                                                                            *|
+\*===----------------------------------------------------------------------===*/
+
+#ifndef TORCHMLIR_C_PASSMANAGER_H
+#define TORCHMLIR_C_PASSMANAGER_H
+
+#include "mlir-c/Pass.h"
+#include "mlir-c/Support.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/** Enables MLIR's crash reproducer generation on `passManager`.
+ *
+ * If a pass fails (or crashes), a reproducer containing the IR and the pass
+ * pipeline is written to `outputFile`. Nothing is written if the pipeline
+ * succeeds. Unless `genLocalReproducer` is set, the IR in the reproducer is
+ * the input to the whole pipeline, which the pass manager keeps as an
+ * in-memory clone while running.
+ */
+MLIR_CAPI_EXPORTED void torchMlirPassManagerEnableCrashReproducerGeneration(
+    MlirPassManager passManager, MlirStringRef outputFile,
+    bool genLocalReproducer);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // TORCHMLIR_C_PASSMANAGER_H
@@ -0,0 +1,75 @@
+/*===-- torch-mlir-c/PassProfiling.h - Pass profiling ------------*- C -*-===*\
+|*                                                                            *|
+|* Part of the LLVM Project, under the Apache License v2.0 with LLVM          *|
+|* Exceptions.                                                                *|
+|* See https://llvm.org/LICENSE.txt for license information.                  *|
+|* SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception                    *|
+|*                                                                            *|
+\*===----------------------------------------------------------------------===*/
+
+#ifndef TORCHMLIR_C_PASSPROFILING_H
+#define TORCHMLIR_C_PASSPROFILING_H
+
+#include "mlir-c/IR.h"
+#include "mlir-c/Pass.h"
+#include "mlir-c/Support.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/** Per-pass timings and statistics collected from a PassManager.
+ *
+ * Entries are keyed by the pass argument (e.g. "torch-refine-types") and are
+ * accumulated across all operations the pass ran on. When the pass manager
+ * runs multithreaded, the times of parallel pass instances are summed.
+ */
+typedef struct TorchMlirPassProfile {
+  void *ptr;
+} TorchMlirPassProfile;
+
+/** Instruments `passManager` to record into a new profile.
+ * The profile must be destroyed with `torchMlirPassProfileDestroy`. It may
+ * outlive the pass manager.
+ */
+MLIR_CAPI_EXPORTED TorchMlirPassProfile
+torchMlirPassManagerEnableProfiling(MlirPassManager passManager);
+
+/** Destroys a profile created by `torchMlirPassManagerEnableProfiling`. */
+MLIR_CAPI_EXPORTED void torchMlirPassProfileDestroy(TorchMlirPassProfile profile);
+
+/** Returns the number of distinct passes that have run, in first-run order. */
+MLIR_CAPI_EXPORTED intptr_t
+torchMlirPassProfileGetNumPasses(TorchMlirPassProfile profile);
+
+/** Returns the argument of the pass at `pos`. */
+MLIR_CAPI_EXPORTED MlirStringRef
+torchMlirPassProfileGetPassName(TorchMlirPassProfile profile, intptr_t pos);
+
+/** Returns the accumulated wall time, in seconds, of the pass at `pos`. */
+MLIR_CAPI_EXPORTED double
+torchMlirPassProfileGetPassSeconds(TorchMlirPassProfile profile, intptr_t pos);
+
+/** Returns the number of distinct pass statistics that were recorded. */
+MLIR_CAPI_EXPORTED intptr_t
+torchMlirPassProfileGetNumStatistics(TorchMlirPassProfile profile);
+
+/** Returns the name, of the form "<pass-argument>.<statistic>", of the
+ * statistic at `pos`.
+ */
+MLIR_CAPI_EXPORTED MlirStringRef
+torchMlirPassProfileGetStatisticName(TorchMlirPassProfile profile,
+                                     intptr_t pos);
+
+/** Returns the accumulated value of the statistic at `pos`.
+ * Statistics are only tracked when LLVM is built with statistics enabled;
+ * otherwise they are always zero.
+ */
+MLIR_CAPI_EXPORTED uint64_t torchMlirPassProfileGetStatisticValue(
+    TorchMlirPassProfile profile, intptr_t pos);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // TORCHMLIR_C_PASSPROFILING_H
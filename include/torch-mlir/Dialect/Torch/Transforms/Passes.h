@@ -29,6 +29,23 @@ struct TorchLoweringPipelineOptions
   // If this option is false, only do the bare minimum for correctness.
   Option<bool> optimize{*this, "optimize", llvm::cl::desc("Do optimizations."),
                         llvm::cl::init(true)};
+  // Ops that the backend handles itself, and that are thus kept intact
+  // instead of being decomposed.
+  ListOption<std::string> backendLegalOps{
+      *this, "backend-legal-ops",
+      llvm::cl::desc("List of ops (e.g. `torch.aten.softmax.int`) to be "
+                     "considered legal for the backend, which are then not "
+                     "decomposed."),
+      llvm::cl::ZeroOrMore};
+  // If this option is true (and `optimize` is true), then only run the
+  // optimizations that are currently needed for correctness (see `OPT-ONLY`),
+  // skipping the ones that only improve the generated code as well as
+  // repeated cleanup rounds. This trades code quality for compile time.
+  Option<bool> fastCompile{
+      *this, "fast-compile",
+      llvm::cl::desc("Minimize compile time by only running the "
+                     "optimizations needed for correctness."),
+      llvm::cl::init(false)};
 };
 
 /// Creates a pipeline that lowers the object graph IR that is produced by
@@ -58,12 +75,19 @@ std::unique_ptr<OperationPass<FuncOp>> createMaximizeValueSemanticsPass();
 
 std::unique_ptr<OperationPass<ModuleOp>> createRefinePublicReturnPass();
 
-std::unique_ptr<OperationPass<FuncOp>> createDecomposeComplexOpsPass();
+std::unique_ptr<OperationPass<FuncOp>>
+createDecomposeComplexOpsPass(ArrayRef<std::string> legalOps = {});
+
+std::unique_ptr<OperationPass<FuncOp>> createEvaluateConstantTensorOpsPass();
+
+std::unique_ptr<OperationPass<FuncOp>> createFoldBatchNormPass();
 
 std::unique_ptr<OperationPass<ModuleOp>> createPreprocessShapeLibraryPass();
 
 std::unique_ptr<OperationPass<ModuleOp>> createReifyShapeCalculationsPass();
 
+std::unique_ptr<OperationPass<ModuleOp>> createInlineShapeFunctionsPass();
+
 std::unique_ptr<OperationPass<FuncOp>> createSimplifyShapeCalculationsPass();
 
 std::unique_ptr<OperationPass<FuncOp>> createDropShapeCalculationsPass();
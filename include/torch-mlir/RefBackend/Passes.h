@@ -26,6 +26,8 @@ std::unique_ptr<OperationPass<FuncOp>> createExpandOpsForLLVMPass();
 
 std::unique_ptr<OperationPass<ModuleOp>> createInsertRngGlobalsPass();
 
+std::unique_ptr<OperationPass<ModuleOp>> createExpandExternalLiteralsPass();
+
 std::unique_ptr<OperationPass<FuncOp>> createMungeMemrefCopyPass();
 } // namespace RefBackend
 } // namespace torch
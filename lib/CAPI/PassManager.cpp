@@ -0,0 +1,24 @@
+//===- PassManager.cpp - C Interface for PassManager extensions -----------===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+
+#include "torch-mlir-c/PassManager.h"
+
+#include "mlir/CAPI/Pass.h"
+#include "mlir/CAPI/Support.h"
+#include "mlir/Pass/PassManager.h"
+
+using namespace mlir;
+
+void torchMlirPassManagerEnableCrashReproducerGeneration(
+    MlirPassManager passManager, MlirStringRef outputFile,
+    bool genLocalReproducer) {
+  unwrap(passManager)
+      ->enableCrashReproducerGeneration(unwrap(outputFile),
+                                        genLocalReproducer);
+}
@@ -0,0 +1,132 @@
+//===- PassProfiling.cpp - C Interface for pass profiling -----------------===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+
+#include "torch-mlir-c/PassProfiling.h"
+
+#include "mlir/CAPI/Pass.h"
+#include "mlir/CAPI/Support.h"
+#include "mlir/Pass/PassInstrumentation.h"
+#include "mlir/Pass/PassManager.h"
+#include "llvm/ADT/DenseMap.h"
+#include "llvm/ADT/MapVector.h"
+#include "llvm/ADT/STLExtras.h"
+
+#include <chrono>
+#include <memory>
+#include <mutex>
+
+using namespace mlir;
+
+namespace {
+struct PassProfileData {
+  struct InFlightPass {
+    std::chrono::steady_clock::time_point start;
+    SmallVector<uint64_t> statistics;
+  };
+
+  std::mutex mutex;
+  // Keyed by pass argument, in the order passes first ran.
+  llvm::MapVector<std::string, double> passSeconds;
+  llvm::MapVector<std::string, uint64_t> statistics;
+  // A pass instance is never run on two operations at once (the pass manager
+  // clones passes for each thread), so the pass pointer is a unique key.
+  DenseMap<Pass *, InFlightPass> inFlight;
+};
+
+class PassProfilingInstrumentation : public PassInstrumentation {
+public:
+  PassProfilingInstrumentation(std::shared_ptr<PassProfileData> data)
+      : data(std::move(data)) {}
+
+  void runBeforePass(Pass *pass, Operation *op) override {
+    // Pass adaptors have no argument and only contribute the sum of the
+    // nested passes, which are recorded individually.
+    if (pass->getArgument().empty())
+      return;
+    std::lock_guard<std::mutex> lock(data->mutex);
+    PassProfileData::InFlightPass &entry = data->inFlight[pass];
+    entry.statistics.clear();
+    for (Pass::Statistic *statistic : pass->getStatistics())
+      entry.statistics.push_back(statistic->getValue());
+    entry.start = std::chrono::steady_clock::now();
+  }
+  void runAfterPass(Pass *pass, Operation *op) override { record(pass); }
+  void runAfterPassFailed(Pass *pass, Operation *op) override { record(pass); }
+
+private:
+  void record(Pass *pass) {
+    if (pass->getArgument().empty())
+      return;
+    auto end = std::chrono::steady_clock::now();
+    std::lock_guard<std::mutex> lock(data->mutex);
+    auto it = data->inFlight.find(pass);
+    if (it == data->inFlight.end())
+      return;
+    std::string passName = pass->getArgument().str();
+    data->passSeconds[passName] +=
+        std::chrono::duration<double>(end - it->second.start).count();
+    for (auto statistic : llvm::enumerate(pass->getStatistics())) {
+      std::string name = passName + "." + statistic.value()->getName();
+      data->statistics[name] += statistic.value()->getValue() -
+                                it->second.statistics[statistic.index()];
+    }
+    data->inFlight.erase(it);
+  }
+
+  std::shared_ptr<PassProfileData> data;
+};
+} // namespace
+
+// The profile handle owns a reference to the data; the instrumentation
+// (owned by the pass manager) holds another.
+static std::shared_ptr<PassProfileData> &unwrap(TorchMlirPassProfile profile) {
+  return *static_cast<std::shared_ptr<PassProfileData> *>(profile.ptr);
+}
+
+TorchMlirPassProfile
+torchMlirPassManagerEnableProfiling(MlirPassManager passManager) {
+  auto *data = new std::shared_ptr<PassProfileData>(
+      std::make_shared<PassProfileData>());
+  unwrap(passManager)
+      ->addInstrumentation(
+          std::make_unique<PassProfilingInstrumentation>(*data));
+  return TorchMlirPassProfile{data};
+}
+
+void torchMlirPassProfileDestroy(TorchMlirPassProfile profile) {
+  delete static_cast<std::shared_ptr<PassProfileData> *>(profile.ptr);
+}
+
+intptr_t torchMlirPassProfileGetNumPasses(TorchMlirPassProfile profile) {
+  return unwrap(profile)->passSeconds.size();
+}
+
+MlirStringRef torchMlirPassProfileGetPassName(TorchMlirPassProfile profile,
+                                              intptr_t pos) {
+  return wrap(StringRef((unwrap(profile)->passSeconds.begin() + pos)->first));
+}
+
+double torchMlirPassProfileGetPassSeconds(TorchMlirPassProfile profile,
+                                          intptr_t pos) {
+  return (unwrap(profile)->passSeconds.begin() + pos)->second;
+}
+
+intptr_t torchMlirPassProfileGetNumStatistics(TorchMlirPassProfile profile) {
+  return unwrap(profile)->statistics.size();
+}
+
+MlirStringRef torchMlirPassProfileGetStatisticName(TorchMlirPassProfile profile,
+                                                   intptr_t pos) {
+  return wrap(StringRef((unwrap(profile)->statistics.begin() + pos)->first));
+}
+
+uint64_t torchMlirPassProfileGetStatisticValue(TorchMlirPassProfile profile,
+                                               intptr_t pos) {
+  return (unwrap(profile)->statistics.begin() + pos)->second;
+}
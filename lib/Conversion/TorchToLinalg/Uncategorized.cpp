@@ -23,11 +23,75 @@
 #include "torch-mlir/Dialect/Torch/IR/TorchOps.h"
 #include "torch-mlir/Dialect/Torch/Utils/TorchUpstream.h"
 #include "torch-mlir/Dialect/Torch/Utils/Utils.h"
+#include "torch-mlir/Dialect/TorchConversion/IR/TorchConversionOps.h"
 
 using namespace mlir;
 using namespace mlir::torch;
 using namespace mlir::torch::Torch;
 
+namespace {
+// A symbolic identity for the runtime size of a tensor dimension: the size of
+// dimension `dim` of `tensor`.
+//
+// Statically, sizes can only be refined to constants or to "unknown". But the
+// linalg ops produced by this lowering take their result sizes from the sizes
+// of their operands, so by following results back to the sizes they were
+// created with, we can recognize that e.g. dimension 0 of every tensor in a
+// chain of elementwise ops is the (dynamic) batch size of the input. Sizes
+// with the same identity are equal at runtime and need no checks.
+struct SymbolicDim {
+  Value tensor;
+  int64_t dim;
+};
+} // namespace
+
+static bool isSameTensor(Value a, Value b) {
+  if (a == b)
+    return true;
+  // Type conversion can materialize several builtin tensors for the same
+  // `!torch.vtensor`.
+  auto aToBuiltin = a.getDefiningOp<TorchConversion::ToBuiltinTensorOp>();
+  auto bToBuiltin = b.getDefiningOp<TorchConversion::ToBuiltinTensorOp>();
+  return aToBuiltin && bToBuiltin &&
+         aToBuiltin.operand() == bToBuiltin.operand();
+}
+
+static SymbolicDim getSymbolicDim(Value tensor, int64_t dim) {
+  while (Operation *op = tensor.getDefiningOp()) {
+    if (auto cast = dyn_cast<tensor::CastOp>(op)) {
+      tensor = cast.source();
+      continue;
+    }
+    if (auto toBuiltin = dyn_cast<TorchConversion::ToBuiltinTensorOp>(op)) {
+      auto fromBuiltin =
+          toBuiltin.operand()
+              .getDefiningOp<TorchConversion::FromBuiltinTensorOp>();
+      if (!fromBuiltin)
+        break;
+      tensor = fromBuiltin.operand();
+      continue;
+    }
+    // The results of linalg ops on tensors have the sizes of their outs.
+    if (auto linalgOp = dyn_cast<linalg::LinalgOp>(op)) {
+      unsigned resultNumber = tensor.cast<OpResult>().getResultNumber();
+      tensor = linalgOp.getOutputOperand(resultNumber)->get();
+      continue;
+    }
+    if (auto initTensor = dyn_cast<linalg::InitTensorOp>(op)) {
+      auto size = initTensor.getMixedSizes()[dim].dyn_cast<Value>();
+      auto dimOp = size ? size.getDefiningOp<tensor::DimOp>() : nullptr;
+      Optional<int64_t> index = dimOp ? dimOp.getConstantIndex() : None;
+      if (!index)
+        break;
+      tensor = dimOp.source();
+      dim = *index;
+      continue;
+    }
+    break;
+  }
+  return {tensor, dim};
+}
+
 static Value createElementwiseLinalgGeneric(
     OpBuilder &b, Location loc, ValueRange tensorOperands,
     Type resultElementType,
@@ -66,6 +130,8 @@ static Value createElementwiseLinalgGeneric(
   // all sizes along that result dimension are statically 1.
   auto c1 = b.create<arith::ConstantIndexOp>(loc, /*value=*/1);
   SmallVector<Value> resultShape(resultRank, c1);
+  // The symbolic identity of each non-1 entry of `resultShape`.
+  SmallVector<SymbolicDim> resultSymbolicDims(resultRank);
   SmallVector<AffineMap> indexingMaps;
   for (Value tensorOperand : tensorOperands) {
     SmallVector<AffineExpr> exprs;
@@ -91,8 +157,11 @@ static Value createElementwiseLinalgGeneric(
 
       // Now, we need to ensure that such iteration is not going to trigger
       // undefined behavior, by doing appropriate checks against the current
-      // dimension size.
-      auto currentDimSize = getDimOp(b, loc, tensorOperand, size.index());
+      // dimension size. We take the size from the tensor it originates from,
+      // so that equal sizes are computed (and CSE'd) from a single source.
+      SymbolicDim symbolicDim = getSymbolicDim(tensorOperand, size.index());
+      auto currentDimSize =
+          getDimOp(b, loc, symbolicDim.tensor, symbolicDim.dim);
 
       // If the result size of this dimension has so far only hit the
       // statically-known-to-be-1 case above (i.e., we have not yet assigned a
@@ -101,9 +170,16 @@ static Value createElementwiseLinalgGeneric(
       // dimension size.
       if (resultShape[resultDim] == c1) {
         resultShape[resultDim] = currentDimSize;
+        resultSymbolicDims[resultDim] = symbolicDim;
         continue;
       }
 
+      // Sizes that are symbolically the same are equal at runtime.
+      SymbolicDim &resultSymbolicDim = resultSymbolicDims[resultDim];
+      if (resultSymbolicDim.dim == symbolicDim.dim &&
+          isSameTensor(resultSymbolicDim.tensor, symbolicDim.tensor))
+        continue;
+
       // We prohibit the size-1 dynamic broadcasting scenario, so just check
       // for exact equality with the running result size.
       // This is the check which protects against the undefined behavior of
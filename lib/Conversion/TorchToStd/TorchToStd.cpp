@@ -18,6 +18,7 @@
 #include "torch-mlir/Dialect/Torch/IR/TorchDialect.h"
 #include "torch-mlir/Dialect/Torch/IR/TorchOps.h"
 #include "torch-mlir/Dialect/TorchConversion/IR/TorchConversionDialect.h"
+#include "torch-mlir/Dialect/TorchConversion/IR/TorchConversionOps.h"
 #include "torch-mlir/Dialect/TorchConversion/Transforms/BackendTypeConversion.h"
 
 using namespace mlir;
@@ -129,12 +130,47 @@ public:
         }
       }
     }
+    if (auto elements = op.valueAttr().dyn_cast<SparseElementsAttr>()) {
+      // Keep the constant sparse, only converting integer values to signless.
+      // The result is an ordinary (dense) tensor value.
+      if (auto intType = elements.getElementType().dyn_cast<IntegerType>()) {
+        unsigned bitWidth = intType.getWidth();
+        Type builtinTensorElemTy = IntegerType::get(context, bitWidth);
+        auto values = elements.getValues().cast<DenseIntElementsAttr>();
+        rewriter.replaceOpWithNewOp<arith::ConstantOp>(
+            op, SparseElementsAttr::get(
+                    RankedTensorType::get(elements.getType().getShape(),
+                                          builtinTensorElemTy),
+                    elements.getIndices(),
+                    values.mapValues(builtinTensorElemTy, [&](const APInt &v) {
+                      return APInt(bitWidth, v.getSExtValue());
+                    })));
+        return success();
+      }
+    }
     rewriter.replaceOpWithNewOp<arith::ConstantOp>(op, op.valueAttr());
     return success();
   }
 };
 } // namespace
 
+namespace {
+class ConvertTorchTensorExternalLiteralOp
+    : public OpConversionPattern<ValueTensorExternalLiteralOp> {
+public:
+  using OpConversionPattern<ValueTensorExternalLiteralOp>::OpConversionPattern;
+  using OpAdaptor = ValueTensorExternalLiteralOp::Adaptor;
+  LogicalResult
+  matchAndRewrite(ValueTensorExternalLiteralOp op, OpAdaptor adaptor,
+                  ConversionPatternRewriter &rewriter) const override {
+    Type resultType = getTypeConverter()->convertType(op.getType());
+    rewriter.replaceOpWithNewOp<TorchConversion::ExternalLiteralOp>(
+        op, resultType, op.pathAttr(), op.offsetAttr());
+    return success();
+  }
+};
+} // namespace
+
 namespace {
 template <typename OpTy>
 class ConvertTorchConstantOp : public OpConversionPattern<OpTy> {
@@ -193,6 +229,9 @@ public:
         typeConverter, context);
     target.addIllegalOp<ValueTensorLiteralOp>();
     patterns.add<ConvertTorchTensorLiteralOp>(typeConverter, context);
+    target.addIllegalOp<ValueTensorExternalLiteralOp>();
+    target.addLegalOp<TorchConversion::ExternalLiteralOp>();
+    patterns.add<ConvertTorchTensorExternalLiteralOp>(typeConverter, context);
 
     target.addIllegalOp<ConstantBoolOp>();
     patterns.add<ConvertTorchConstantOp<ConstantBoolOp>>(typeConverter,
@@ -993,6 +993,21 @@ OpFoldResult ValueTensorLiteralOp::fold(ArrayRef<Attribute> operands) {
   return valueAttr();
 }
 
+//===----------------------------------------------------------------------===//
+// ValueTensorExternalLiteralOp
+//===----------------------------------------------------------------------===//
+
+LogicalResult ValueTensorExternalLiteralOp::verify() {
+  auto type = getType().cast<ValueTensorType>();
+  if (!type.hasSizes() || !type.hasDtype() ||
+      llvm::any_of(type.getSizes(),
+                   [](int64_t size) { return size == kUnknownSize; }))
+    return emitError() << "result type must have static sizes and a dtype";
+  if (offset() < 0)
+    return emitError() << "offset must be non-negative";
+  return success();
+}
+
 //----------------------------------------------------------------------------//
 // TensorStaticInfoCast
 //----------------------------------------------------------------------------//
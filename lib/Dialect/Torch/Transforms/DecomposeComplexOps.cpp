@@ -1432,6 +1432,11 @@ public:
 namespace {
 class DecomposeComplexOpsPass
     : public DecomposeComplexOpsBase<DecomposeComplexOpsPass> {
+public:
+  DecomposeComplexOpsPass() = default;
+  DecomposeComplexOpsPass(ArrayRef<std::string> legalOps) {
+    this->legalOps = legalOps;
+  }
   void runOnOperation() override {
     MLIRContext *context = &getContext();
     RewritePatternSet patterns(context);
@@ -1535,6 +1540,18 @@ class DecomposeComplexOpsPass
     patterns.add<DecomposeAtenIndexPutOp>(context);
     target.addIllegalOp<AtenIndexPutOp>();
 
+    // Keep the ops that the backend asked for intact. Names that don't refer
+    // to a registered op (e.g. `torch.aten.softmax` instead of
+    // `torch.aten.softmax.int`) would otherwise be silently ignored.
+    for (const std::string &opName : legalOps) {
+      if (!context->isOperationRegistered(opName)) {
+        getOperation().emitError()
+            << "unknown op '" << opName << "' in legal-ops";
+        return signalPassFailure();
+      }
+      target.addLegalOp(OperationName(opName, context));
+    }
+
     if (failed(applyPartialConversion(getOperation(), target,
                                       std::move(patterns)))) {
       return signalPassFailure();
@@ -1543,6 +1560,7 @@ class DecomposeComplexOpsPass
 };
 } // namespace
 std::unique_ptr<OperationPass<FuncOp>>
-mlir::torch::Torch::createDecomposeComplexOpsPass() {
-  return std::make_unique<DecomposeComplexOpsPass>();
+mlir::torch::Torch::createDecomposeComplexOpsPass(
+    ArrayRef<std::string> legalOps) {
+  return std::make_unique<DecomposeComplexOpsPass>(legalOps);
 }
@@ -0,0 +1,316 @@
+//===----------------------------------------------------------------------===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+
+#include "PassDetail.h"
+
+#include "mlir/IR/BuiltinOps.h"
+#include "mlir/IR/PatternMatch.h"
+#include "mlir/Transforms/GreedyPatternRewriteDriver.h"
+#include "torch-mlir/Dialect/Torch/IR/TorchOps.h"
+#include "torch-mlir/Dialect/Torch/Transforms/Passes.h"
+#include "torch-mlir/Dialect/Torch/Utils/Utils.h"
+#include "llvm/ADT/APSInt.h"
+
+using namespace mlir;
+using namespace mlir::torch;
+using namespace mlir::torch::Torch;
+
+// Returns the elements of `value` if it is defined by a dense literal.
+static DenseElementsAttr getDenseLiteralElements(Value value) {
+  auto literal = value.getDefiningOp<ValueTensorLiteralOp>();
+  if (!literal)
+    return nullptr;
+  return literal.valueAttr().dyn_cast<DenseElementsAttr>();
+}
+
+// Returns the builtin tensor type of the literal for `value`, or null if
+// `value` doesn't have a fully static value tensor type.
+static RankedTensorType getLiteralType(Value value) {
+  auto tensorType = value.getType().dyn_cast<ValueTensorType>();
+  if (!tensorType || !tensorType.areAllSizesKnown() || !tensorType.hasDtype())
+    return nullptr;
+  return RankedTensorType::get(tensorType.getSizes(), tensorType.getDtype());
+}
+
+template <typename T>
+static SmallVector<T> getElementValues(DenseElementsAttr elements) {
+  if (elements.isSplat())
+    return {elements.getSplatValue<T>()};
+  auto values = elements.getValues<T>();
+  return SmallVector<T>(values.begin(), values.end());
+}
+
+// Returns `elements` with the dimensions permuted by `permutation`, where
+// dimension `i` of the result is dimension `permutation[i]` of `elements`.
+template <typename T>
+static DenseElementsAttr permuteElements(DenseElementsAttr elements,
+                                         ArrayRef<int64_t> permutation,
+                                         RankedTensorType resultType) {
+  SmallVector<T> values = getElementValues<T>(elements);
+  if (elements.isSplat())
+    return DenseElementsAttr::get(resultType, values);
+
+  ArrayRef<int64_t> shape = elements.getType().getShape();
+  int64_t rank = shape.size();
+  SmallVector<int64_t> strides(rank, 1);
+  for (int64_t i = rank - 2; i >= 0; i--)
+    strides[i] = strides[i + 1] * shape[i + 1];
+  SmallVector<int64_t> resultStrides;
+  for (int64_t dim : permutation)
+    resultStrides.push_back(strides[dim]);
+
+  // Walk the result in order, keeping track of the offset of the current
+  // element in `values`.
+  ArrayRef<int64_t> resultShape = resultType.getShape();
+  SmallVector<int64_t> index(rank, 0);
+  SmallVector<T> permuted;
+  permuted.reserve(values.size());
+  int64_t offset = 0;
+  for (size_t i = 0, e = values.size(); i < e; i++) {
+    permuted.push_back(values[offset]);
+    for (int64_t dim = rank - 1; dim >= 0; dim--) {
+      offset += resultStrides[dim];
+      if (++index[dim] < resultShape[dim])
+        break;
+      offset -= resultStrides[dim] * resultShape[dim];
+      index[dim] = 0;
+    }
+  }
+  return DenseElementsAttr::get(resultType, permuted);
+}
+
+// Converts `elements` to the element type of `resultType`, following the
+// semantics of `torch.Tensor.to(dtype)`.
+static DenseElementsAttr convertElements(DenseElementsAttr elements,
+                                         RankedTensorType resultType) {
+  Type resultElementType = resultType.getElementType();
+  auto resultFloatType = resultElementType.dyn_cast<FloatType>();
+  auto resultIntType = resultElementType.dyn_cast<IntegerType>();
+  if (!resultFloatType && !resultIntType)
+    return nullptr;
+
+  if (elements.getElementType().isa<FloatType>()) {
+    SmallVector<APFloat> values = getElementValues<APFloat>(elements);
+    if (resultFloatType) {
+      bool losesInfo;
+      for (APFloat &value : values) {
+        value.convert(resultFloatType.getFloatSemantics(),
+                      APFloat::rmNearestTiesToEven, &losesInfo);
+      }
+      return DenseElementsAttr::get(resultType, values);
+    }
+    SmallVector<APInt> converted;
+    for (const APFloat &value : values) {
+      if (resultIntType.getWidth() == 1) {
+        converted.push_back(APInt(1, !value.isZero()));
+        continue;
+      }
+      APSInt result(resultIntType.getWidth(), resultIntType.isUnsigned());
+      bool isExact;
+      value.convertToInteger(result, APFloat::rmTowardZero, &isExact);
+      converted.push_back(result);
+    }
+    return DenseElementsAttr::get(resultType, converted);
+  }
+
+  auto intType = elements.getElementType().dyn_cast<IntegerType>();
+  if (!intType)
+    return nullptr;
+  bool isSigned = !intType.isUnsigned() && intType.getWidth() != 1;
+  SmallVector<APInt> values = getElementValues<APInt>(elements);
+  if (resultFloatType) {
+    SmallVector<APFloat> converted;
+    for (const APInt &value : values) {
+      APFloat result(resultFloatType.getFloatSemantics());
+      result.convertFromAPInt(value, isSigned, APFloat::rmNearestTiesToEven);
+      converted.push_back(result);
+    }
+    return DenseElementsAttr::get(resultType, converted);
+  }
+  unsigned resultWidth = resultIntType.getWidth();
+  for (APInt &value : values) {
+    if (resultWidth == 1)
+      value = APInt(1, value.getBoolValue());
+    else
+      value = isSigned ? value.sextOrTrunc(resultWidth)
+                       : value.zextOrTrunc(resultWidth);
+  }
+  return DenseElementsAttr::get(resultType, values);
+}
+
+namespace {
+// Base class for patterns that evaluate an op on a literal into a new literal.
+template <typename OpTy>
+class EvaluateOnLiteralPattern : public OpRewritePattern<OpTy> {
+public:
+  EvaluateOnLiteralPattern(MLIRContext *context, int64_t maxSizeInBytes)
+      : OpRewritePattern<OpTy>(context), maxSizeInBytes(maxSizeInBytes) {}
+
+  // Returns the elements of the result of `op`, given the elements of its
+  // `self` operand, or null if they can't be computed.
+  virtual DenseElementsAttr evaluate(OpTy op, DenseElementsAttr elements,
+                                     RankedTensorType resultType) const = 0;
+
+  LogicalResult matchAndRewrite(OpTy op,
+                                PatternRewriter &rewriter) const override {
+    DenseElementsAttr elements = getDenseLiteralElements(op.self());
+    if (!elements)
+      return rewriter.notifyMatchFailure(op, "operand is not a dense literal");
+    RankedTensorType resultType = getLiteralType(op.getResult());
+    if (!resultType)
+      return rewriter.notifyMatchFailure(op, "result type is not static");
+    // Splats stay small no matter their shape.
+    int64_t elementBits = resultType.getElementTypeBitWidth();
+    if (!elements.isSplat() &&
+        resultType.getNumElements() * ((elementBits + 7) / 8) > maxSizeInBytes)
+      return rewriter.notifyMatchFailure(op, "result is too large");
+
+    DenseElementsAttr result = evaluate(op, elements, resultType);
+    if (!result)
+      return rewriter.notifyMatchFailure(op, "unable to evaluate op");
+    Value literal = rewriter.create<ValueTensorLiteralOp>(op.getLoc(), result);
+    if (literal.getType() != op.getType()) {
+      literal = rewriter.create<TensorStaticInfoCastOp>(op.getLoc(),
+                                                        op.getType(), literal);
+    }
+    rewriter.replaceOp(op, literal);
+    return success();
+  }
+
+private:
+  int64_t maxSizeInBytes;
+};
+} // namespace
+
+namespace {
+// Evaluates ops that only change the shape of a tensor, and not the order of
+// its elements.
+template <typename OpTy>
+class EvaluateReshapeLikeOp : public EvaluateOnLiteralPattern<OpTy> {
+public:
+  using EvaluateOnLiteralPattern<OpTy>::EvaluateOnLiteralPattern;
+  DenseElementsAttr evaluate(OpTy op, DenseElementsAttr elements,
+                             RankedTensorType resultType) const override {
+    if (elements.getElementType() != resultType.getElementType() ||
+        elements.getNumElements() != resultType.getNumElements())
+      return nullptr;
+    return elements.reshape(resultType);
+  }
+};
+} // namespace
+
+// Returns the permutation of the dimensions done by `op`, or failure if it
+// isn't known.
+static LogicalResult getPermutation(AtenTOp op, int64_t rank,
+                                    SmallVectorImpl<int64_t> &permutation) {
+  if (rank > 2)
+    return failure();
+  for (int64_t i = rank - 1; i >= 0; i--)
+    permutation.push_back(i);
+  return success();
+}
+
+static LogicalResult getPermutation(AtenTransposeIntOp op, int64_t rank,
+                                    SmallVectorImpl<int64_t> &permutation) {
+  int64_t dim0, dim1;
+  if (!matchPattern(op.dim0(), m_TorchConstantInt(&dim0)) ||
+      !matchPattern(op.dim1(), m_TorchConstantInt(&dim1)))
+    return failure();
+  dim0 = toPositiveDim(dim0, rank);
+  dim1 = toPositiveDim(dim1, rank);
+  if (!isValidDim(dim0, rank) || !isValidDim(dim1, rank))
+    return failure();
+  for (int64_t i = 0; i < rank; i++)
+    permutation.push_back(i);
+  std::swap(permutation[dim0], permutation[dim1]);
+  return success();
+}
+
+static LogicalResult getPermutation(AtenPermuteOp op, int64_t rank,
+                                    SmallVectorImpl<int64_t> &permutation) {
+  SmallVector<int64_t> dims;
+  if (!matchPattern(op.dims(), m_TorchConstantIntList(dims)) ||
+      static_cast<int64_t>(dims.size()) != rank)
+    return failure();
+  for (int64_t dim : dims) {
+    dim = toPositiveDim(dim, rank);
+    if (!isValidDim(dim, rank))
+      return failure();
+    permutation.push_back(dim);
+  }
+  return success();
+}
+
+namespace {
+template <typename OpTy>
+class EvaluatePermuteLikeOp : public EvaluateOnLiteralPattern<OpTy> {
+public:
+  using EvaluateOnLiteralPattern<OpTy>::EvaluateOnLiteralPattern;
+  DenseElementsAttr evaluate(OpTy op, DenseElementsAttr elements,
+                             RankedTensorType resultType) const override {
+    ArrayRef<int64_t> shape = elements.getType().getShape();
+    SmallVector<int64_t> permutation;
+    if (failed(getPermutation(op, shape.size(), permutation)) ||
+        elements.getElementType() != resultType.getElementType())
+      return nullptr;
+    for (auto it : llvm::enumerate(permutation)) {
+      if (resultType.getDimSize(it.index()) != shape[it.value()])
+        return nullptr;
+    }
+    if (elements.getElementType().isa<FloatType>())
+      return permuteElements<APFloat>(elements, permutation, resultType);
+    return permuteElements<APInt>(elements, permutation, resultType);
+  }
+};
+} // namespace
+
+namespace {
+class EvaluateAtenToDtypeOp : public EvaluateOnLiteralPattern<AtenToDtypeOp> {
+public:
+  using EvaluateOnLiteralPattern::EvaluateOnLiteralPattern;
+  DenseElementsAttr evaluate(AtenToDtypeOp op, DenseElementsAttr elements,
+                             RankedTensorType resultType) const override {
+    // The other operands don't affect the value of the result.
+    if (elements.getType().getShape() != resultType.getShape())
+      return nullptr;
+    return convertElements(elements, resultType);
+  }
+};
+} // namespace
+
+namespace {
+class EvaluateConstantTensorOpsPass
+    : public EvaluateConstantTensorOpsBase<EvaluateConstantTensorOpsPass> {
+  void runOnOperation() override {
+    MLIRContext *context = &getContext();
+    RewritePatternSet patterns(context);
+    patterns.add<EvaluateReshapeLikeOp<AtenViewOp>,
+                 EvaluateReshapeLikeOp<AtenReshapeOp>,
+                 EvaluateReshapeLikeOp<AtenUnsqueezeOp>,
+                 EvaluateReshapeLikeOp<AtenSqueezeOp>,
+                 EvaluateReshapeLikeOp<AtenSqueezeDimOp>,
+                 EvaluateReshapeLikeOp<AtenFlattenUsingIntsOp>,
+                 EvaluateReshapeLikeOp<AtenContiguousOp>,
+                 EvaluatePermuteLikeOp<AtenTOp>,
+                 EvaluatePermuteLikeOp<AtenTransposeIntOp>,
+                 EvaluatePermuteLikeOp<AtenPermuteOp>, EvaluateAtenToDtypeOp>(
+        context, maxSizeInBytes);
+
+    if (failed(applyPatternsAndFoldGreedily(getOperation(),
+                                            std::move(patterns)))) {
+      return signalPassFailure();
+    }
+  }
+};
+} // namespace
+
+std::unique_ptr<OperationPass<FuncOp>>
+mlir::torch::Torch::createEvaluateConstantTensorOpsPass() {
+  return std::make_unique<EvaluateConstantTensorOpsPass>();
+}
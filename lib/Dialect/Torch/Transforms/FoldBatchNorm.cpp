@@ -0,0 +1,181 @@
+//===----------------------------------------------------------------------===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+
+#include "PassDetail.h"
+
+#include "mlir/IR/BuiltinOps.h"
+#include "mlir/IR/PatternMatch.h"
+#include "mlir/Transforms/GreedyPatternRewriteDriver.h"
+#include "torch-mlir/Dialect/Torch/IR/TorchOps.h"
+#include "torch-mlir/Dialect/Torch/Transforms/Passes.h"
+#include "torch-mlir/Dialect/Torch/Utils/Utils.h"
+
+#include <cmath>
+
+using namespace mlir;
+using namespace mlir::torch;
+using namespace mlir::torch::Torch;
+
+// Returns the elements of `value` if it is a dense floating point literal.
+static DenseElementsAttr getDenseFloatLiteral(Value value) {
+  auto literal = value.getDefiningOp<ValueTensorLiteralOp>();
+  if (!literal)
+    return nullptr;
+  auto elements = literal.valueAttr().dyn_cast<DenseElementsAttr>();
+  if (!elements || !elements.getElementType().isa<FloatType>())
+    return nullptr;
+  return elements;
+}
+
+// Gets the values of the literal `value` as doubles, checking that it has
+// `numElements` elements of type `elementType`. If `value` is `none`, fills
+// `values` with `defaultValue` instead.
+static LogicalResult getLiteralValues(Value value, Type elementType,
+                                      int64_t numElements, double defaultValue,
+                                      SmallVectorImpl<double> &values) {
+  if (value.getType().isa<Torch::NoneType>()) {
+    values.assign(numElements, defaultValue);
+    return success();
+  }
+  DenseElementsAttr elements = getDenseFloatLiteral(value);
+  if (!elements || elements.getElementType() != elementType ||
+      elements.getNumElements() != numElements)
+    return failure();
+  for (APFloat element : elements.getValues<APFloat>()) {
+    bool losesInfo;
+    element.convert(APFloat::IEEEdouble(), APFloat::rmNearestTiesToEven,
+                    &losesInfo);
+    values.push_back(element.convertToDouble());
+  }
+  return success();
+}
+
+static Value createLiteral(PatternRewriter &rewriter, Location loc,
+                           ArrayRef<int64_t> shape, FloatType elementType,
+                           ArrayRef<double> values) {
+  SmallVector<APFloat> elements;
+  for (double value : values) {
+    APFloat element(value);
+    bool losesInfo;
+    element.convert(elementType.getFloatSemantics(),
+                    APFloat::rmNearestTiesToEven, &losesInfo);
+    elements.push_back(element);
+  }
+  auto type = RankedTensorType::get(shape, elementType);
+  return rewriter.create<ValueTensorLiteralOp>(
+      loc, DenseElementsAttr::get(type, elements));
+}
+
+namespace {
+// Folds an inference-mode `aten.batch_norm` of the result of a convolution or
+// linear layer with constant parameters into the weight and bias of that
+// layer:
+// ```
+// scale = bn_weight / sqrt(running_var + eps)
+// weight' = weight * scale (along the output channel dimension)
+// bias' = (bias - running_mean) * scale + bn_bias
+// ```
+template <typename OpTy>
+class FoldBatchNormIntoProducer : public OpRewritePattern<AtenBatchNormOp> {
+public:
+  using OpRewritePattern::OpRewritePattern;
+  LogicalResult matchAndRewrite(AtenBatchNormOp op,
+                                PatternRewriter &rewriter) const override {
+    auto producer = op.input().getDefiningOp<OpTy>();
+    if (!producer || !producer->hasOneUse())
+      return rewriter.notifyMatchFailure(op, "input is not a foldable layer");
+    bool training;
+    if (!matchPattern(op.training(), m_TorchConstantBool(&training)) ||
+        training)
+      return rewriter.notifyMatchFailure(op, "not in inference mode");
+    double eps;
+    if (!matchPattern(op.eps(), m_TorchConstantFloat(&eps)))
+      return rewriter.notifyMatchFailure(op, "eps is not a constant");
+
+    // Both layers have the output channels as dimension 0 of the weight and
+    // dimension 1 of the result, which is what batch norm normalizes over.
+    // For linear layers, that requires the result to be 2-D.
+    auto resultType = producer.getType().template dyn_cast<ValueTensorType>();
+    if (!resultType || !resultType.hasSizes() ||
+        (std::is_same<OpTy, AtenLinearOp>::value &&
+         resultType.getSizes().size() != 2))
+      return rewriter.notifyMatchFailure(op, "unsupported result rank");
+
+    DenseElementsAttr weight = getDenseFloatLiteral(producer.weight());
+    if (!weight || weight.getType().getRank() < 2)
+      return rewriter.notifyMatchFailure(op, "weight is not a literal");
+    auto elementType = weight.getElementType().cast<FloatType>();
+    ArrayRef<int64_t> weightShape = weight.getType().getShape();
+    int64_t numChannels = weightShape[0];
+    SmallVector<double> bias, mean, var, bnWeight, bnBias;
+    if (failed(getLiteralValues(producer.bias(), elementType, numChannels,
+                                /*defaultValue=*/0.0, bias)) ||
+        op.running_mean().getType().isa<Torch::NoneType>() ||
+        op.running_var().getType().isa<Torch::NoneType>() ||
+        failed(getLiteralValues(op.running_mean(), elementType, numChannels,
+                                /*defaultValue=*/0.0, mean)) ||
+        failed(getLiteralValues(op.running_var(), elementType, numChannels,
+                                /*defaultValue=*/1.0, var)) ||
+        failed(getLiteralValues(op.weight(), elementType, numChannels,
+                                /*defaultValue=*/1.0, bnWeight)) ||
+        failed(getLiteralValues(op.bias(), elementType, numChannels,
+                                /*defaultValue=*/0.0, bnBias)))
+      return rewriter.notifyMatchFailure(op, "parameters are not literals");
+
+    SmallVector<double> scale, newBias;
+    for (int64_t c = 0; c < numChannels; c++) {
+      scale.push_back(bnWeight[c] / std::sqrt(var[c] + eps));
+      newBias.push_back((bias[c] - mean[c]) * scale[c] + bnBias[c]);
+    }
+    SmallVector<double> newWeight;
+    int64_t channelSize = weight.getNumElements() / numChannels;
+    int64_t i = 0;
+    for (APFloat element : weight.getValues<APFloat>()) {
+      bool losesInfo;
+      element.convert(APFloat::IEEEdouble(), APFloat::rmNearestTiesToEven,
+                      &losesInfo);
+      newWeight.push_back(element.convertToDouble() * scale[i++ / channelSize]);
+    }
+
+    Location loc = producer.getLoc();
+    rewriter.setInsertionPoint(producer);
+    Value newWeightLiteral =
+        createLiteral(rewriter, loc, weightShape, elementType, newWeight);
+    Value newBiasLiteral =
+        createLiteral(rewriter, loc, numChannels, elementType, newBias);
+    rewriter.updateRootInPlace(producer, [&]() {
+      producer.weightMutable().assign(newWeightLiteral);
+      producer.biasMutable().assign(newBiasLiteral);
+      producer.getResult().setType(op.getType());
+    });
+    rewriter.replaceOp(op, producer.getResult());
+    return success();
+  }
+};
+} // namespace
+
+namespace {
+class FoldBatchNormPass : public FoldBatchNormBase<FoldBatchNormPass> {
+  void runOnOperation() override {
+    MLIRContext *context = &getContext();
+    RewritePatternSet patterns(context);
+    patterns.add<FoldBatchNormIntoProducer<AtenConv2dOp>,
+                 FoldBatchNormIntoProducer<AtenLinearOp>>(context);
+    if (failed(applyPatternsAndFoldGreedily(getOperation(),
+                                            std::move(patterns)))) {
+      return signalPassFailure();
+    }
+  }
+};
+} // namespace
+
+std::unique_ptr<OperationPass<FuncOp>>
+mlir::torch::Torch::createFoldBatchNormPass() {
+  return std::make_unique<FoldBatchNormPass>();
+}
@@ -0,0 +1,81 @@
+//===----------------------------------------------------------------------===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+
+#include "PassDetail.h"
+
+#include "mlir/Dialect/StandardOps/IR/Ops.h"
+#include "mlir/IR/BuiltinOps.h"
+#include "mlir/Transforms/InliningUtils.h"
+#include "torch-mlir/Dialect/Torch/IR/TorchOps.h"
+#include "torch-mlir/Dialect/Torch/Transforms/Passes.h"
+#include "llvm/ADT/SetVector.h"
+
+using namespace mlir;
+using namespace mlir::torch;
+using namespace mlir::torch::Torch;
+
+namespace {
+class InlineShapeFunctionsPass
+    : public InlineShapeFunctionsBase<InlineShapeFunctionsPass> {
+  void runOnOperation() override {
+    MLIRContext *context = &getContext();
+    ModuleOp module = getOperation();
+    SymbolTable symbolTable(module);
+    InlinerInterface interface(context);
+
+    // Inline the calls in shape calculation regions until none are left.
+    // Inlining a shape function exposes the calls to the helpers it uses, so
+    // we iterate to a fixed point. The shape library is not recursive, so
+    // this terminates.
+    llvm::SetVector<FuncOp> inlinedFuncs;
+    bool changed = true;
+    while (changed) {
+      changed = false;
+      SmallVector<CallOp> calls;
+      module.walk([&](ShapeCalculateOp shapeCalculate) {
+        shapeCalculate.shapeCalculation().walk(
+            [&](CallOp call) { calls.push_back(call); });
+      });
+      for (CallOp call : calls) {
+        auto func = symbolTable.lookup<FuncOp>(call.getCallee());
+        if (!func || func.isExternal())
+          continue;
+        if (failed(inlineCall(interface, call, func, &func.getBody()))) {
+          call.emitError("failed to inline shape function");
+          return signalPassFailure();
+        }
+        call.erase();
+        inlinedFuncs.insert(func);
+        changed = true;
+      }
+    }
+
+    // Erase the inlined functions that are no longer used. A helper is only
+    // unused once all the shape functions calling it are gone, so iterate.
+    std::vector<FuncOp> funcsToErase = inlinedFuncs.takeVector();
+    changed = true;
+    while (changed) {
+      changed = false;
+      for (FuncOp &func : funcsToErase) {
+        if (!func || !func.isPrivate() ||
+            !SymbolTable::symbolKnownUseEmpty(func, module))
+          continue;
+        symbolTable.erase(func);
+        func = nullptr;
+        changed = true;
+      }
+    }
+  }
+};
+} // namespace
+
+std::unique_ptr<OperationPass<ModuleOp>>
+mlir::torch::Torch::createInlineShapeFunctionsPass() {
+  return std::make_unique<InlineShapeFunctionsPass>();
+}
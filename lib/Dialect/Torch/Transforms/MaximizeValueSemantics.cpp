@@ -280,12 +280,15 @@ public:
     SmallVector<CopyToValueTensorOp> copyToValueTensorOps;
     SmallVector<mlir::ReturnOp> returnOps;
     auto workList = llvm::to_vector<6>(copy.getResult().getUsers());
-    // We currently only support view-like ops with one tensor input and one
-    // tensor output, meaning that the tensor use-def chains form a tree.
-    // This will not be the case for an op like `torch.aten.view_as`, so
-    // we will need to add a set to prune duplicate visitation.
+    // The tensor use-def chains usually form a tree, but an op can use the
+    // same alias more than once (or two aliases from the slice), so prune
+    // duplicate visitation. Otherwise, such ops would be rewritten twice and
+    // the walk could take exponential time on chains of them.
+    DenseSet<Operation *> visited;
     while (!workList.empty()) {
       Operation *op = workList.pop_back_val();
+      if (!visited.insert(op).second)
+        continue;
       if (auto copyToValueTensor = dyn_cast<CopyToValueTensorOp>(op)) {
         copyToValueTensorOps.push_back(copyToValueTensor);
       } else if (auto returnOp = dyn_cast<mlir::ReturnOp>(op)) {
@@ -56,10 +56,6 @@ void mlir::torch::Torch::createTorchScriptModuleToTorchBackendPipeline(
   // every single module even if it doesn't have any explicit slots.
   // TODO: Support global slots in backends.
   pm.addPass(createSymbolDCEPass());
-  // Currently, our shape inference is not powerful enough to deal with
-  // calls, so inline everything.
-  // TODO: Improve shape inference.
-  pm.addPass(createInlinerPass());
 
   createTorchFunctionToTorchBackendPipeline(pm, options);
 }
@@ -80,6 +76,9 @@ void mlir::torch::Torch::createTorchFunctionToTorchBackendPipeline(
   // why we currently need that pass for correctness.
   // We should eventually remove those passes from the default pipeline once
   // backends have enough support.
+  // Until then, `options.fastCompile` is the closest we have to "O0": it keeps
+  // the `OPT-ONLY` passes, but skips everything else that only improves the
+  // generated code.
   // In particular the following features are needed in some form from backends:
   // - Error handling (RaiseException + error string formatting)
   // - First-class list type
@@ -88,6 +87,12 @@ void mlir::torch::Torch::createTorchFunctionToTorchBackendPipeline(
   // Please try to keep this list somewhat up to date when adding
   // "optimize hard enough that it works" transformations.
 
+  // Currently, our shape inference is not powerful enough to deal with
+  // calls, so inline everything. The shape refinement pipeline only inlines
+  // shape functions, so this is what inlines user calls for both entry points.
+  // TODO: Improve shape inference.
+  pm.addPass(createInlinerPass());
+
   // Incorporate user annotations and remove signature Python-isms.
   pm.addPass(createAdjustCallingConventionsPass());
 
@@ -138,10 +143,12 @@ void mlir::torch::Torch::createTorchFunctionToTorchBackendPipeline(
   // the previous pass. Doing this is ABI-compatible for our backends.
   pm.addPass(Torch::createRefinePublicReturnPass());
 
-  if (options.optimize) {
+  if (options.optimize && !options.fastCompile) {
     // This can fold away some branches given the information got from
     // RefineTypes before doing maximize value sematics which only works with
     // basic blocks.
+    // The canonicalizer run below usually reaches the same fixed point on its
+    // own, so skip this one when compiling fast.
     pm.addNestedPass<FuncOp>(createCanonicalizerPass());
   }
 
@@ -154,7 +161,22 @@ void mlir::torch::Torch::createTorchFunctionToTorchBackendPipeline(
     // only-used-in-training operations on `torch.global_slot`'s.
     pm.addNestedPass<FuncOp>(createCanonicalizerPass());
   }
-  pm.addNestedPass<FuncOp>(Torch::createDecomposeComplexOpsPass());
+  if (options.optimize && !options.fastCompile) {
+    // Fold inference-mode batch norms into the weights of the preceding
+    // convolutions and linear layers. This must run before
+    // DecomposeComplexOps, which breaks those ops down.
+    pm.addNestedPass<FuncOp>(Torch::createFoldBatchNormPass());
+  }
+  pm.addNestedPass<FuncOp>(
+      Torch::createDecomposeComplexOpsPass(options.backendLegalOps));
+
+  if (options.optimize && !options.fastCompile) {
+    // Compute the results of ops that only depend on the weights (which are
+    // literals after InlineGlobalSlots), such as the transposes and reshapes
+    // of weights exposed by DecomposeComplexOps, once at compile time instead
+    // of on every call.
+    pm.addNestedPass<FuncOp>(Torch::createEvaluateConstantTensorOpsPass());
+  }
 
   // TODO: VerifyTorchBackendContractPass.
 }
@@ -165,17 +187,20 @@ void mlir::torch::Torch::createTorchShapeRefinementPipeline(
   pm.addPass(Torch::createReifyShapeCalculationsPass());
 
   // Inline the shape functions to enable analysis and transformation.
-  // TODO: Only inline shape functions (this will currently inline everything).
-  pm.addPass(createInlinerPass());
+  pm.addPass(Torch::createInlineShapeFunctionsPass());
 
   // Now, try to simplify shape calculations. This is unfortunately a "optimize
   // as hard as possible" kind of thing, so it's inherently somewhat brittle.
   // The idea is to keep strengthening what we do here to support the shape
   // library. We don't need to support arbitrary programs, thankfully.
   pm.addNestedPass<FuncOp>(Torch::createSimplifyShapeCalculationsPass());
-  // Run CSE, then see if we can simplify further.
-  pm.addNestedPass<FuncOp>(createCSEPass());
-  pm.addNestedPass<FuncOp>(Torch::createSimplifyShapeCalculationsPass());
+  if (!options.fastCompile) {
+    // Run CSE, then see if we can simplify further.
+    // This only refines shapes that depend on values computed more than once,
+    // so it is skipped when compiling fast.
+    pm.addNestedPass<FuncOp>(createCSEPass());
+    pm.addNestedPass<FuncOp>(Torch::createSimplifyShapeCalculationsPass());
+  }
 
   // Drop shape calculations, leaving behind the shape-refined program.
   pm.addNestedPass<FuncOp>(Torch::createDropShapeCalculationsPass());
@@ -216,14 +216,24 @@ populateShapeCalculationRegion(ShapeCalculateOp op, ValueRange originalOperands,
 namespace {
 class ReifyShapeCalculationsPass
     : public ReifyShapeCalculationsBase<ReifyShapeCalculationsPass> {
+  LogicalResult initialize(MLIRContext *context) override {
+    // The shape library is O(#ops we know about), and this pass should be
+    // O(#ops in the program) ideally. So parse it once per context (instead
+    // of on every run), index its symbols, and only clone the functions
+    // needed by the program in `runOnOperation`.
+    OwningModuleRef parsedShapeLibrary =
+        parseSourceString(getShapeLibrary(), context);
+    if (!parsedShapeLibrary)
+      return failure();
+    shapeLibrary =
+        std::make_shared<ShapeLibrary>(std::move(parsedShapeLibrary));
+    return success();
+  }
+
   void runOnOperation() override {
     MLIRContext *context = &getContext();
     ModuleOp module = getOperation();
-
-    // TODO: Find a way to not have to parse this every time.
-    // The shape library is O(#ops we know about), and this pass should be
-    // O(#ops in the program) ideally.
-    auto shapeLibrary = parseSourceString(getShapeLibrary(), context);
+    SymbolTable &shapeLibrarySymbolTable = shapeLibrary->symbolTable;
 
     // Walk all the operations, and if we have a shape function, wrap the op
     // in a `torch.shape.calculate` op.
@@ -240,7 +250,7 @@ class ReifyShapeCalculationsPass
         name = name.drop_front(strlen("valsem."));
       auto shapeFunctionName = ("__torch_mlir_shape_fn." + Twine(name)).str();
       auto shapeFunction =
-          shapeLibrary->lookupSymbol<FuncOp>(shapeFunctionName);
+          shapeLibrarySymbolTable.lookup<FuncOp>(shapeFunctionName);
       if (!shapeFunction)
         return;
       neededShapeFunctions.push_back(shapeFunctionName);
@@ -275,20 +285,31 @@ class ReifyShapeCalculationsPass
       auto symName = worklist.pop_back_val();
       if (importedFunctions.count(symName))
         continue;
-      auto func = shapeLibrary->lookupSymbol<mlir::FuncOp>(symName);
+      auto func = shapeLibrarySymbolTable.lookup<mlir::FuncOp>(symName);
       assert(func && "broken shape library");
-      // Move the shape function from the library to the module this pass
-      // is running on. (this mutates the library, but we re-parse it each time
-      // so this is safe to do).
-      func->moveBefore(&module.getBody()->front());
+      // Clone the shape function from the library into the module this pass
+      // is running on, leaving the library intact for later runs.
+      auto clonedFunc = func.clone();
+      module.getBody()->push_front(clonedFunc);
       // Set the visibility to private so that the shape functions go away
       // nicely after we are done with them.
-      func.setVisibility(SymbolTable::Visibility::Private);
+      clonedFunc.setVisibility(SymbolTable::Visibility::Private);
       // Continue the DFS.
       importedFunctions.insert(symName);
       func.walk([&](CallOp op) { worklist.push_back(op.getCallee().str()); });
     }
   }
+
+  // The parsed shape library, together with an index of its symbols.
+  struct ShapeLibrary {
+    ShapeLibrary(OwningModuleRef module)
+        : module(std::move(module)),
+          symbolTable(this->module->getOperation()) {}
+    OwningModuleRef module;
+    SymbolTable symbolTable;
+  };
+  // Shared, since the pass may be cloned, and never mutated after parsing.
+  std::shared_ptr<ShapeLibrary> shapeLibrary;
 };
 } // namespace
 
@@ -74,6 +74,13 @@ void TorchConversion::createTorchBackendToLinalgOnTensorsBackendPipeline(
     // The resolution of `dim` ops tends to create identical ops. CSE them.
     pm.addNestedPass<FuncOp>(createCSEPass());
   }
+  if (options.optimize && !options.fastCompile) {
+    // Each elementwise op is lowered to its own `linalg.generic`. Fuse chains
+    // of them (including broadcasting operands) into single loop nests, so
+    // that backends don't materialize full-size temporaries in between.
+    pm.addNestedPass<FuncOp>(createLinalgElementwiseOpFusionPass());
+    pm.addNestedPass<FuncOp>(createCanonicalizerPass());
+  }
 
   // Finish the type conversion from `torch` types to the types of the
   // linalg-on-tensors backend contract.
@@ -63,6 +63,7 @@ class VerifyLinalgOnTensorsBackendContractPass
     target.addDynamicallyLegalOp<ModuleOp, FuncOp, ReturnOp>(opHasLegalTypes);
 
     target.addDynamicallyLegalOp<GetNextSeedOp>(opHasLegalTypes);
+    target.addDynamicallyLegalOp<ExternalLiteralOp>(opHasLegalTypes);
 
     // Basic scalar operations.
     target.addDynamicallyLegalDialect<StandardOpsDialect>(isLegalScalarOp);
@@ -328,6 +328,65 @@ mlir::torch::RefBackend::createInsertRngGlobalsPass() {
   return std::make_unique<InsertRngGlobals>();
 }
 
+//===----------------------------------------------------------------------===//
+// ExpandExternalLiterals
+//===----------------------------------------------------------------------===//
+
+static constexpr StringRef getExternalLiteralsAttrName() {
+  return "refback.external_literals";
+}
+
+namespace {
+class ExpandExternalLiterals
+    : public ExpandExternalLiteralsBase<ExpandExternalLiterals> {
+  void runOnOperation() override {
+    auto module = getOperation();
+    OpBuilder b(module.getBodyRegion());
+    SmallVector<TorchConversion::ExternalLiteralOp> literals;
+    module.walk(
+        [&](TorchConversion::ExternalLiteralOp op) { literals.push_back(op); });
+    if (literals.empty())
+      return;
+
+    SmallVector<Attribute> literalInfos;
+    for (auto en : llvm::enumerate(literals)) {
+      TorchConversion::ExternalLiteralOp op = en.value();
+      auto tensorType = op.getType().cast<RankedTensorType>();
+      std::string funcName =
+          ("refbackend_external_literal_" + Twine(en.index())).str();
+
+      b.setInsertionPointToEnd(module.getBody());
+      auto func = b.create<FuncOp>(
+          op.getLoc(), funcName,
+          FunctionType::get(module.getContext(), {}, {tensorType}),
+          b.getStringAttr("private"));
+      addEmitCInterfaceAttr(func);
+
+      b.setInsertionPoint(op);
+      auto call = b.create<mlir::CallOp>(op.getLoc(), func);
+      op.replaceAllUsesWith(call.getResult(0));
+
+      literalInfos.push_back(b.getDictionaryAttr({
+          b.getNamedAttr("name", b.getStringAttr(funcName)),
+          b.getNamedAttr("path", op.pathAttr()),
+          b.getNamedAttr("offset", op.offsetAttr()),
+          b.getNamedAttr("shape", b.getI64ArrayAttr(tensorType.getShape())),
+          b.getNamedAttr("element_type", b.getStringAttr(getTypeToken(
+                                             tensorType.getElementType()))),
+      }));
+      op.erase();
+    }
+    module->setAttr(getExternalLiteralsAttrName(),
+                    b.getArrayAttr(literalInfos));
+  }
+};
+} // namespace
+
+std::unique_ptr<OperationPass<ModuleOp>>
+mlir::torch::RefBackend::createExpandExternalLiteralsPass() {
+  return std::make_unique<ExpandExternalLiterals>();
+}
+
 //===----------------------------------------------------------------------===//
 // ExpandOpsForLLVM
 //===----------------------------------------------------------------------===//
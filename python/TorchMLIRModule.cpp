@@ -11,10 +11,47 @@
 #include "mlir-c/Registration.h"
 #include "mlir/Bindings/Python/PybindAdaptors.h"
 #include "torch-mlir-c/Dialects.h"
+#include "torch-mlir-c/PassManager.h"
+#include "torch-mlir-c/PassProfiling.h"
 #include "torch-mlir-c/Registration.h"
 
 namespace py = pybind11;
 
+namespace {
+/// Owning wrapper around a TorchMlirPassProfile.
+class PyPassProfile {
+public:
+  PyPassProfile(TorchMlirPassProfile profile) : profile(profile) {}
+  PyPassProfile(const PyPassProfile &) = delete;
+  ~PyPassProfile() { torchMlirPassProfileDestroy(profile); }
+
+  py::dict getPassSeconds() {
+    py::dict result;
+    for (intptr_t i = 0, e = torchMlirPassProfileGetNumPasses(profile); i < e;
+         ++i) {
+      MlirStringRef name = torchMlirPassProfileGetPassName(profile, i);
+      result[py::str(name.data, name.length)] =
+          torchMlirPassProfileGetPassSeconds(profile, i);
+    }
+    return result;
+  }
+
+  py::dict getPassStatistics() {
+    py::dict result;
+    for (intptr_t i = 0, e = torchMlirPassProfileGetNumStatistics(profile);
+         i < e; ++i) {
+      MlirStringRef name = torchMlirPassProfileGetStatisticName(profile, i);
+      result[py::str(name.data, name.length)] =
+          torchMlirPassProfileGetStatisticValue(profile, i);
+    }
+    return result;
+  }
+
+private:
+  TorchMlirPassProfile profile;
+};
+} // namespace
+
 PYBIND11_MODULE(_torchMlir, m) {
   torchMlirRegisterAllPasses();
 
@@ -30,4 +67,34 @@ PYBIND11_MODULE(_torchMlir, m) {
         }
       },
       py::arg("context"), py::arg("load") = true);
+
+  py::class_<PyPassProfile>(m, "PassProfile")
+      .def_property_readonly("pass_seconds", &PyPassProfile::getPassSeconds,
+                             "Accumulated wall time in seconds, by pass.")
+      .def_property_readonly("pass_statistics",
+                             &PyPassProfile::getPassStatistics,
+                             "Accumulated pass statistics, by "
+                             "`<pass-argument>.<statistic>` name.");
+
+  m.def(
+      "enable_pass_profiling",
+      [](MlirPassManager passManager) {
+        return std::make_unique<PyPassProfile>(
+            torchMlirPassManagerEnableProfiling(passManager));
+      },
+      py::arg("pass_manager"),
+      "Instruments a PassManager to collect per-pass timings and statistics.");
+
+  m.def(
+      "enable_crash_reproducer_generation",
+      [](MlirPassManager passManager, const std::string &outputFile,
+         bool genLocalReproducer) {
+        torchMlirPassManagerEnableCrashReproducerGeneration(
+            passManager,
+            mlirStringRefCreate(outputFile.data(), outputFile.size()),
+            genLocalReproducer);
+      },
+      py::arg("pass_manager"), py::arg("output_file"),
+      py::arg("gen_local_reproducer") = false,
+      "Writes a reproducer to `output_file` if the PassManager fails.");
 }
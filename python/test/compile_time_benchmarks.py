@@ -0,0 +1,51 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+
+# RUN: %PYTHON %s | FileCheck %s
+
+from torch_mlir.ir import Context, Module
+from torch_mlir.dialects.torch import register_dialect
+
+from torch_mlir_e2e_test.compile_time_benchmarks import (
+    GENERATORS, is_superlinear, run_benchmark, scaling_exponent)
+from torch_mlir_e2e_test.utils import run_pipeline_with_repro_report
+
+
+def main():
+    # The exponent is fit over all sizes, so one noisy timing doesn't
+    # dominate it.
+    # CHECK: linear: 1.00
+    print(f"linear: {scaling_exponent([1, 2, 4, 8], [1, 2, 4, 8]):.2f}")
+    # CHECK: one outlier: 1.30
+    print(f"one outlier: {scaling_exponent([1, 2, 4, 8], [1, 2, 4, 16]):.2f}")
+    # CHECK: flagged: True
+    print(f"flagged: {is_superlinear([1, 2, 4, 8], [0.1, 0.4, 1.6, 6.4])}")
+
+    # Every generator produces IR that the benchmarked pipeline accepts.
+    for generator in GENERATORS:
+        result = run_benchmark(generator, [8, 16])
+        # CHECK: deep: {{.*}}torch-maximize-value-semantics
+        # CHECK: wide: {{.*}}torch-maximize-value-semantics
+        # CHECK: alias: {{.*}}torch-maximize-value-semantics
+        print(f"{generator}: {sorted(result.pass_seconds)}")
+
+    # The alias graph is converted to value semantics across the blocks of
+    # the `torch.prim.If`. The chain is long enough that visiting each op
+    # once per path would not finish.
+    context = Context()
+    register_dialect(context)
+    module = Module.parse(GENERATORS["alias"](100), context)
+    run_pipeline_with_repro_report(
+        module, "builtin.func(torch-reduce-op-variants),"
+        "builtin.func(torch-maximize-value-semantics)", "alias graph")
+    # CHECK-LABEL: func @forward
+    # CHECK: torch.aten.expand_as {{.*}} -> !torch.vtensor<[?,?],f32>
+    # CHECK: torch.prim.If
+    # CHECK: torch.aten.tanh {{.*}} : !torch.vtensor<[?,?],f32> -> !torch.vtensor<[?,?],f32>
+    print(module)
+
+
+if __name__ == "__main__":
+    main()
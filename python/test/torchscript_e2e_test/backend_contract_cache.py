@@ -0,0 +1,94 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import os
+import tempfile
+
+import torch
+
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions
+from torch_mlir_e2e_test.profiling import collect_compile_profile
+from torch_mlir_e2e_test.torchscript.annotations import annotate_args, export
+from torch_mlir_e2e_test.torchscript.configs.utils import convert_torchscript_module_to_torch_backend_contract_mlir
+
+
+class MmModule(torch.nn.Module):
+    def __init__(self, weight):
+        super().__init__()
+        self.weight = weight
+
+    @export
+    @annotate_args([
+        None,
+        ([-1, 4], torch.float32, True),
+    ])
+    def forward(self, x):
+        return torch.mm(x, self.weight)
+
+
+class StaticMmModule(MmModule):
+    @export
+    @annotate_args([
+        None,
+        ([2, 4], torch.float32, True),
+    ])
+    def forward(self, x):
+        return torch.mm(x, self.weight)
+
+
+def compile(program, cache_dir, **kwargs):
+    """Compiles `program`, returning the module and whether it was cached."""
+    with collect_compile_profile() as profile:
+        module = convert_torchscript_module_to_torch_backend_contract_mlir(
+            program, cache_dir=cache_dir, **kwargs)
+    return module, not profile.pipelines
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        weight = torch.ones(4, 4)
+        first, cached = compile(MmModule(weight), cache_dir)
+        # CHECK: first compile cached: False
+        print(f"first compile cached: {cached}")
+        second, cached = compile(MmModule(weight), cache_dir)
+        # CHECK: unchanged program cached: True
+        print(f"unchanged program cached: {cached}")
+        # CHECK: same module: True
+        print(f"same module: {str(first) == str(second)}")
+
+        _, cached = compile(MmModule(2 * weight), cache_dir)
+        # CHECK: changed weights cached: False
+        print(f"changed weights cached: {cached}")
+        _, cached = compile(StaticMmModule(weight), cache_dir)
+        # CHECK: changed annotations cached: False
+        print(f"changed annotations cached: {cached}")
+        # CHECK: cache entries: 3
+        print(f"cache entries: {len(os.listdir(cache_dir))}")
+
+    # Modules referencing external weights round-trip through the cache.
+    with tempfile.TemporaryDirectory() as cache_dir:
+        import_options = ImportOptions()
+        import_options.importReachableFunctionsOnly = True
+        import_options.externalWeightsPath = os.path.join(
+            cache_dir, "weights.bin")
+        import_options.externalWeightsThreshold = 32
+        first, cached = compile(MmModule(torch.ones(4, 4)),
+                                cache_dir,
+                                import_options=import_options)
+        second, cached = compile(MmModule(torch.ones(4, 4)),
+                                 cache_dir,
+                                 import_options=import_options)
+        # CHECK: external weights cached: True
+        print(f"external weights cached: {cached}")
+        # CHECK: same module: True
+        print(f"same module: {str(first) == str(second)}")
+        # CHECK: torch.vtensor.external_literal "{{.*}}weights.bin"[0] : !torch.vtensor<[4,4],f32>
+        print(second)
+
+
+if __name__ == '__main__':
+    main()
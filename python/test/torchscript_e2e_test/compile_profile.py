@@ -0,0 +1,54 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import torch
+
+from torch_mlir_e2e_test.torchscript.framework import run_tests, TestUtils
+from torch_mlir_e2e_test.torchscript.reporting import report_results, report_compile_profile
+from torch_mlir_e2e_test.torchscript.registry import register_test_case, GLOBAL_TEST_REGISTRY
+from torch_mlir_e2e_test.torchscript.annotations import annotate_args, export
+from torch_mlir_e2e_test.torchscript.configs import LinalgOnTensorsBackendTestConfig
+from torch_mlir_e2e_test.linalg_on_tensors_backends.refbackend import RefBackendLinalgOnTensorsBackend
+
+
+class MmModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+
+    @export
+    @annotate_args([
+        None,
+        ([-1, -1], torch.float32, True),
+        ([-1, -1], torch.float32, True),
+    ])
+    def forward(self, lhs, rhs):
+        return torch.mm(lhs, rhs)
+
+
+# CHECK: PASS - "MmModule_basic"
+@register_test_case(module_factory=lambda: MmModule())
+def MmModule_basic(module, tu: TestUtils):
+    module.forward(tu.rand(4, 4), tu.rand(4, 4))
+
+
+def main():
+    config = LinalgOnTensorsBackendTestConfig(RefBackendLinalgOnTensorsBackend())
+    results = run_tests(GLOBAL_TEST_REGISTRY, config, profile_compile=True)
+    report_results(results, set(), verbose=True)
+    # CHECK: Compile profile (1 tests,
+    # CHECK-DAG: torch-refine-types
+    # CHECK-DAG: convert-torch-to-linalg
+    # CHECK-DAG: convert-memref-to-llvm
+    # CHECK-LABEL: Compile time by pipeline:
+    # CHECK-DAG: Lowering TorchScript Object Graph IR -> Torch Backend IR
+    # CHECK-DAG: Lower Torch Backend IR -> Linalg-on-Tensors Backend IR
+    # CHECK-DAG: Lowering Linalg-on-Tensors IR to LLVM with RefBackend
+    report_compile_profile(results, num_passes=1000)
+
+
+if __name__ == '__main__':
+    main()
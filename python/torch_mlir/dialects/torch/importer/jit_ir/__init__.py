@@ -18,4 +18,5 @@ __all__ = [
   "debug_trace_to_stderr",
   "ModuleBuilder",
   "ClassAnnotator",
+  "ImportOptions",
 ]
@@ -9,6 +9,7 @@
 
 #include "class_annotator.h"
 
+#include <algorithm>
 #include <stdexcept>
 
 #include "torch/csrc/Dtype.h"
@@ -323,10 +324,17 @@ std::string ClassAnnotation::toString() {
 }
 
 std::string ClassAnnotator::toString() {
+  // Sort the class annotations, so that the result doesn't depend on the
+  // addresses of the class types (which makes it usable as e.g. a cache key).
+  std::vector<std::string> classAnnotationStrings;
+  for (auto &p : classAnnotations) {
+    classAnnotationStrings.push_back(p.second->toString());
+  }
+  std::sort(classAnnotationStrings.begin(), classAnnotationStrings.end());
   std::stringstream ss;
   ss << "ClassAnnotator {\n";
-  for (auto &p : classAnnotations) {
-    ss << indentString("  ", p.second->toString());
+  for (const std::string &s : classAnnotationStrings) {
+    ss << indentString("  ", s);
   }
   ss << "}\n";
   return ss.str();
@@ -0,0 +1,53 @@
+//===- import_options.cpp -------------------------------------------------===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+
+#include "import_options.h"
+
+#include <sstream>
+
+using namespace torch_mlir;
+
+std::string ImportOptions::toString() {
+  std::stringstream ss;
+  ss << "ImportOptions {\n";
+  ss << "  externalWeightsPath = "
+     << (externalWeightsPath ? "'" + *externalWeightsPath + "'" : "None")
+     << "\n";
+  ss << "  externalWeightsThreshold = " << externalWeightsThreshold << "\n";
+  ss << "  importReachableFunctionsOnly = "
+     << (importReachableFunctionsOnly ? "true" : "false") << "\n";
+  ss << "  deduplicateTensorContents = "
+     << (deduplicateTensorContents ? "true" : "false") << "\n";
+  ss << "  numThreads = " << numThreads << "\n";
+  ss << "  externalTensorLocations = {";
+  for (auto &p : externalTensorLocations) {
+    ss << "\n    '" << p.first << "': ('" << p.second.first << "', "
+       << p.second.second << ")";
+  }
+  ss << (externalTensorLocations.empty() ? "}\n" : "\n  }\n");
+  ss << "}\n";
+  return ss.str();
+}
+
+void torch_mlir::initImportOptionsBindings(py::module &m) {
+  py::class_<ImportOptions>(m, "ImportOptions")
+      .def(py::init<>())
+      .def_readwrite("externalWeightsPath",
+                     &ImportOptions::externalWeightsPath)
+      .def_readwrite("externalWeightsThreshold",
+                     &ImportOptions::externalWeightsThreshold)
+      .def_readwrite("importReachableFunctionsOnly",
+                     &ImportOptions::importReachableFunctionsOnly)
+      .def_readwrite("deduplicateTensorContents",
+                     &ImportOptions::deduplicateTensorContents)
+      .def_readwrite("numThreads", &ImportOptions::numThreads)
+      .def_readwrite("externalTensorLocations",
+                     &ImportOptions::externalTensorLocations)
+      .def("__repr__", &ImportOptions::toString);
+}
@@ -0,0 +1,71 @@
+//===- import_options.h -----------------------------------------*- C++ -*-===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+// Options controlling how a TorchScript program is imported.
+//
+// Unlike annotations (see class_annotator.h), these options do not inject any
+// knowledge about the program. They only affect how the imported program is
+// represented, and the default state reproduces the historical behavior of
+// the importer.
+//===----------------------------------------------------------------------===//
+
+#ifndef TORCHMLIRJITIRIMPORTER_CSRC_IMPORT_OPTIONS_H
+#define TORCHMLIRJITIRIMPORTER_CSRC_IMPORT_OPTIONS_H
+
+#include "pybind.h"
+
+#include <map>
+
+namespace torch_mlir {
+
+struct ImportOptions {
+  // If set, tensors holding at least `externalWeightsThreshold` bytes of data
+  // are appended to the file at this path and imported as
+  // `torch.vtensor.external_literal` ops referencing it, instead of being
+  // copied into a `torch.tensor.literal`. The file is created if needed, and
+  // never truncated, so that modules imported earlier with the same path keep
+  // referencing valid data. Reusing the path thus grows the file with every
+  // import that writes external weights.
+  c10::optional<std::string> externalWeightsPath;
+  int64_t externalWeightsThreshold = 1 << 20;
+
+  // If true, only the functions of the compilation unit that are reachable
+  // from the exported methods of the imported modules are imported (together
+  // with the `torch.method`'s for the reachable methods). Otherwise, every
+  // function in the compilation unit is imported, which can be slow in long
+  // running sessions where the compilation unit accumulates many unrelated
+  // functions.
+  bool importReachableFunctionsOnly = false;
+
+  // If true, (non-quantized) tensors with identical dtype, sizes and contents
+  // share a single `torch.vtensor.literal` (or external literal), with a
+  // `torch.copy.to_tensor` per tensor to preserve object identity. This is
+  // useful for models with tied or cloned weights.
+  bool deduplicateTensorContents = false;
+
+  // The number of threads used to import functions, or 0 to use one per
+  // hardware thread. Using more than one thread requires multithreading to be
+  // enabled on the MLIR context (the default).
+  int64_t numThreads = 1;
+
+  // Maps the attribute paths (e.g. "layer1.0.weight") of tensors to the path
+  // and byte offset of a file already holding their contiguous data. These
+  // tensors are imported as `torch.vtensor.external_literal` ops without
+  // reading their data, so they can be placeholders on the `meta` device (see
+  // `torchscript_archive.py`).
+  std::map<std::string, std::pair<std::string, int64_t>>
+      externalTensorLocations;
+
+  std::string toString();
+};
+
+void initImportOptionsBindings(py::module &m);
+
+} // namespace torch_mlir
+
+#endif // TORCHMLIRJITIRIMPORTER_CSRC_IMPORT_OPTIONS_H
@@ -0,0 +1,30 @@
+//===- import_statistics.cpp ----------------------------------------------===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+
+#include "import_statistics.h"
+
+using namespace torch_mlir;
+
+py::dict ImportStatistics::toPyDict() const {
+  py::dict d;
+  d["total_seconds"] = totalSeconds;
+  d["class_types_seconds"] = classTypesSeconds;
+  d["methods_seconds"] = methodsSeconds;
+  d["functions_seconds"] = functionsSeconds;
+  d["tensors_seconds"] = tensorsSeconds;
+  d["num_class_types"] = numClassTypes;
+  d["num_methods"] = numMethods;
+  d["num_functions_imported"] = numFunctionsImported;
+  d["num_functions_unreachable"] = numFunctionsUnreachable;
+  d["num_tensors"] = numTensors;
+  d["num_tensors_deduplicated"] = numTensorsDeduplicated;
+  d["tensor_bytes"] = tensorBytes;
+  d["external_weight_bytes"] = externalWeightBytes;
+  return d;
+}
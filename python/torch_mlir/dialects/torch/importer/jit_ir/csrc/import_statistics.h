@@ -0,0 +1,68 @@
+//===- import_statistics.h --------------------------------------*- C++ -*-===//
+//
+// Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+// Also available under a BSD-style license. See LICENSE.
+//
+//===----------------------------------------------------------------------===//
+// Counters and timings collected while importing a TorchScript program.
+//===----------------------------------------------------------------------===//
+
+#ifndef TORCHMLIRJITIRIMPORTER_CSRC_IMPORT_STATISTICS_H
+#define TORCHMLIRJITIRIMPORTER_CSRC_IMPORT_STATISTICS_H
+
+#include <chrono>
+
+#include "pybind.h"
+
+namespace torch_mlir {
+
+struct ImportStatistics {
+  // Wall-clock time of the whole import, and of its parts.
+  double totalSeconds = 0;
+  double classTypesSeconds = 0;
+  double methodsSeconds = 0;
+  double functionsSeconds = 0;
+  double tensorsSeconds = 0;
+
+  int64_t numClassTypes = 0;
+  int64_t numMethods = 0;
+  int64_t numFunctionsImported = 0;
+  // Functions of the compilation unit that are not reachable from the exported
+  // methods. These are either not imported (see
+  // `ImportOptions::importReachableFunctionsOnly`) or are removed by the
+  // lowering pipeline later.
+  int64_t numFunctionsUnreachable = 0;
+  int64_t numTensors = 0;
+  // Tensors that reused the literal of an identical tensor (see
+  // `ImportOptions::deduplicateTensorContents`).
+  int64_t numTensorsDeduplicated = 0;
+  // Bytes of tensor data converted into MLIR attributes, and written to the
+  // external weights file, respectively.
+  int64_t tensorBytes = 0;
+  int64_t externalWeightBytes = 0;
+
+  py::dict toPyDict() const;
+};
+
+/// Adds the wall-clock time between its construction and destruction to
+/// `seconds`.
+class ScopedTimer {
+public:
+  ScopedTimer(double &seconds)
+      : seconds(seconds), start(std::chrono::steady_clock::now()) {}
+  ~ScopedTimer() {
+    seconds += std::chrono::duration<double>(std::chrono::steady_clock::now() -
+                                             start)
+                   .count();
+  }
+
+private:
+  double &seconds;
+  std::chrono::steady_clock::time_point start;
+};
+
+} // namespace torch_mlir
+
+#endif // TORCHMLIRJITIRIMPORTER_CSRC_IMPORT_STATISTICS_H
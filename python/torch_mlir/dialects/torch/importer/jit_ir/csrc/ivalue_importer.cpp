@@ -12,6 +12,12 @@
 #include "function_importer.h"
 #include "torch_to_mlir_utils.h"
 
+#include <algorithm>
+#include <atomic>
+#include <cstring>
+#include <fstream>
+#include <functional>
+#include <thread>
 #include <unordered_map>
 
 #include "mlir_utils.h"
@@ -101,23 +107,59 @@ namespace {
 class IValueImporter {
 public:
   IValueImporter(MlirBlock importBlock, MlirContext context,
-                 ClassAnnotator &annotator)
-      : importBlock(importBlock), context(context), annotator(annotator) {}
+                 ClassAnnotator &annotator, const ImportOptions &importOptions)
+      : importBlock(importBlock), context(context), annotator(annotator),
+        importOptions(importOptions) {}
 
   MlirValue importIValue(c10::IValue ivalue);
 
+  // Finishes the import. Must be called once all ivalues have been imported.
+  //
+  // If `importOptions.importReachableFunctionsOnly` is set, this imports the
+  // functions of the compilation unit that are reachable from the exported
+  // methods of the imported class types, along with the `torch.method`'s for
+  // the reachable methods.
+  void finishImport();
+
+  const ImportStatistics &getStatistics() { return statistics; }
+
 private:
   MlirValue rawImportIValue(c10::IValue ivalue);
   MlirValue importTensor(c10::IValue ivalue);
+  MlirType getTensorType(const at::Tensor &tensor, MlirLocation loc,
+                         bool hasValueSemantics);
+  bool shouldImportAsValueTensor(const at::Tensor &tensor);
+  bool shouldImportAsExternalWeight(const at::Tensor &tensor);
+  MlirValue importValueTensor(const at::Tensor &tensor, MlirLocation loc);
+  MlirValue importExternalWeight(const at::Tensor &tensor, MlirLocation loc);
+  MlirValue createExternalLiteral(const at::Tensor &tensor, MlirLocation loc,
+                                  const std::string &path, int64_t offset);
   MlirValue importModule(torch::jit::Module jitModule);
   void importMethod(torch::jit::Function *function, MlirBlock classTypeBody,
                     const MethodAnnotation &methodAnnotation);
   void importClassType(c10::ClassType *classType);
   void importCompilationUnit(torch::jit::CompilationUnit *cu);
+  std::unordered_set<torch::jit::Function *> computeReachableFunctions();
+  void importFunctions(const std::vector<torch::jit::Function *> &functions);
+  MlirOperation createFuncOp(torch::jit::Function *function);
+  std::string getAttributePath();
 
   MlirBlock importBlock;
   MlirContext context;
   ClassAnnotator &annotator;
+  const ImportOptions &importOptions;
+  ImportStatistics statistics;
+
+  // The file that external weights are appended to, and the number of bytes
+  // written to it so far. Opened lazily on the first external weight.
+  std::ofstream externalWeightsStream;
+  int64_t externalWeightsSize = 0;
+
+  // Tensors imported so far when deduplicating tensors by content, keyed by a
+  // cheap digest of their dtype, sizes and (a sample of) their data. The
+  // mapped values are the imported `!torch.vtensor`s.
+  std::unordered_multimap<uint64_t, std::pair<at::Tensor, MlirValue>>
+      tensorsByDigest;
 
   // Map tracking already-imported values.
   std::unordered_map<c10::IValue, MlirValue, IValueHasher, IValueEq> valueMap;
@@ -138,8 +180,13 @@ private:
   // string (as an MLIR symbol name) so we don't need to keep a map associating
   // them with the MlirOperation that they import into.
   std::unordered_set<c10::ClassType *> classTypes;
+  // The imported class types and the bodies of their `torch.class_type` ops,
+  // in import order.
+  std::vector<std::pair<c10::ClassType *, MlirBlock>> classTypeBodies;
   // The stack of attribute names we have traversed to reach the current IValue.
-  // Used for diagnostics.
+  // Elements of lists and tuples are named by their index, and values of
+  // dicts with string or int keys by their key. Used for diagnostics and to
+  // find the external locations of tensors.
   std::vector<std::string> attributeNameStack;
   // The root module encountered during recursive IValue traversal.
   // Used for diagnostics.
@@ -210,6 +257,45 @@ MlirValue IValueImporter::importModule(torch::jit::Module currentModule) {
   return mlirOperationGetResult(nnModule, 0);
 }
 
+// Returns the path of the current IValue from the root module, such as
+// "layer1.0.weight".
+std::string IValueImporter::getAttributePath() {
+  std::string path;
+  for (const std::string &name : attributeNameStack) {
+    if (!path.empty())
+      path += ".";
+    path += name;
+  }
+  return path;
+}
+
+// Returns the storages holding the data of `tensor`. Sparse tensors don't
+// have a storage of their own, so these are the storages of their indices
+// and values.
+static std::vector<c10::StorageImpl *>
+getStorageImpls(const at::Tensor &tensor) {
+  std::vector<at::Tensor> components;
+  switch (tensor.layout()) {
+  case c10::Layout::Strided:
+    components = {tensor};
+    break;
+  case c10::Layout::Sparse:
+    components = {tensor._indices(), tensor._values()};
+    break;
+  case c10::Layout::SparseCsr:
+    components = {tensor.crow_indices(), tensor.col_indices(),
+                  tensor.values()};
+    break;
+  default:
+    // Other layouts are rejected when importing the tensor.
+    break;
+  }
+  std::vector<c10::StorageImpl *> storageImpls;
+  for (const at::Tensor &component : components)
+    storageImpls.push_back(component.storage().unsafeGetStorageImpl());
+  return storageImpls;
+}
+
 MlirValue IValueImporter::importIValue(c10::IValue ivalue) {
   auto it = valueMap.find(ivalue);
   if (it != valueMap.end()) {
@@ -217,14 +303,15 @@ MlirValue IValueImporter::importIValue(c10::IValue ivalue) {
   }
   // Reject potentially aliased tensors.
   if (ivalue.isTensor()) {
-    c10::StorageImpl *storageImpl =
-        ivalue.toTensor().storage().unsafeGetStorageImpl();
-    if (!seenStorageImpls.insert(storageImpl).second) {
+    bool sharesStorage = false;
+    for (c10::StorageImpl *storageImpl : getStorageImpls(ivalue.toTensor()))
+      sharesStorage |= !seenStorageImpls.insert(storageImpl).second;
+    if (sharesStorage) {
       std::stringstream msg;
       msg << "Unhandled tensor that shares storage with another tensor.";
       if (rootModuleName) {
         msg << "\nFound at path '<root>."
-            << c10::QualifiedName(attributeNameStack).qualifiedName()
+            << getAttributePath()
             << "' from root object '" << *rootModuleName << "'";
       }
       throw std::invalid_argument(msg.str());
@@ -268,8 +355,10 @@ MlirValue IValueImporter::rawImportIValue(c10::IValue ivalue) {
   if (ivalue.isList()) {
     c10::List<c10::IValue> list = ivalue.toList();
     std::vector<MlirValue> elems;
-    for (const c10::IValue &elem : list) {
-      elems.push_back(importIValue(elem));
+    for (size_t i = 0, e = list.size(); i < e; i++) {
+      attributeNameStack.push_back(std::to_string(i));
+      elems.push_back(importIValue(list.get(i)));
+      attributeNameStack.pop_back();
     }
     MlirOperation operation = createMlirOperationAtEnd(
         importBlock, "torch.prim.ListConstruct", loc,
@@ -284,7 +373,15 @@ MlirValue IValueImporter::rawImportIValue(c10::IValue ivalue) {
     std::vector<MlirValue> values;
     for (auto it = dict.begin(); it != dict.end(); it++) {
       keys.push_back(importIValue(it->key()));
+      bool named = it->key().isString() || it->key().isInt();
+      if (named) {
+        attributeNameStack.push_back(it->key().isString()
+                                         ? it->key().toStringRef()
+                                         : std::to_string(it->key().toInt()));
+      }
       values.push_back(importIValue(it->value()));
+      if (named)
+        attributeNameStack.pop_back();
     }
     MlirOperation operation = createMlirOperationAtEnd(
         importBlock, "torch.prim.DictConstruct", loc,
@@ -298,8 +395,10 @@ MlirValue IValueImporter::rawImportIValue(c10::IValue ivalue) {
     auto list = ivalue.toTuple()->elements();
     std::vector<MlirValue> operands;
     std::vector<MlirType> types;
-    for (const c10::IValue &elem : list) {
-      MlirValue operand = importIValue(elem);
+    for (size_t i = 0, e = list.size(); i < e; i++) {
+      attributeNameStack.push_back(std::to_string(i));
+      MlirValue operand = importIValue(list[i]);
+      attributeNameStack.pop_back();
       operands.push_back(operand);
       types.push_back(mlirValueGetType(operand));
     }
@@ -358,23 +457,62 @@ MlirValue IValueImporter::rawImportIValue(c10::IValue ivalue) {
 
 MlirValue IValueImporter::importTensor(c10::IValue ivalue) {
   assert(ivalue.isTensor() && "expected a tensor!");
+  ScopedTimer timer(statistics.tensorsSeconds);
+  statistics.numTensors++;
 
   // TODO: Can we do better?
   MlirLocation loc = mlirLocationUnknownGet(context);
 
   // Import the bulk tensor representation.
-  at::Tensor tensor = ivalue.toTensor().contiguous();
-  MlirAttribute denseElements = convertTensorToMlirElementsAttr(tensor, loc);
-
-  MlirOperation tensorOp = createMlirOperationAtEnd(
-      importBlock, "torch.tensor.literal", loc,
-      torchMlirTorchNonValueTensorTypeGetFromAttribute(denseElements),
-      toMlirNamedAttribute("value", denseElements));
-  MlirValue tensorReprValue = mlirOperationGetResult(tensorOp, 0);
-
-  // Construct the complete tensor value. This is trivial for most tensors, but
-  // for quantized tensors (and probably sparse too, TBD) there is more for us
-  // to do.
+  at::Tensor tensor = ivalue.toTensor();
+  if (tensor.layout() == c10::Layout::Strided)
+    tensor = tensor.contiguous();
+  MlirValue tensorReprValue;
+  auto externalLocation = importOptions.externalTensorLocations.end();
+  if (!attributeNameStack.empty()) {
+    externalLocation = importOptions.externalTensorLocations.find(
+        getAttributePath());
+  }
+  if (externalLocation != importOptions.externalTensorLocations.end()) {
+    MlirOperation tensorOp = createMlirOperationAtEnd(
+        importBlock, "torch.copy.to_tensor", loc,
+        getTensorType(tensor, loc, /*hasValueSemantics=*/false),
+        createExternalLiteral(tensor, loc, externalLocation->second.first,
+                              externalLocation->second.second));
+    tensorReprValue = mlirOperationGetResult(tensorOp, 0);
+  } else if (tensor.is_meta()) {
+    std::stringstream msg;
+    msg << "Tensor without data (on the meta device) must have an external "
+           "location";
+    if (!attributeNameStack.empty()) {
+      msg << "\nFound at path '<root>."
+          << getAttributePath() << "'";
+    }
+    throw std::invalid_argument(msg.str());
+  } else if (shouldImportAsValueTensor(tensor)) {
+    // Each tensor has its own object identity, so even if the data is shared
+    // with another tensor we need a separate copy of the value tensor.
+    MlirOperation tensorOp = createMlirOperationAtEnd(
+        importBlock, "torch.copy.to_tensor", loc,
+        getTensorType(tensor, loc, /*hasValueSemantics=*/false),
+        importValueTensor(tensor, loc));
+    tensorReprValue = mlirOperationGetResult(tensorOp, 0);
+  } else {
+    MlirAttribute elements = convertTensorToMlirElementsAttr(tensor, loc);
+    // Sparse tensors don't have a meaningful `nbytes`, so count their values.
+    statistics.tensorBytes += tensor.layout() == c10::Layout::Strided
+                                  ? tensor.nbytes()
+                                  : tensor._nnz() * tensor.element_size();
+    MlirOperation tensorOp = createMlirOperationAtEnd(
+        importBlock, "torch.tensor.literal", loc,
+        torchMlirTorchNonValueTensorTypeGetFromAttribute(elements),
+        toMlirNamedAttribute("value", elements));
+    tensorReprValue = mlirOperationGetResult(tensorOp, 0);
+  }
+
+  // Construct the complete tensor value. This is trivial for most tensors
+  // (sparse tensors included, since their elements attribute carries the
+  // sparsity), but for quantized tensors there is more for us to do.
   MlirValue tensorValue;
   if (tensor.is_quantized()) {
     // Note that Torch models quantization in a type-erased way. So we don't
@@ -405,9 +543,172 @@ MlirValue IValueImporter::importTensor(c10::IValue ivalue) {
   return tensorValue;
 }
 
+MlirType IValueImporter::getTensorType(const at::Tensor &tensor,
+                                      MlirLocation loc,
+                                      bool hasValueSemantics) {
+  std::vector<int64_t> shape(tensor.sizes().begin(), tensor.sizes().end());
+  // `std::vector`'s `.data()` method can return nullptr when the size is 0,
+  // which the C API treats as "nothing known about sizes". So use a dummy data
+  // pointer.
+  int64_t dummy;
+  int64_t *shapeData = shape.size() == 0 ? &dummy : shape.data();
+  MlirType elementType = getMlirTypeForTorchScalarType(
+      loc, c10::toUnderlying(tensor.scalar_type()));
+  if (hasValueSemantics) {
+    return torchMlirTorchValueTensorTypeGet(context, shape.size(), shapeData,
+                                            elementType);
+  }
+  return torchMlirTorchNonValueTensorTypeGet(context, shape.size(), shapeData,
+                                             elementType);
+}
+
+// Returns a digest of the dtype, sizes and (a sample of) the data of `tensor`.
+// Tensors with equal contents have equal digests.
+static uint64_t computeSampledTensorDigest(const at::Tensor &tensor) {
+  // Number of evenly spaced chunks of the data that are hashed. This keeps
+  // the digest cheap for large tensors, which are then compared in full only
+  // if their digests match.
+  constexpr int64_t kNumSampledChunks = 64;
+  constexpr int64_t kChunkSize = 8;
+
+  uint64_t digest = 14695981039346656037ULL;
+  auto update = [&](const void *data, size_t size) {
+    const auto *bytes = static_cast<const unsigned char *>(data);
+    for (size_t i = 0; i < size; i++) {
+      digest ^= bytes[i];
+      digest *= 1099511628211ULL;
+    }
+  };
+  int8_t scalarType = static_cast<int8_t>(tensor.scalar_type());
+  update(&scalarType, sizeof(scalarType));
+  update(tensor.sizes().data(), tensor.sizes().size() * sizeof(int64_t));
+
+  const auto *data = static_cast<const char *>(tensor.data_ptr());
+  int64_t numBytes = tensor.nbytes();
+  if (numBytes <= kNumSampledChunks * kChunkSize) {
+    update(data, numBytes);
+    return digest;
+  }
+  int64_t stride = (numBytes - kChunkSize) / (kNumSampledChunks - 1);
+  for (int64_t i = 0; i < kNumSampledChunks; i++)
+    update(data + i * stride, kChunkSize);
+  return digest;
+}
+
+bool IValueImporter::shouldImportAsValueTensor(const at::Tensor &tensor) {
+  if (tensor.is_quantized() || tensor.layout() != c10::Layout::Strided)
+    return false;
+  return importOptions.deduplicateTensorContents ||
+         shouldImportAsExternalWeight(tensor);
+}
+
+MlirValue IValueImporter::importValueTensor(const at::Tensor &tensor,
+                                            MlirLocation loc) {
+  uint64_t digest = 0;
+  if (importOptions.deduplicateTensorContents) {
+    digest = computeSampledTensorDigest(tensor);
+    auto range = tensorsByDigest.equal_range(digest);
+    for (auto it = range.first; it != range.second; ++it) {
+      const at::Tensor &candidate = it->second.first;
+      if (candidate.scalar_type() == tensor.scalar_type() &&
+          candidate.sizes() == tensor.sizes() &&
+          std::memcmp(candidate.data_ptr(), tensor.data_ptr(),
+                      tensor.nbytes()) == 0) {
+        statistics.numTensorsDeduplicated++;
+        return it->second.second;
+      }
+    }
+  }
+
+  MlirValue valueTensor;
+  if (shouldImportAsExternalWeight(tensor)) {
+    valueTensor = importExternalWeight(tensor, loc);
+  } else {
+    MlirAttribute denseElements = convertTensorToMlirElementsAttr(tensor, loc);
+    statistics.tensorBytes += tensor.nbytes();
+    MlirOperation literal = createMlirOperationAtEnd(
+        importBlock, "torch.vtensor.literal", loc,
+        getTensorType(tensor, loc, /*hasValueSemantics=*/true),
+        toMlirNamedAttribute("value", denseElements));
+    valueTensor = mlirOperationGetResult(literal, 0);
+  }
+
+  if (importOptions.deduplicateTensorContents)
+    tensorsByDigest.emplace(digest, std::make_pair(tensor, valueTensor));
+  return valueTensor;
+}
+
+bool IValueImporter::shouldImportAsExternalWeight(const at::Tensor &tensor) {
+  if (!importOptions.externalWeightsPath)
+    return false;
+  // Quantized tensors need their quantization parameters imported alongside
+  // the raw data, so we keep them inline.
+  if (tensor.is_quantized() || tensor.layout() != c10::Layout::Strided)
+    return false;
+  // Empty tensors cannot be memory-mapped, and cost nothing to keep inline.
+  int64_t numBytes = tensor.nbytes();
+  return numBytes != 0 && numBytes >= importOptions.externalWeightsThreshold;
+}
+
+MlirValue IValueImporter::importExternalWeight(const at::Tensor &tensor,
+                                               MlirLocation loc) {
+  // Keep every weight aligned so that runtimes can use a memory mapping of
+  // the file directly as the buffer backing the tensor.
+  constexpr int64_t kExternalWeightAlignment = 64;
+
+  const std::string &path = *importOptions.externalWeightsPath;
+  if (!externalWeightsStream.is_open()) {
+    // Append to the file rather than overwriting it, since modules imported
+    // earlier (and possibly memory-mapped by a runtime) may still reference
+    // its current contents.
+    std::ifstream existing(path, std::ios::binary | std::ios::ate);
+    externalWeightsSize = existing ? static_cast<int64_t>(existing.tellg()) : 0;
+    externalWeightsStream.open(path, std::ios::binary | std::ios::app);
+    if (!externalWeightsStream) {
+      std::stringstream msg;
+      msg << "Unable to open external weights file '" << path << "'";
+      throw std::invalid_argument(msg.str());
+    }
+  }
+  int64_t padding = (kExternalWeightAlignment -
+                     externalWeightsSize % kExternalWeightAlignment) %
+                    kExternalWeightAlignment;
+  std::vector<char> zeros(padding, 0);
+  externalWeightsStream.write(zeros.data(), padding);
+  int64_t offset = externalWeightsSize + padding;
+  externalWeightsStream.write(static_cast<const char *>(tensor.data_ptr()),
+                              tensor.nbytes());
+  externalWeightsStream.flush();
+  if (!externalWeightsStream) {
+    std::stringstream msg;
+    msg << "Error writing to external weights file '" << path << "'";
+    throw std::invalid_argument(msg.str());
+  }
+  externalWeightsSize = offset + tensor.nbytes();
+  statistics.externalWeightBytes += tensor.nbytes();
+  return createExternalLiteral(tensor, loc, path, offset);
+}
+
+MlirValue IValueImporter::createExternalLiteral(const at::Tensor &tensor,
+                                                MlirLocation loc,
+                                                const std::string &path,
+                                                int64_t offset) {
+  MlirOperation literal = createMlirOperationAtEnd(
+      importBlock, "torch.vtensor.external_literal", loc,
+      getTensorType(tensor, loc, /*hasValueSemantics=*/true),
+      toMlirNamedAttribute(
+          "path", mlirStringAttrGet(context, toMlirStringRef(path))),
+      toMlirNamedAttribute(
+          "offset",
+          mlirIntegerAttrGet(mlirIntegerTypeGet(context, 64), offset)));
+  return mlirOperationGetResult(literal, 0);
+}
+
 void IValueImporter::importMethod(torch::jit::Function *function,
                                   MlirBlock classTypeBody,
                                   const MethodAnnotation &methodAnnotation) {
+  ScopedTimer timer(statistics.methodsSeconds);
+  statistics.numMethods++;
   // The function's name becomes the MLIR symbol table name of the imported func
   // when we import the compilation unit.
   const std::string &symName = function->qualname().qualifiedName();
@@ -430,6 +731,8 @@ void IValueImporter::importClassType(c10::ClassType *classType) {
   if (!classTypes.insert(classType).second) {
     return;
   }
+  ScopedTimer timer(statistics.classTypesSeconds);
+  statistics.numClassTypes++;
 
   // TODO: Can we do better?
   MlirLocation loc = mlirLocationUnknownGet(context);
@@ -465,10 +768,13 @@ void IValueImporter::importClassType(c10::ClassType *classType) {
         isPrivate);
   }
 
-  const auto &methodAnnotations = classAnnotation.getMethodAnnotations();
-  const auto &methods = classType->methods();
-  for (int i = 0, e = methods.size(); i != e; i++) {
-    importMethod(methods[i], classTypeBody, methodAnnotations[i]);
+  classTypeBodies.emplace_back(classType, classTypeBody);
+  if (!importOptions.importReachableFunctionsOnly) {
+    const auto &methodAnnotations = classAnnotation.getMethodAnnotations();
+    const auto &methods = classType->methods();
+    for (int i = 0, e = methods.size(); i != e; i++) {
+      importMethod(methods[i], classTypeBody, methodAnnotations[i]);
+    }
   }
 
   createMlirOperationAtEnd(classTypeBody, "torch.class_type_terminator", loc);
@@ -493,77 +799,241 @@ void IValueImporter::importCompilationUnit(torch::jit::CompilationUnit *cu) {
     return;
   }
 
-  for (torch::jit::Function *function : cu->get_functions()) {
-    // Useful for debugging errors in free functions that end up being
-    // unused. These can be missing when round-tripping through the on-disk
-    // format, even though they still cause import issues when importing
-    // through the larger Python session where they originate.
-    // std::cerr << "NAME: " << function->qualname().qualifiedName() << "\n";
-    // std::cerr << *torch::jit::toGraphFunction(function).graph();
-    MethodAnnotation *annotation =
-        annotator.getMethodAnnotationForFunction(function);
-    MlirOperation func = importJitFunctionAsFuncOp(
-        context, function, [&](int argIndex) -> MlirAttribute {
-          if (!annotation || !annotation->argAnnotations.has_value()) {
-            return {nullptr};
-          }
-          c10::optional<std::vector<int64_t>> &maybeShape =
-              annotation->argAnnotations.value()[argIndex].shape;
-          c10::optional<c10::ScalarType> &maybeDtype =
-              annotation->argAnnotations.value()[argIndex].dtype;
-          bool hasValueSemantics =
-              annotation->argAnnotations.value()[argIndex].hasValueSemantics;
-
-          // TODO: Handle unranked tensors and tensors with unknown dtype (but
-          // possibly known ranks/sizes).
-          if (!maybeShape || !maybeDtype) {
-            return {nullptr};
-          }
-
-          std::vector<int64_t> shape = *maybeShape;
-          MlirType dtype = getMlirTypeForTorchScalarType(
-              mlirLocationUnknownGet(context), *maybeDtype);
-          MlirType typeBound;
-          // `std::vector`'s `.data()` method can return nullptr when the
-          // size is 0. This triggers the "nothing known about sizes" case in
-          // the C API constructor, when we want the "we know we have 0 sizes"
-          // case. So use a dummy data pointer.
-          int64_t dummy;
-          int64_t *shapeData = shape.size() == 0 ? &dummy : shape.data();
-          if (hasValueSemantics) {
-            typeBound = torchMlirTorchValueTensorTypeGet(context, shape.size(),
-                                                         shapeData, dtype);
-          } else {
-            typeBound = torchMlirTorchNonValueTensorTypeGet(
-                context, shape.size(), shapeData, dtype);
-          }
-
-          MlirNamedAttribute typeBoundAttr = toMlirNamedAttribute(
-              "torch.type_bound", mlirTypeAttrGet(typeBound));
-          return mlirDictionaryAttrGet(context, 1, &typeBoundAttr);
-        });
-    // For IValue importing, the logical linkage structure of the module
-    // is determined by the object graph.
-    //
-    // The functions' symbol names are thus irrelevant to the module's
-    // externally visible characteristics, so mark them all as private.
-    //
-    // These functions may be referenced by the object graph, which can make
-    // them reachable from the exernally visible characteristics of the module,
-    // but they cannot be intrinsically externally visible.
-    mlirOperationSetAttributeByName(
-        func, toMlirStringRef("sym_visibility"),
-        mlirStringAttrGet(context, toMlirStringRef("private")));
+  // Functions are imported on demand once the object graph has been traversed.
+  if (importOptions.importReachableFunctionsOnly)
+    return;
+
+  importFunctions(cu->get_functions());
+}
+
+// Calls `callback` on each function directly referenced from `block`.
+static void
+forEachReferencedFunction(torch::jit::Block *block,
+                          std::function<void(torch::jit::Function *)> callback) {
+  for (torch::jit::Node *node : block->nodes()) {
+    if (node->kind() == c10::prim::Constant) {
+      if (auto functionType =
+              node->output()->type()->cast<c10::FunctionType>()) {
+        callback(functionType->function());
+      }
+    } else if (node->kind() == c10::prim::CallMethod) {
+      if (auto classType = node->input(0)->type()->cast<c10::ClassType>()) {
+        if (torch::jit::Function *method =
+                classType->findMethod(node->s(c10::attr::name))) {
+          callback(method);
+        }
+      }
+    }
+    for (torch::jit::Block *nestedBlock : node->blocks())
+      forEachReferencedFunction(nestedBlock, callback);
+  }
+}
+
+std::unordered_set<torch::jit::Function *>
+IValueImporter::computeReachableFunctions() {
+  std::unordered_set<torch::jit::Function *> reachable;
+  std::vector<torch::jit::Function *> worklist;
+  auto markReachable = [&](torch::jit::Function *function) {
+    if (reachable.insert(function).second)
+      worklist.push_back(function);
+  };
+  for (auto &classTypeAndBody : classTypeBodies) {
+    c10::ClassType *classType = classTypeAndBody.first;
+    const auto &methodAnnotations =
+        annotator.getOrCreateClassAnnotation(classType).getMethodAnnotations();
+    const auto &methods = classType->methods();
+    for (int i = 0, e = methods.size(); i != e; i++) {
+      if (methodAnnotations[i].isExported)
+        markReachable(methods[i]);
+    }
+  }
+  while (!worklist.empty()) {
+    torch::jit::Function *function = worklist.back();
+    worklist.pop_back();
+    forEachReferencedFunction(
+        torch::jit::toGraphFunction(*function).graph()->block(),
+        markReachable);
+  }
+  return reachable;
+}
+
+void IValueImporter::finishImport() {
+  if (compilationUnit == nullptr)
+    return;
+
+  std::unordered_set<torch::jit::Function *> reachable =
+      computeReachableFunctions();
+  statistics.numFunctionsUnreachable =
+      compilationUnit->get_functions().size() - reachable.size();
+  if (!importOptions.importReachableFunctionsOnly)
+    return;
+
+  for (auto &classTypeAndBody : classTypeBodies) {
+    c10::ClassType *classType = classTypeAndBody.first;
+    const auto &methodAnnotations =
+        annotator.getOrCreateClassAnnotation(classType).getMethodAnnotations();
+    const auto &methods = classType->methods();
+    for (int i = 0, e = methods.size(); i != e; i++) {
+      if (reachable.count(methods[i]))
+        importMethod(methods[i], classTypeAndBody.second, methodAnnotations[i]);
+    }
+  }
+
+  // Import in compilation unit order, so that the result does not depend on
+  // the order in which the functions were discovered.
+  std::vector<torch::jit::Function *> reachableFunctions;
+  for (torch::jit::Function *function : compilationUnit->get_functions()) {
+    if (reachable.count(function))
+      reachableFunctions.push_back(function);
+  }
+  importFunctions(reachableFunctions);
+}
+
+void IValueImporter::importFunctions(
+    const std::vector<torch::jit::Function *> &functions) {
+  ScopedTimer timer(statistics.functionsSeconds);
+  statistics.numFunctionsImported += functions.size();
+  int64_t numThreads = importOptions.numThreads;
+  if (numThreads == 0)
+    numThreads = std::thread::hardware_concurrency();
+  numThreads = std::min<int64_t>(numThreads, functions.size());
+
+  // Each function is imported into a detached `func` op, so this can be done
+  // concurrently. The ops are then inserted in the original order, which
+  // keeps the output independent of the number of threads.
+  std::vector<MlirOperation> funcs(functions.size(), {nullptr});
+  if (numThreads <= 1) {
+    for (size_t i = 0, e = functions.size(); i != e; i++)
+      funcs[i] = createFuncOp(functions[i]);
+  } else {
+    // `graph()` and `getSchema()` can lazily create (and optimize) state
+    // that is shared through the compilation unit, so materialize it here,
+    // before any worker runs without the GIL.
+    for (torch::jit::Function *function : functions) {
+      (void)torch::jit::toGraphFunction(*function).graph();
+      (void)function->getSchema();
+    }
+    std::atomic<size_t> nextIndex(0);
+    std::vector<std::exception_ptr> errors(functions.size());
+    auto worker = [&]() {
+      for (size_t i = nextIndex++; i < functions.size(); i = nextIndex++) {
+        try {
+          funcs[i] = createFuncOp(functions[i]);
+        } catch (...) {
+          errors[i] = std::current_exception();
+        }
+      }
+    };
+    {
+      // Diagnostics emitted by the workers are printed to Python's
+      // `sys.stderr`, which needs the GIL.
+      py::gil_scoped_release release;
+      std::vector<std::thread> threads;
+      for (int64_t i = 0; i < numThreads; i++)
+        threads.emplace_back(worker);
+      for (std::thread &thread : threads)
+        thread.join();
+    }
+    // Report the error of the first function that failed, as the sequential
+    // import would have.
+    auto error = std::find_if(errors.begin(), errors.end(),
+                              [](std::exception_ptr &e) { return !!e; });
+    if (error != errors.end()) {
+      for (MlirOperation func : funcs) {
+        if (!mlirOperationIsNull(func))
+          mlirOperationDestroy(func);
+      }
+      std::rethrow_exception(*error);
+    }
+  }
+
+  for (MlirOperation func : funcs) {
     mlirBlockInsertOwnedOperationBefore(
         importBlock, mlirBlockGetTerminator(importBlock), func);
   }
 }
 
+MlirOperation IValueImporter::createFuncOp(torch::jit::Function *function) {
+  // Useful for debugging errors in free functions that end up being
+  // unused. These can be missing when round-tripping through the on-disk
+  // format, even though they still cause import issues when importing
+  // through the larger Python session where they originate.
+  // std::cerr << "NAME: " << function->qualname().qualifiedName() << "\n";
+  // std::cerr << *torch::jit::toGraphFunction(function).graph();
+  MethodAnnotation *annotation =
+      annotator.getMethodAnnotationForFunction(function);
+  MlirOperation func = importJitFunctionAsFuncOp(
+      context, function, [&](int argIndex) -> MlirAttribute {
+        if (!annotation || !annotation->argAnnotations.has_value()) {
+          return {nullptr};
+        }
+        c10::optional<std::vector<int64_t>> &maybeShape =
+            annotation->argAnnotations.value()[argIndex].shape;
+        c10::optional<c10::ScalarType> &maybeDtype =
+            annotation->argAnnotations.value()[argIndex].dtype;
+        bool hasValueSemantics =
+            annotation->argAnnotations.value()[argIndex].hasValueSemantics;
+
+        // TODO: Handle unranked tensors and tensors with unknown dtype (but
+        // possibly known ranks/sizes).
+        if (!maybeShape || !maybeDtype) {
+          return {nullptr};
+        }
+
+        std::vector<int64_t> shape = *maybeShape;
+        MlirType dtype = getMlirTypeForTorchScalarType(
+            mlirLocationUnknownGet(context), *maybeDtype);
+        MlirType typeBound;
+        // `std::vector`'s `.data()` method can return nullptr when the
+        // size is 0. This triggers the "nothing known about sizes" case in
+        // the C API constructor, when we want the "we know we have 0 sizes"
+        // case. So use a dummy data pointer.
+        int64_t dummy;
+        int64_t *shapeData = shape.size() == 0 ? &dummy : shape.data();
+        if (hasValueSemantics) {
+          typeBound = torchMlirTorchValueTensorTypeGet(context, shape.size(),
+                                                       shapeData, dtype);
+        } else {
+          typeBound = torchMlirTorchNonValueTensorTypeGet(
+              context, shape.size(), shapeData, dtype);
+        }
+
+        MlirNamedAttribute typeBoundAttr = toMlirNamedAttribute(
+            "torch.type_bound", mlirTypeAttrGet(typeBound));
+        return mlirDictionaryAttrGet(context, 1, &typeBoundAttr);
+      });
+  // For IValue importing, the logical linkage structure of the module
+  // is determined by the object graph.
+  //
+  // The functions' symbol names are thus irrelevant to the module's
+  // externally visible characteristics, so mark them all as private.
+  //
+  // These functions may be referenced by the object graph, which can make
+  // them reachable from the exernally visible characteristics of the module,
+  // but they cannot be intrinsically externally visible.
+  mlirOperationSetAttributeByName(
+      func, toMlirStringRef("sym_visibility"),
+      mlirStringAttrGet(context, toMlirStringRef("private")));
+  return func;
+}
+
 MlirValue torch_mlir::importIValue(c10::IValue ivalue, MlirBlock block,
-                              MlirContext context, ClassAnnotator &annotator) {
+                                   MlirContext context,
+                                   ClassAnnotator &annotator,
+                                   const ImportOptions &importOptions,
+                                   ImportStatistics *importStatistics) {
   // When debugging module importing, it can be useful to dump as so:
   // if (ivalue.isModule())
   //   ivalue.toModule().dump(true, false, false);
-  IValueImporter importer(block, context, annotator);
-  return importer.importIValue(ivalue);
+  auto start = std::chrono::steady_clock::now();
+  IValueImporter importer(block, context, annotator, importOptions);
+  MlirValue value = importer.importIValue(ivalue);
+  importer.finishImport();
+  if (importStatistics) {
+    *importStatistics = importer.getStatistics();
+    importStatistics->totalSeconds =
+        std::chrono::duration<double>(std::chrono::steady_clock::now() - start)
+            .count();
+  }
+  return value;
 }
@@ -13,6 +13,8 @@
 #include <memory>
 
 #include "class_annotator.h"
+#include "import_options.h"
+#include "import_statistics.h"
 #include "pybind.h"
 
 #include "mlir-c/IR.h"
@@ -25,8 +27,12 @@ namespace torch_mlir {
 
 /// Main entry-point for importing torch IValue's .
 /// Recursively imports `ivalue`, inserting operations at the end of `block`.
+/// If `importStatistics` is not null, it is populated with statistics about
+/// the import.
 MlirValue importIValue(c10::IValue ivalue, MlirBlock block, MlirContext context,
-                       ClassAnnotator &annotator);
+                       ClassAnnotator &annotator,
+                       const ImportOptions &importOptions,
+                       ImportStatistics *importStatistics = nullptr);
 
 } // namespace torch_mlir
 
@@ -20,6 +20,8 @@
 #include "mlir-c/Registration.h"
 #include "torch-mlir-c/Registration.h"
 
+#include <unordered_set>
+
 namespace py = pybind11;
 using namespace torch_mlir;
 
@@ -83,12 +85,22 @@ static void printDiagnostic(MlirDiagnostic diagnostic) {
     ssp->write(s.data, s.length);
   };
   mlirDiagnosticPrint(diagnostic, stringCallback, static_cast<void *>(&ss));
+  // Diagnostics can be emitted from importer threads that don't hold the GIL.
+  py::gil_scoped_acquire acquire;
   // Use pybind11's print:
   // https://pybind11.readthedocs.io/en/stable/advanced/pycpp/utilities.html
   py::print(ss.str(),
             py::arg("file") = py::module_::import("sys").attr("stderr"));
 }
 
+// The contexts that have been set up for importing (see `prepareContext`).
+// A context is removed from the set when it is destroyed, which deletes the
+// user data of its diagnostic handler. Only accessed with the GIL held.
+static std::unordered_set<void *> &getPreparedContexts() {
+  static std::unordered_set<void *> preparedContexts;
+  return preparedContexts;
+}
+
 // Register a diagnostic handler that will redirect output to `sys.stderr`
 // instead of a C/C++-level file abstraction. This ensures, for example,
 // that mlir diagnostics emitted are correctly routed in Jupyter notebooks.
@@ -101,25 +113,37 @@ static void registerPythonSysStderrDiagnosticHandler(MlirContext context) {
     }
     return mlirLogicalResultSuccess();
   };
+  // The handler's user data is deleted when the context is destroyed, which
+  // we use to forget about the context.
   MlirDiagnosticHandlerID id = mlirContextAttachDiagnosticHandler(
-      context, diagnosticHandler, nullptr, [](void *) { return; });
+      context, diagnosticHandler, context.ptr,
+      [](void *contextPtr) { getPreparedContexts().erase(contextPtr); });
   // Ignore the ID. We intend to keep this handler for the entire lifetime
   // of this context.
   (void)id;
 }
 
-ModuleBuilder::ModuleBuilder(pybind11::object contextObj)
-    : contextObj(createPythonContextIfNone(std::move(contextObj))),
-      context(castPythonObjectToMlirContext(this->contextObj)),
-      module(createEmptyModule(this->context)),
-      moduleObj(castMlirModuleToPythonObject(module)),
-      unknownLoc(mlirLocationUnknownGet(context)) {
+// Registers the dialects and the diagnostic handler needed for importing into
+// `context`. This is only done once per context, so that building many
+// modules in the same context doesn't accumulate diagnostic handlers.
+static void prepareContext(MlirContext context) {
+  if (!getPreparedContexts().insert(context.ptr).second)
+    return;
   // TODO: Rework this once dialect registration C-APIs are in place.
   // https://reviews.llvm.org/D88162
   mlirRegisterAllDialects(context);
   torchMlirRegisterAllDialects(context);
 
   registerPythonSysStderrDiagnosticHandler(context);
+}
+
+ModuleBuilder::ModuleBuilder(pybind11::object contextObj)
+    : contextObj(createPythonContextIfNone(std::move(contextObj))),
+      context(castPythonObjectToMlirContext(this->contextObj)),
+      module(createEmptyModule(this->context)),
+      moduleObj(castMlirModuleToPythonObject(module)),
+      unknownLoc(mlirLocationUnknownGet(context)) {
+  prepareContext(context);
 
   // Terminator will always be the first op of an empty module.
   terminator = mlirBlockGetFirstOperation(getBodyBlock());
@@ -135,12 +159,18 @@ ModuleBuilder::importFunction(torch::jit::StrongFunctionPtr function) {
 }
 
 void ModuleBuilder::importModule(torch::jit::Module jitModule,
-                                 py::object maybeClassAnnotator) {
+                                 py::object maybeClassAnnotator,
+                                 py::object maybeImportOptions) {
   ClassAnnotator dummyAnnotator;
   ClassAnnotator *classAnnotator = &dummyAnnotator;
   if (!maybeClassAnnotator.is_none()) {
     classAnnotator = py::cast<ClassAnnotator *>(maybeClassAnnotator);
   }
+  ImportOptions defaultImportOptions;
+  ImportOptions *importOptions = &defaultImportOptions;
+  if (!maybeImportOptions.is_none()) {
+    importOptions = py::cast<ImportOptions *>(maybeImportOptions);
+  }
   // Set a debugging name for the MLIR Module based on the jitModule's class
   // name.
   // This is a bit hacky, because we are mutating the enclosing ModuleOp
@@ -165,7 +195,8 @@ void ModuleBuilder::importModule(torch::jit::Module jitModule,
                                   toMlirStringRef("torch.debug_module_name"),
                                   debugModuleNameAttr);
   importIValue(jitModule._ivalue(), mlirModuleGetBody(module),
-               mlirModuleGetContext(module), *classAnnotator);
+               mlirModuleGetContext(module), *classAnnotator, *importOptions,
+               &importStatistics);
 }
 
 MlirBlock ModuleBuilder::getBodyBlock() {
@@ -178,7 +209,10 @@ void ModuleBuilder::bind(py::module &m) {
       .def(py::init<py::object>(), py::arg("context") = py::none())
       .def_property_readonly("context", &ModuleBuilder::getContextObj)
       .def_property_readonly("module", &ModuleBuilder::getModuleObj)
+      .def_property_readonly("import_statistics",
+                             &ModuleBuilder::getImportStatistics)
       .def("import_function", &ModuleBuilder::importFunction)
       .def("import_module", &ModuleBuilder::importModule, py::arg("module"),
-           py::arg("classAnnotator") = py::none());
+           py::arg("classAnnotator") = py::none(),
+           py::arg("importOptions") = py::none());
 }
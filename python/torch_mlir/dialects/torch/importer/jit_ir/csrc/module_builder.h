@@ -13,6 +13,7 @@
 #include "pybind.h"
 
 #include "class_annotator.h"
+#include "import_statistics.h"
 
 #include "mlir-c/IR.h"
 
@@ -44,9 +45,14 @@ public:
 
   // Imports a torch::jit::Module into the current module, using the
   // annotations, if not none, provided in `maybeClassAnnotator` which should be
-  // a ClassAnnotator.
+  // a ClassAnnotator, and the options, if not none, provided in
+  // `maybeImportOptions` which should be an ImportOptions.
   void importModule(torch::jit::Module jitModule,
-                    py::object maybeClassAnnotator);
+                    py::object maybeClassAnnotator,
+                    py::object maybeImportOptions);
+
+  // Returns counters and timings for the most recent `importModule` call.
+  py::dict getImportStatistics() { return importStatistics.toPyDict(); }
 
 private:
   MlirBlock getBodyBlock();
@@ -60,6 +66,7 @@ private:
   pybind11::object moduleObj;
   MlirOperation terminator;
   MlirLocation unknownLoc;
+  ImportStatistics importStatistics;
 };
 
 } // namespace torch_mlir
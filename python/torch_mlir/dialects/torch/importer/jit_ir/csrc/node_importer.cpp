@@ -185,10 +185,12 @@ void NodeImporter::importNode(Node *node, MlirBlock appendToBlock) {
               mlirFlatSymbolRefAttrGet(context, toMlirStringRef(symName))));
     } else if (output->type()->cast<c10::ListType>()) {
       ClassAnnotator dummyAnnotator;
+      ImportOptions defaultImportOptions;
       MlirValue listValue = importIValue(node->ival(c10::attr::value),
                                          appendToBlock,
                                          context,
-                                         dummyAnnotator);
+                                         dummyAnnotator,
+                                         defaultImportOptions);
       mapResults(node, mlirOpResultGetOwner(listValue));
       return; // Early return, since `importIValue` already added op to block.
     } else {
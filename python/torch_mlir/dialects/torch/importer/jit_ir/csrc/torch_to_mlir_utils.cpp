@@ -247,6 +247,70 @@ torch_mlir::getFunctionTypeFromSchema(MlirContext context,
                              outputTypes.size(), outputTypes.data());
 }
 
+// Converts a sparse COO or CSR tensor into a SparseElementsAttr, so that only
+// the nonzero elements end up in the IR.
+static MlirAttribute convertSparseTensorToMlirElementsAttr(at::Tensor tensor,
+                                                           MlirLocation loc) {
+  auto throwUnsupportedTensorError = [&]() {
+    std::stringstream msg;
+    msg << "Unsupported import sparse tensor: " << tensor;
+    throw std::invalid_argument(msg.str());
+  };
+
+  // Gather the indices into the [nnz, rank] form of SparseElementsAttr.
+  std::vector<int64_t> indices;
+  at::Tensor values;
+  if (tensor.layout() == c10::Layout::Sparse) {
+    // Hybrid tensors (with dense trailing dimensions) cannot be represented.
+    if (tensor.dense_dim() != 0)
+      throwUnsupportedTensorError();
+    tensor = tensor.coalesce();
+    at::Tensor cooIndices =
+        tensor.indices().t().contiguous().to(at::ScalarType::Long);
+    const int64_t *cooIndicesData = cooIndices.data_ptr<int64_t>();
+    indices.assign(cooIndicesData, cooIndicesData + cooIndices.numel());
+    values = tensor.values();
+  } else if (tensor.layout() == c10::Layout::SparseCsr) {
+    if (tensor.dim() != 2)
+      throwUnsupportedTensorError();
+    at::Tensor crowIndices =
+        tensor.crow_indices().contiguous().to(at::ScalarType::Long);
+    at::Tensor colIndices =
+        tensor.col_indices().contiguous().to(at::ScalarType::Long);
+    const int64_t *crowIndicesData = crowIndices.data_ptr<int64_t>();
+    const int64_t *colIndicesData = colIndices.data_ptr<int64_t>();
+    indices.reserve(2 * colIndices.numel());
+    for (int64_t row = 0, e = crowIndices.numel() - 1; row < e; row++) {
+      for (int64_t i = crowIndicesData[row]; i < crowIndicesData[row + 1];
+           i++) {
+        indices.push_back(row);
+        indices.push_back(colIndicesData[i]);
+      }
+    }
+    values = tensor.values();
+  } else {
+    throwUnsupportedTensorError();
+  }
+
+  MlirContext context = mlirLocationGetContext(loc);
+  MlirAttribute valuesAttr = convertTensorToMlirElementsAttr(values, loc);
+  int64_t indicesShape[2] = {values.size(0), tensor.dim()};
+  MlirType indicesType = mlirRankedTensorTypeGet(
+      2, indicesShape, mlirIntegerTypeGet(context, 64), {nullptr});
+  MlirAttribute indicesAttr = mlirDenseElementsAttrInt64Get(
+      indicesType, indices.size(), indices.data());
+
+  MlirType elementType = getMlirTypeForTorchScalarType(
+      loc, c10::toUnderlying(tensor.scalar_type()));
+  std::vector<int64_t> shape(tensor.sizes().begin(), tensor.sizes().end());
+  MlirType shapedType = mlirRankedTensorTypeGetChecked(
+      loc, shape.size(), shape.data(), elementType, {nullptr});
+  if (mlirTypeIsNull(shapedType)) {
+    throwUnsupportedTensorError();
+  }
+  return mlirSparseElementsAttribute(shapedType, indicesAttr, valuesAttr);
+}
+
 MlirAttribute torch_mlir::convertTensorToMlirElementsAttr(at::Tensor tensor,
                                                           MlirLocation loc) {
   using at::ScalarType;
@@ -257,6 +321,18 @@ MlirAttribute torch_mlir::convertTensorToMlirElementsAttr(at::Tensor tensor,
     throw std::invalid_argument(msg.str());
   };
 
+  // Tensors on the meta device have no data to read. They can only be
+  // imported by reference (see `ImportOptions::externalTensorLocations`).
+  if (tensor.is_meta()) {
+    std::stringstream msg;
+    msg << "Cannot import the data of a tensor on the meta device (of type "
+        << tensor.scalar_type() << " and sizes " << tensor.sizes() << ")";
+    throw std::invalid_argument(msg.str());
+  }
+
+  if (tensor.is_sparse() || tensor.is_sparse_csr())
+    return convertSparseTensorToMlirElementsAttr(tensor, loc);
+
   // Get a C-contiguous form as we can bulk-load that into a DenseElementsAttr.
   if (!tensor.is_contiguous())
     tensor = tensor.contiguous();
@@ -282,11 +358,20 @@ MlirAttribute torch_mlir::convertTensorToMlirElementsAttr(at::Tensor tensor,
   }
 
   // Import DenseElementsAttr data.
-  // TODO: Support bool tensors.
   // TODO: More import formats in C-API.
   auto numElements = tensor.numel();
   auto tensorData = tensor.data_ptr();
   switch (tensor.scalar_type()) {
+  case ScalarType::Byte:
+  case ScalarType::Char:
+  case ScalarType::Short:
+  case ScalarType::Half:
+  case ScalarType::BFloat16:
+    // The storage of these types matches the DenseElementsAttr raw buffer
+    // format exactly, so the data can be imported in bulk.
+    return mlirDenseElementsAttrRawBufferGet(
+        shapedType, numElements * tensor.element_size(), tensorData);
+    break;
   case ScalarType::Int:
     return mlirDenseElementsAttrInt32Get(
         shapedType, numElements, static_cast<const int32_t *>(tensorData));
@@ -303,10 +388,19 @@ MlirAttribute torch_mlir::convertTensorToMlirElementsAttr(at::Tensor tensor,
     return mlirDenseElementsAttrDoubleGet(
         shapedType, numElements, static_cast<const double *>(tensorData));
     break;
-  case ScalarType::Bool:
-    return mlirDenseElementsAttrBoolGet(shapedType, numElements,
-                                        static_cast<const int *>(tensorData));
+  case ScalarType::Bool: {
+    // PyTorch stores one byte per bool, while DenseElementsAttr packs i1
+    // elements into bits (LSB first), so pack them before importing.
+    const bool *boolData = static_cast<const bool *>(tensorData);
+    std::vector<char> packedData((numElements + 7) / 8, 0);
+    for (int64_t i = 0; i < numElements; i++) {
+      if (boolData[i])
+        packedData[i / 8] |= 1 << (i % 8);
+    }
+    return mlirDenseElementsAttrRawBufferGet(shapedType, packedData.size(),
+                                             packedData.data());
     break;
+  }
   case ScalarType::QInt8:
     return mlirDenseElementsAttrInt8Get(
         shapedType, numElements, static_cast<const int8_t *>(tensorData));
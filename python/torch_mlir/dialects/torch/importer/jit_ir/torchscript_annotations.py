@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 # Also available under a BSD-style license. See LICENSE.
 
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import torch
 
@@ -55,3 +55,70 @@ def extract_annotations(program: torch.nn.Module,
     """Populate the ClassAnnotator with annotations extracted from `program`."""
     class_annotator.exportNone(scripted._c._type())
     _recursively_extract_annotations(program, scripted, class_annotator)
+
+
+def annotate_args_from_example_inputs(
+        scripted: torch.jit.ScriptModule,
+        class_annotator: ClassAnnotator,
+        example_inputs: Sequence[Any],
+        method_path: Sequence[str] = ("forward",),
+        dynamic_dims: Optional[Dict[int, Sequence[int]]] = None,
+        value_semantics: Union[bool, Sequence[bool]] = False,
+        check: bool = True):
+    """Annotate the args of a method with the shapes/dtypes of example inputs.
+
+    Each tensor in `example_inputs` (which excludes `self`) annotates the
+    corresponding argument with its dtype and static shape. Other arguments
+    are left unannotated.
+
+    `value_semantics` states whether the tensor arguments have value
+    semantics, either for all of them or per input (the entries for
+    non-tensor inputs are ignored). Example inputs cannot show whether the
+    method mutates or aliases an argument, so this is up to the caller: an
+    argument may only be given value semantics if the method never mutates it
+    in place, otherwise the program is miscompiled.
+
+    `dynamic_dims` maps the index of an input to the dimensions of it that
+    should stay dynamic, such as the batch dimension. Negative dimensions
+    count from the end.
+
+    If `check` is true, the method is first run on the example inputs, so
+    that inputs that the program cannot actually accept are reported here
+    rather than as a confusing compilation error.
+    """
+    dynamic_dims = dynamic_dims or {}
+    if isinstance(value_semantics, bool):
+        value_semantics = [value_semantics] * len(example_inputs)
+    elif len(value_semantics) != len(example_inputs):
+        raise ValueError(
+            f"value_semantics has {len(value_semantics)} entries, but there "
+            f"are {len(example_inputs)} example inputs")
+    *submodule_path, method_name = method_path
+    scripted_submodule = scripted
+    for name in submodule_path:
+        scripted_submodule = getattr(scripted_submodule, name)
+    if check:
+        with torch.no_grad():
+            getattr(scripted_submodule, method_name)(*example_inputs)
+
+    for index in dynamic_dims:
+        if not 0 <= index < len(example_inputs) or not isinstance(
+                example_inputs[index], torch.Tensor):
+            raise ValueError(
+                f"dynamic_dims refers to input {index}, which is not a tensor")
+    arg_annotations = [None]
+    for index, example_input in enumerate(example_inputs):
+        if not isinstance(example_input, torch.Tensor):
+            arg_annotations.append(None)
+            continue
+        shape = list(example_input.shape)
+        for dim in dynamic_dims.get(index, []):
+            if not -len(shape) <= dim < len(shape):
+                raise ValueError(
+                    f"dynamic dimension {dim} is out of range for input "
+                    f"{index} of rank {len(shape)}")
+            shape[dim] = -1
+        arg_annotations.append(
+            (shape, example_input.dtype, value_semantics[index]))
+    class_annotator.annotateArgs(scripted._c._type(), list(method_path),
+                                 arg_annotations)
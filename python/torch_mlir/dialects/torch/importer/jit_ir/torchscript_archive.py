@@ -0,0 +1,324 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+
+"""Importing TorchScript archives without materializing their tensors.
+
+`torch.jit.save` writes each tensor storage as an uncompressed, 64-byte aligned
+record of a zip archive. Instead of loading the tensor data into memory, we
+load the module onto the `meta` device, which keeps only the tensor metadata
+around, and import each tensor as an external literal referencing its record
+in the archive itself.
+
+`torch.jit.load` reads every storage record before moving its tensors to the
+`meta` device, so the module is loaded from a copy of the archive with empty
+storage records. Memory use during import is then bounded by the size of the
+program instead of the size of the weights.
+
+Only the tensors that get an external location are placed on the `meta`
+device, by rewriting the device recorded for their storages in the copy.
+Other tensors, such as the constants of the code (e.g. the weights of traced
+or frozen modules), keep their data and are imported as usual.
+"""
+
+import os
+import pickle
+import pickletools
+import shutil
+import struct
+import tempfile
+import zipfile
+from typing import Callable, Dict, Set, Tuple
+
+import torch
+
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions
+
+# The size of the fixed part of a zip local file header, and the offsets of
+# the file name and extra field lengths in it.
+_ZIP_LOCAL_HEADER_SIZE = 30
+_ZIP_LOCAL_HEADER_LENGTHS_OFFSET = 26
+
+
+class _ObjectRecord:
+    """A TorchScript object (such as a module) from an archive's pickle."""
+    def __setstate__(self, state):
+        self.state = state
+
+
+class _StorageRecord:
+    def __init__(self, key: str, storage_type):
+        self.key = key
+        self.element_size = storage_type(0).element_size()
+
+
+class _TensorRecord:
+    def __init__(self, storage: _StorageRecord, storage_offset: int, size,
+                 stride):
+        self.storage = storage
+        self.storage_offset = storage_offset
+        self.size = tuple(size)
+        self.stride = tuple(stride)
+
+    def is_contiguous(self) -> bool:
+        expected_stride = 1
+        for size, stride in reversed(list(zip(self.size, self.stride))):
+            if size != 1 and stride != expected_stride:
+                return False
+            expected_stride *= size
+        return True
+
+
+def _rebuild_tensor_record(storage, storage_offset, size, stride, *args):
+    return _TensorRecord(storage, storage_offset, size, stride)
+
+
+def _rebuild_parameter_record(data, *args):
+    return data
+
+
+class _ArchiveUnpickler(pickle.Unpickler):
+    """Unpickles the object graph of an archive with tensors as records."""
+    def find_class(self, module, name):
+        if module.startswith("__torch__"):
+            return type(name, (_ObjectRecord,), {})
+        if module == "torch._utils" and name == "_rebuild_tensor_v2":
+            return _rebuild_tensor_record
+        if module == "torch._utils" and name == "_rebuild_parameter":
+            return _rebuild_parameter_record
+        if module == "torch" and name.endswith("Storage"):
+            return getattr(torch, name)
+        if module == "torch.jit._pickle" or module == "collections":
+            return super().find_class(module, name)
+        # We only need the tensors and objects, so anything else can be
+        # replaced with an opaque value.
+        return lambda *args, **kwargs: None
+
+    def persistent_load(self, pid):
+        typename, storage_type, key, location, numel = pid
+        assert typename == "storage", f"unexpected persistent id {pid}"
+        return _StorageRecord(key, storage_type)
+
+
+def _get_record_data_offset(archive_file, info: zipfile.ZipInfo) -> int:
+    """Returns the offset of the data of an archive record in the file."""
+    archive_file.seek(info.header_offset + _ZIP_LOCAL_HEADER_LENGTHS_OFFSET)
+    name_length, extra_length = struct.unpack("<HH", archive_file.read(4))
+    return (info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length +
+            extra_length)
+
+
+def _find_archive_tensor_locations(
+        archive_path: str) -> Tuple[Dict[str, Tuple[str, int]], Set[str]]:
+    """Returns the tensor locations of an archive and their storage keys."""
+    archive_path = os.path.abspath(archive_path)
+    locations = {}
+    located_storage_keys = set()
+    # The first tensor found for each storage key, and its path.
+    tensors_by_storage = {}
+    with zipfile.ZipFile(archive_path) as archive, \
+            open(archive_path, "rb") as archive_file:
+        prefix = archive.namelist()[0].split("/")[0]
+        with archive.open(f"{prefix}/data.pkl") as data_pickle:
+            root = _ArchiveUnpickler(data_pickle).load()
+
+        def visit(obj, path):
+            if isinstance(obj, _TensorRecord):
+                first_tensor, first_path = tensors_by_storage.setdefault(
+                    obj.storage.key, (obj, path))
+                if first_tensor is not obj:
+                    raise ValueError(
+                        "Unhandled tensor that shares storage with another "
+                        f"tensor.\nFound at path '<root>.{'.'.join(path)}' "
+                        "(sharing with '<root>."
+                        f"{'.'.join(first_path)}')")
+                if not obj.is_contiguous():
+                    return
+                info = archive.getinfo(f"{prefix}/data/{obj.storage.key}")
+                if info.compress_type != zipfile.ZIP_STORED:
+                    return
+                offset = _get_record_data_offset(archive_file, info)
+                offset += obj.storage_offset * obj.storage.element_size
+                locations[".".join(path)] = (archive_path, offset)
+                located_storage_keys.add(obj.storage.key)
+            elif isinstance(obj, _ObjectRecord) and isinstance(
+                    getattr(obj, "state", None), dict):
+                for name, value in obj.state.items():
+                    visit(value, path + [name])
+            elif isinstance(obj, (list, tuple)):
+                # Name elements as the importer does: by their index, and by
+                # their key for dicts with string or int keys.
+                for i, value in enumerate(obj):
+                    visit(value, path + [str(i)])
+            elif isinstance(obj, dict):
+                for key, value in obj.items():
+                    if isinstance(key, (str, int)) and \
+                            not isinstance(key, bool):
+                        visit(value, path + [str(key)])
+
+        visit(root, [])
+    return locations, located_storage_keys
+
+
+def get_archive_tensor_locations(
+        archive_path: str) -> Dict[str, Tuple[str, int]]:
+    """Returns the file locations of the tensor attributes of an archive.
+
+    The result maps the attribute path of each tensor reachable from the root
+    module (e.g. "layer1.0.weight") to the archive path and byte offset of its
+    data. Elements of list and tuple attributes are named by their index, and
+    values of dict attributes with string or int keys by their key (e.g.
+    "weights.0"). Tensors whose data cannot be mapped directly (e.g.
+    non-contiguous views) are left out.
+
+    Distinct tensors sharing a storage are rejected, as the importer does for
+    loaded modules. Once loaded onto the `meta` device, such tensors no
+    longer share a storage, so the importer can't detect them itself.
+    """
+    return _find_archive_tensor_locations(archive_path)[0]
+
+
+_STRING_OPCODES = {"BINUNICODE", "SHORT_BINUNICODE", "BINUNICODE8", "UNICODE"}
+_MEMO_PUT_OPCODES = {"BINPUT", "LONG_BINPUT"}
+_MEMO_GET_OPCODES = {"BINGET", "LONG_BINGET"}
+
+
+def _encode_string_op(string: str) -> bytes:
+    encoded = string.encode("utf-8")
+    return pickle.BINUNICODE + struct.pack("<I", len(encoded)) + encoded
+
+
+def _rewrite_storage_locations(data: bytes,
+                               get_location: Callable[[str], str]) -> bytes:
+    """Rewrites the device recorded for each storage of a TorchScript pickle.
+
+    Storages are pickled as the persistent ids
+    `("storage", storage_type, key, location, numel)`, and the location of the
+    storage with key `key` becomes `get_location(key)`. The pickler memoizes
+    strings, so a location string can also be referenced from elsewhere in
+    the pickle. Such references keep their original value.
+    """
+    ops = list(pickletools.genops(data))
+    ends = [pos for _, _, pos in ops[1:]] + [len(data)]
+
+    # The string held by each memo entry in the original pickle.
+    memo_strings = {}
+    for i, (opcode, arg, _) in enumerate(ops):
+        if opcode.name not in _MEMO_PUT_OPCODES:
+            continue
+        previous_opcode, previous_arg, _ = ops[i - 1]
+        if previous_opcode.name in _STRING_OPCODES:
+            memo_strings[arg] = previous_arg
+        elif previous_opcode.name in _MEMO_GET_OPCODES and \
+                previous_arg in memo_strings:
+            memo_strings[arg] = memo_strings[previous_arg]
+
+    def get_string(i):
+        opcode, arg, _ = ops[i]
+        return memo_strings[arg] if opcode.name in _MEMO_GET_OPCODES else arg
+
+    # The new location for the op of each location element.
+    new_locations = {}
+    for i, (opcode, _, _) in enumerate(ops):
+        if opcode.name != "BINPERSID":
+            continue
+        tuple_end = i - 1
+        while ops[tuple_end][0].name in _MEMO_PUT_OPCODES:
+            tuple_end -= 1
+        assert ops[tuple_end][0].name == "TUPLE", "unexpected persistent id"
+        mark = tuple_end - 1
+        while ops[mark][0].name != "MARK":
+            mark -= 1
+        elements = [
+            j for j in range(mark + 1, tuple_end)
+            if ops[j][0].name not in _MEMO_PUT_OPCODES
+        ]
+        assert get_string(elements[0]) == "storage", "unexpected persistent id"
+        new_locations[elements[3]] = get_location(get_string(elements[2]))
+
+    pieces = []
+    # The original strings of the memo entries that now hold a new location.
+    changed_memo_strings = {}
+    for i, (opcode, arg, pos) in enumerate(ops):
+        piece = data[pos:ends[i]]
+        if i in new_locations:
+            piece = _encode_string_op(new_locations[i])
+        elif opcode.name in _MEMO_GET_OPCODES and arg in changed_memo_strings:
+            piece = _encode_string_op(changed_memo_strings[arg])
+        elif opcode.name in _MEMO_PUT_OPCODES:
+            if i - 1 in new_locations:
+                changed_memo_strings[arg] = get_string(i - 1)
+            else:
+                changed_memo_strings.pop(arg, None)
+        pieces.append(piece)
+    return b"".join(pieces)
+
+
+def _copy_archive_for_loading(archive_path: str, copy_path: str,
+                              located_storage_keys: Set[str]):
+    """Copies an archive so that loading it never reads located storages.
+
+    The records of the storages in `located_storage_keys` are replaced with
+    empty ones, and these storages are placed on the `meta` device. All other
+    storages, including the ones of the constants of the code, are placed on
+    the CPU with their data.
+    """
+    def get_data_location(key):
+        return "meta" if key in located_storage_keys else "cpu"
+
+    with zipfile.ZipFile(archive_path) as archive, \
+            zipfile.ZipFile(copy_path, "w") as copy:
+        prefix = archive.namelist()[0].split("/")[0]
+        for info in archive.infolist():
+            name = info.filename
+            if name.startswith(f"{prefix}/data/") and \
+                    name[len(f"{prefix}/data/"):] in located_storage_keys:
+                copy.writestr(name, b"")
+            elif name == f"{prefix}/data.pkl":
+                copy.writestr(
+                    name,
+                    _rewrite_storage_locations(archive.read(info),
+                                               get_data_location))
+            elif name == f"{prefix}/constants.pkl":
+                copy.writestr(
+                    name,
+                    _rewrite_storage_locations(archive.read(info),
+                                               lambda key: "cpu"))
+            else:
+                with archive.open(info) as src, \
+                        copy.open(name, "w") as dst:
+                    shutil.copyfileobj(src, dst)
+
+
+def load_torchscript_archive(
+        archive_path: str,
+        import_options: ImportOptions) -> torch.jit.ScriptModule:
+    """Loads a TorchScript archive for importing without its tensor data.
+
+    The tensor attributes of the module are loaded onto the `meta` device,
+    and `import_options` is updated so that they are imported as external
+    literals referencing the archive. Tensors that can't be referenced that
+    way (e.g. non-contiguous views, or the constants of traced and frozen
+    modules) are loaded with their data. The result can be annotated and
+    imported as usual:
+
+    ```
+    import_options = ImportOptions()
+    scripted = load_torchscript_archive("model.pt", import_options)
+    mb.import_module(scripted._c, class_annotator, import_options)
+    ```
+    """
+    locations, located_storage_keys = _find_archive_tensor_locations(
+        archive_path)
+    import_options.externalTensorLocations = locations
+    # The storages are loaded with the size recorded in the pickle, and
+    # moving them to the `meta` device never reads their data, so empty
+    # records are enough. A `map_location` would also move the constants of
+    # the code to the `meta` device, so the device of each storage is set in
+    # the copy instead.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        copy_path = os.path.join(temp_dir, os.path.basename(archive_path))
+        _copy_archive_for_loading(archive_path, copy_path,
+                                  located_storage_keys)
+        return torch.jit.load(copy_path)
@@ -0,0 +1,234 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+"""
+Compile-time benchmarks for the Torch passes on large synthetic graphs.
+
+Each benchmark generates Torch IR of increasing size, runs a pass pipeline on
+it, and reports the time spent in each pass together with its empirical
+scaling exponent (1.0 means linear). Passes that scale superlinearly are
+flagged, and make the benchmark exit with a non-zero status, so that
+regressions in e.g. `torch-refine-types` can fail CI before they hit large
+models.
+
+Usage:
+  python -m torch_mlir_e2e_test.compile_time_benchmarks --sizes 1000,2000,4000
+"""
+
+import argparse
+import math
+import sys
+from typing import Callable, Dict, List, NamedTuple, Sequence
+
+from torch_mlir.ir import Context, Module
+from torch_mlir.dialects.torch import register_dialect
+
+from .profiling import collect_compile_profile
+from .utils import run_pipeline_with_repro_report
+
+# The Torch passes we benchmark, starting from mutable (non-value) tensors as
+# produced by the TorchScript importer.
+BENCHMARK_PIPELINE = ",".join([
+    "builtin.func(torch-reduce-op-variants)",
+    "builtin.func(torch-maximize-value-semantics)",
+    "torch-shape-refinement-pipeline",
+    "builtin.func(torch-refine-types)",
+])
+
+# A pass whose time grows faster than `size ** SUPERLINEAR_EXPONENT` is
+# flagged, unless it takes less than `MIN_FLAGGED_SECONDS` (timing noise).
+SUPERLINEAR_EXPONENT = 1.25
+MIN_FLAGGED_SECONDS = 0.05
+
+_TENSOR_TYPE = "!torch.tensor<[?,?],f32>"
+
+
+def _emit_func(body: List[str], result: str) -> str:
+    lines = [f"func @forward(%arg0: {_TENSOR_TYPE}, %cond: !torch.bool) "
+             "-> !torch.tensor {"]
+    lines.append("  %int1 = torch.constant.int 1")
+    lines.extend("  " + line for line in body)
+    lines.append(f"  %result = torch.tensor_static_info_cast {result} : "
+                 f"{_TENSOR_TYPE} to !torch.tensor")
+    lines.append(f"  return %result : !torch.tensor")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _emit_unary(result: str, op: str, operand: str) -> str:
+    return (f"{result} = torch.aten.{op} {operand} : "
+            f"{_TENSOR_TYPE} -> {_TENSOR_TYPE}")
+
+
+def _emit_add(result: str, lhs: str, rhs: str) -> str:
+    return (f"{result} = torch.aten.add.Tensor {lhs}, {rhs}, %int1 : "
+            f"{_TENSOR_TYPE}, {_TENSOR_TYPE}, !torch.int -> {_TENSOR_TYPE}")
+
+
+def generate_deep_graph(size: int) -> str:
+    """A single chain of `size` elementwise ops."""
+    body = []
+    previous = "%arg0"
+    for i in range(size):
+        current = f"%{i}"
+        if i % 3 == 2:
+            body.append(_emit_add(current, previous, "%arg0"))
+        else:
+            body.append(
+                _emit_unary(current, "tanh" if i % 3 == 0 else "relu",
+                            previous))
+        previous = current
+    return _emit_func(body, previous)
+
+
+def generate_wide_graph(size: int) -> str:
+    """`size` independent ops on the input, combined by a tree of adds."""
+    body = []
+    frontier = []
+    for i in range(size):
+        body.append(_emit_unary(f"%w{i}", "tanh", "%arg0"))
+        frontier.append(f"%w{i}")
+    num_adds = 0
+    while len(frontier) > 1:
+        next_frontier = []
+        for lhs, rhs in zip(frontier[0::2], frontier[1::2]):
+            result = f"%s{num_adds}"
+            num_adds += 1
+            body.append(_emit_add(result, lhs, rhs))
+            next_frontier.append(result)
+        if len(frontier) % 2 == 1:
+            next_frontier.append(frontier[-1])
+        frontier = next_frontier
+    return _emit_func(body, frontier[0])
+
+
+def generate_alias_graph(size: int) -> str:
+    """A chain of `size` view-like ops, each using the two previous aliases.
+
+    The chain starts at the result of a value-semantic op and ends in the
+    branches of a `torch.prim.If`, so that MaximizeValueSemantics converts it
+    with the pattern that walks the view-like subgraph across blocks. Each op
+    uses two aliases from that subgraph, which is the case that must not be
+    visited once per path.
+    """
+    body = [_emit_unary("%a0", "tanh", "%arg0")]
+    for i in range(1, size + 1):
+        body.append(f"%a{i} = torch.aten.expand_as %a{i - 1}, %a{max(i - 2, 0)}"
+                    f" : {_TENSOR_TYPE}, {_TENSOR_TYPE} -> {_TENSOR_TYPE}")
+    body.append(f"%if = torch.prim.If %cond -> ({_TENSOR_TYPE}) {{")
+    for i, op in enumerate(["tanh", "relu"]):
+        if i != 0:
+            body.append("} else {")
+        body.append("  " + _emit_unary(f"%b{i}", op, f"%a{size}"))
+        body.append(f"  torch.prim.If.yield %b{i} : {_TENSOR_TYPE}")
+    body.append("}")
+    return _emit_func(body, "%if")
+
+
+GENERATORS: Dict[str, Callable[[int], str]] = {
+    "deep": generate_deep_graph,
+    "wide": generate_wide_graph,
+    "alias": generate_alias_graph,
+}
+
+
+class BenchmarkResult(NamedTuple):
+    # The name of the graph generator.
+    generator: str
+    # The graph sizes, in increasing order.
+    sizes: List[int]
+    # Seconds per pass, for each size (keyed by pass argument).
+    pass_seconds: Dict[str, List[float]]
+
+
+def run_benchmark(generator: str, sizes: Sequence[int],
+                  pipeline: str = BENCHMARK_PIPELINE) -> BenchmarkResult:
+    """Times each pass of `pipeline` on graphs of the given sizes."""
+    pass_seconds: Dict[str, List[float]] = {}
+    sizes = sorted(sizes)
+    for i, size in enumerate(sizes):
+        context = Context()
+        register_dialect(context)
+        module = Module.parse(GENERATORS[generator](size), context)
+        with collect_compile_profile() as profile:
+            run_pipeline_with_repro_report(
+                module, pipeline, f"{generator} graph of size {size}")
+        for name, seconds in profile.seconds_by_pass().items():
+            pass_seconds.setdefault(name, [0.0] * len(sizes))[i] = seconds
+    return BenchmarkResult(generator, sizes, pass_seconds)
+
+
+def scaling_exponent(sizes: Sequence[int], seconds: Sequence[float]) -> float:
+    """The exponent `k` such that time ~ size**k, fit over all sizes.
+
+    This is the slope of the least-squares line through the (log size,
+    log seconds) points, which is less sensitive to the timing noise of any
+    single run than the slope between two sizes. Sizes for which no time was
+    recorded are ignored.
+    """
+    points = [(math.log(size), math.log(s))
+              for size, s in zip(sizes, seconds)
+              if s > 0]
+    if len(points) < 2:
+        return float("nan")
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x)**2 for x, _ in points)
+    if variance == 0:
+        return float("nan")
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def is_superlinear(sizes: Sequence[int], seconds: Sequence[float]) -> bool:
+    """Whether a pass taking `seconds` on graphs of `sizes` is flagged."""
+    return (scaling_exponent(sizes, seconds) > SUPERLINEAR_EXPONENT
+            and seconds[-1] >= MIN_FLAGGED_SECONDS)
+
+
+def format_benchmark_result(result: BenchmarkResult) -> str:
+    lines = [f"{result.generator} graphs:"]
+    header = "  " + "pass".ljust(45) + "".join(
+        f"{size:>10}" for size in result.sizes) + "  exponent"
+    lines.append(header)
+    for name, seconds in sorted(result.pass_seconds.items(),
+                                key=lambda item: -item[1][-1]):
+        exponent = scaling_exponent(result.sizes, seconds)
+        flag = "  SUPERLINEAR" if is_superlinear(result.sizes,
+                                                  seconds) else ""
+        lines.append("  " + name.ljust(45) +
+                     "".join(f"{s:>10.3f}" for s in seconds) +
+                     f"{exponent:>10.2f}{flag}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the compile time of Torch passes.")
+    parser.add_argument("--sizes",
+                        default="1000,2000,4000,8000",
+                        help="Comma-separated list of graph sizes (in ops).")
+    parser.add_argument("--generators",
+                        default=",".join(GENERATORS.keys()),
+                        help="Comma-separated list of graph generators "
+                        f"(available: {', '.join(GENERATORS.keys())}).")
+    parser.add_argument("--pipeline",
+                        default=BENCHMARK_PIPELINE,
+                        help="The pass pipeline to benchmark.")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    flagged = []
+    for generator in args.generators.split(","):
+        result = run_benchmark(generator, sizes, args.pipeline)
+        print(format_benchmark_result(result))
+        flagged.extend(f"{name} ({generator} graphs)"
+                       for name, seconds in result.pass_seconds.items()
+                       if is_superlinear(result.sizes, seconds))
+    if flagged:
+        print(f"ERROR: superlinear passes: {', '.join(flagged)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+"""
+File utilities shared by the e2e test tools.
+
+This module only depends on the Python standard library, so that tools that
+run without torch-mlir (such as the heavydep test generator) can use it.
+"""
+
+from typing import Union
+
+import os
+import tempfile
+
+
+def write_file_atomically(path: str, data: Union[str, bytes]):
+    """Writes `data` to `path` such that readers never see a partial file.
+
+    The data is written to a temporary file in the same directory, which then
+    replaces `path`.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                     prefix=".tmp-" + os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
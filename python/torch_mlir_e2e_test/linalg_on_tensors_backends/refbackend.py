@@ -14,7 +14,7 @@ from torch_mlir.runtime import *
 import torch_mlir.all_passes_registration
 import torch_mlir.dialects.torch
 
-from torch_mlir_e2e_test.utils import run_pipeline_with_repro_report
+from torch_mlir_e2e_test.utils import BackendPassManagerCache, run_pipeline_with_repro_report
 
 from .abc import LinalgOnTensorsBackend
 
@@ -28,10 +28,27 @@ def checkArgTypeIsSupported(ty):
     assert ty in SUPPORTED, f"Only numpy arrays with dtypes in {SUPPORTED} are supported"
 
 
+_EXTERNAL_LITERAL_DTYPES = {
+    "i1": np.bool_,
+    "i8": np.int8,
+    "i16": np.int16,
+    "i32": np.int32,
+    "i64": np.int64,
+    "f16": np.float16,
+    "f32": np.float32,
+    "f64": np.float64,
+}
+
+
 class RefBackendInvoker:
     def __init__(self, module):
         self.ee = ExecutionEngine(module)
         self.result = None
+        # Memory maps (and their descriptors) backing external literals. These
+        # must outlive the ExecutionEngine, since compiled code holds pointers
+        # into them.
+        self._external_literals = []
+        self._register_external_literals(module)
 
         @ctypes.CFUNCTYPE(None, ctypes.POINTER(UnrankedMemRefDescriptor))
         def consume_return_mri1(a):
@@ -145,6 +162,32 @@ class RefBackendInvoker:
             "refbackend_consume_func_return_mrf32_mrf32_mrf32",
             consume_return_mrf32_mrf32_mrf32)
 
+    def _register_external_literals(self, module):
+        attributes = module.operation.attributes
+        if "refback.external_literals" not in attributes:
+            return
+        for info in ArrayAttr(attributes["refback.external_literals"]):
+            info = DictAttr(info)
+            name = StringAttr(info["name"]).value
+            array = np.memmap(
+                StringAttr(info["path"]).value,
+                dtype=_EXTERNAL_LITERAL_DTYPES[StringAttr(
+                    info["element_type"]).value],
+                mode="c",
+                offset=IntegerAttr(info["offset"]).value,
+                shape=tuple(
+                    IntegerAttr(d).value for d in ArrayAttr(info["shape"])))
+            descriptor = get_ranked_memref_descriptor(array)
+
+            @ctypes.CFUNCTYPE(None, ctypes.c_void_p)
+            def load_external_literal(result, descriptor=descriptor):
+                ctypes.memmove(result, ctypes.addressof(descriptor),
+                               ctypes.sizeof(descriptor))
+
+            self._external_literals.append(
+                (array, descriptor, load_external_literal))
+            self.ee.register_runtime(name, load_external_literal)
+
     def __getattr__(self, function_name: str):
         def invoke(*args):
             ffi_args = []
@@ -164,6 +207,9 @@ class RefBackendInvoker:
 
 
 LOWERING_PIPELINE = ",".join([
+    # Turn references to weights stored out-of-line into calls that the
+    # runtime implements by memory-mapping the weights file.
+    "refback-expand-external-literals",
     # Bufferize.
     "builtin.func(scf-bufferize)",
     "builtin.func(tm-tensor-bufferize)",
@@ -202,8 +248,14 @@ LOWERING_PIPELINE = ",".join([
 
 class RefBackendLinalgOnTensorsBackend(LinalgOnTensorsBackend):
     """Main entry-point for the reference backend."""
-    def __init__(self):
+    def __init__(self, cache_pass_managers: bool = False):
+        """
+        Args:
+          cache_pass_managers: If True, reuse the parsed pass pipeline across
+            `compile` calls on modules in the same MLIR context.
+        """
         super().__init__()
+        self._pass_manager_cache = BackendPassManagerCache(cache_pass_managers)
 
     def compile(self, imported_module: Module):
         """Compiles an imported module, with a flat list of functions.
@@ -221,7 +273,8 @@ class RefBackendLinalgOnTensorsBackend(LinalgOnTensorsBackend):
 
         run_pipeline_with_repro_report(
             imported_module, LOWERING_PIPELINE,
-            "Lowering Linalg-on-Tensors IR to LLVM with RefBackend")
+            "Lowering Linalg-on-Tensors IR to LLVM with RefBackend",
+            pass_manager_cache=self._pass_manager_cache.get(imported_module))
         return imported_module
 
     def load(self, module) -> RefBackendInvoker:
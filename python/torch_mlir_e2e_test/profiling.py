@@ -0,0 +1,71 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+"""
+Utilities for profiling the compile time of pass pipelines.
+
+Pipelines run through `run_pipeline_with_repro_report` while a profile is
+being collected (see `collect_compile_profile`) record their total time and
+per-pass timings and statistics into that profile. TorchScript imports record
+the importer's statistics (see `ModuleBuilder.import_statistics`).
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import collections
+import contextlib
+
+
+class PipelineProfile(NamedTuple):
+    # The `description` passed to `run_pipeline_with_repro_report`.
+    description: str
+    # The textual pass pipeline.
+    pipeline: str
+    # Wall time of the whole pipeline run, in seconds.
+    seconds: float
+    # Accumulated wall time in seconds, keyed by pass argument
+    # (e.g. "torch-refine-types").
+    pass_seconds: Dict[str, float]
+    # Accumulated statistic values, keyed by "<pass-argument>.<statistic>".
+    pass_statistics: Dict[str, int]
+
+
+class CompileProfile:
+    """The pipeline profiles recorded while compiling one program."""
+    def __init__(self):
+        self.pipelines: List[PipelineProfile] = []
+        # The `ModuleBuilder.import_statistics` of the TorchScript import, if
+        # any.
+        self.import_statistics: Optional[Dict[str, Any]] = None
+
+    @property
+    def seconds(self) -> float:
+        return sum(p.seconds for p in self.pipelines)
+
+    def seconds_by_pass(self) -> Dict[str, float]:
+        result = collections.defaultdict(float)
+        for pipeline in self.pipelines:
+            for name, seconds in pipeline.pass_seconds.items():
+                result[name] += seconds
+        return dict(result)
+
+
+_active_profile: Optional[CompileProfile] = None
+
+
+def get_active_compile_profile() -> Optional[CompileProfile]:
+    """Returns the profile currently being collected, if any."""
+    return _active_profile
+
+
+@contextlib.contextmanager
+def collect_compile_profile():
+    """Collect a `CompileProfile` for the pipelines run inside this context."""
+    global _active_profile
+    previous_profile = _active_profile
+    _active_profile = CompileProfile()
+    try:
+        yield _active_profile
+    finally:
+        _active_profile = previous_profile
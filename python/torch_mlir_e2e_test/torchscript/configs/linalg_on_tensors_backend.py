@@ -4,7 +4,7 @@
 # Also available under a BSD-style license. See LICENSE.
 
 import sys
-from typing import Any
+from typing import Any, Optional, Sequence
 from io import StringIO
 import os
 import tempfile
@@ -14,11 +14,12 @@ import torch
 
 from torch_mlir_e2e_test.linalg_on_tensors_backends.abc import LinalgOnTensorsBackend
 from torch_mlir_e2e_test.torchscript.framework import TestConfig, Trace, TraceItem
-from torch_mlir_e2e_test.utils import run_pipeline_with_repro_report
+from torch_mlir_e2e_test.utils import CompilationSession, run_pipeline_with_repro_report
 from .utils import (
     recursively_convert_to_numpy,
     recursively_convert_from_numpy,
     convert_torchscript_module_to_torch_backend_contract_mlir,
+    get_torch_lowering_pipeline,
 )
 
 
@@ -28,19 +29,49 @@ class LinalgOnTensorsBackendTestConfig(TestConfig):
     This class handles all the common lowering that torch-mlir does before
     reaching the linalg-on-tensors abstraction level.
     """
-    def __init__(self, backend: LinalgOnTensorsBackend):
+    def __init__(self,
+                 backend: LinalgOnTensorsBackend,
+                 session: Optional[CompilationSession] = None,
+                 fast_compile: bool = False,
+                 cache_dir: Optional[str] = None,
+                 backend_legal_ops: Sequence[str] = ()):
+        """
+        Args:
+          backend: The backend to compile the lowered module with.
+          session: The session to compile every program in. If None, a new
+            session is created and shared by all `compile` calls.
+          fast_compile: If True, only run the optimizations needed for
+            correctness when lowering, to minimize compile time.
+          cache_dir: If not None, cache the Torch backend contract IR of each
+            program in this directory, so that compiling an unchanged program
+            again skips importing it and lowering it to that form.
+          backend_legal_ops: The ops (e.g. "torch.aten.softmax.int") that the
+            backend implements itself, which are kept intact instead of being
+            decomposed when lowering to the Torch backend contract.
+        """
         super().__init__()
         self.backend = backend
+        self.session = session if session is not None else CompilationSession()
+        self.fast_compile = fast_compile
+        self.cache_dir = cache_dir
+        self.backend_legal_ops = tuple(backend_legal_ops)
 
     def compile(self, program: torch.nn.Module) -> Any:
 
         module = convert_torchscript_module_to_torch_backend_contract_mlir(
-            program)
+            program,
+            self.session,
+            cache_dir=self.cache_dir,
+            backend_legal_ops=self.backend_legal_ops,
+            fast_compile=self.fast_compile)
 
         run_pipeline_with_repro_report(
             module,
-            "torch-backend-to-linalg-on-tensors-backend-pipeline",
-            "Lower Torch Backend IR -> Linalg-on-Tensors Backend IR")
+            get_torch_lowering_pipeline(
+                "torch-backend-to-linalg-on-tensors-backend-pipeline",
+                fast_compile=self.fast_compile),
+            "Lower Torch Backend IR -> Linalg-on-Tensors Backend IR",
+            pass_manager_cache=self.session.pass_manager_cache)
 
         return self.backend.compile(module)
 
@@ -3,16 +3,24 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 # Also available under a BSD-style license. See LICENSE.
 
+import functools
+import hashlib
+import os
 import sys
-from typing import Any
-from io import StringIO
+from typing import Any, Optional, Sequence
+from io import BytesIO, StringIO
 
 import numpy as np
 import torch
 
-from torch_mlir.dialects.torch.importer.jit_ir import ClassAnnotator, ModuleBuilder
+import torch_mlir.ir
+from torch_mlir.ir import Module
+
+from torch_mlir.dialects.torch.importer.jit_ir import ClassAnnotator, ImportOptions, ModuleBuilder
 from torch_mlir.dialects.torch.importer.jit_ir.torchscript_annotations import extract_annotations
-from torch_mlir_e2e_test.utils import run_pipeline_with_repro_report
+from torch_mlir_e2e_test.file_utils import write_file_atomically
+from torch_mlir_e2e_test.profiling import get_active_compile_profile
+from torch_mlir_e2e_test.utils import CompilationSession, run_pipeline_with_repro_report
 
 def recursively_convert_to_numpy(o: Any):
     if isinstance(o, torch.Tensor):
@@ -51,17 +59,128 @@ def recursively_convert_from_numpy(o: Any):
     raise Exception(f"Unexpected Python function output: {o}")
 
 
-def convert_torchscript_module_to_torch_backend_contract_mlir(program: torch.nn.Module):
+@functools.lru_cache()
+def _get_compiler_fingerprint() -> bytes:
+    """Returns bytes that change whenever the torch-mlir build changes."""
+    hasher = hashlib.sha256()
+    libs_dir = os.path.join(os.path.dirname(torch_mlir.ir.__file__),
+                            "_mlir_libs")
+    for name in sorted(os.listdir(libs_dir)):
+        stat = os.stat(os.path.join(libs_dir, name))
+        hasher.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return hasher.digest()
+
+
+def get_torch_lowering_pipeline(pipeline: str,
+                                backend_legal_ops: Sequence[str] = (),
+                                fast_compile: bool = False) -> str:
+    """Returns the textual form of a Torch lowering pipeline with options.
+
+    `pipeline` is the name of a pipeline taking `TorchLoweringPipelineOptions`,
+    such as "torchscript-module-to-torch-backend-pipeline".
+    `backend_legal_ops` lists the ops (e.g. "torch.aten.softmax.int") that the
+    backend handles itself, which are then kept intact in the Torch backend
+    contract instead of being decomposed.
+    If `fast_compile` is True, only the optimizations needed for correctness
+    are run, trading code quality for compile time.
+    """
+    options = []
+    if backend_legal_ops:
+        options.append(f"backend-legal-ops={','.join(backend_legal_ops)}")
+    if fast_compile:
+        options.append("fast-compile=true")
+    if not options:
+        return pipeline
+    return f"{pipeline}{{{' '.join(options)}}}"
+
+
+def _get_backend_contract_cache_key(scripted: torch.jit.ScriptModule,
+                                    class_annotator: ClassAnnotator,
+                                    import_options: ImportOptions,
+                                    pipeline: str):
+    """Returns the cache key for a scripted program, or None if it has none.
+
+    The key covers the serialized TorchScript module (code and weights), the
+    annotations, the import options, the lowering pipeline, and the versions
+    of PyTorch and torch-mlir.
+    """
+    buffer = BytesIO()
+    try:
+        torch.jit.save(scripted, buffer)
+    except Exception:
+        # Not all scriptable modules can be serialized.
+        return None
+    hasher = hashlib.sha256()
+    hasher.update(buffer.getvalue())
+    hasher.update(repr(class_annotator).encode())
+    hasher.update(repr(import_options).encode())
+    hasher.update(pipeline.encode())
+    hasher.update(torch.__version__.encode())
+    hasher.update(_get_compiler_fingerprint())
+    return hasher.hexdigest()
+
+
+def convert_torchscript_module_to_torch_backend_contract_mlir(
+        program: torch.nn.Module,
+        session: Optional[CompilationSession] = None,
+        cache_dir: Optional[str] = None,
+        backend_legal_ops: Sequence[str] = (),
+        fast_compile: bool = False,
+        import_options: Optional[ImportOptions] = None):
     """Perform common lowering from TorchScript to Torch MLIR
 
     Returns an MLIR module that satisfies the Torch backend contract.
+    If `session` is given, the module is created in the session's context
+    and the lowering reuses the session's pass managers.
+
+    The ops in `backend_legal_ops` (e.g. "torch.aten.softmax.int") are kept
+    intact instead of being decomposed, for backends with their own
+    implementation of them.
+
+    If `fast_compile` is True, the lowering only runs the optimizations needed
+    for correctness (see `get_torch_lowering_pipeline`).
+
+    `import_options` are the options to import the program with. By default,
+    only the functions reachable from the exported methods are imported.
+
+    If `cache_dir` is given, the resulting module is cached there, keyed by
+    the serialized TorchScript module, its annotations and the options, so
+    that compiling an unchanged program again skips importing and lowering
+    it. The program is still scripted, since that is needed to compute the
+    key. If `import_options` writes external weights, the cached module
+    refers to that file, so it must be kept (and not reused by other
+    programs) for as long as the cache.
     """
-    mb = ModuleBuilder()
+    if session is None:
+        mb = ModuleBuilder()
+        pass_manager_cache = None
+    else:
+        mb = ModuleBuilder(session.context)
+        pass_manager_cache = session.pass_manager_cache
     scripted = torch.jit.script(program)
     class_annotator = ClassAnnotator()
 
     extract_annotations(program, scripted, class_annotator)
 
+    if import_options is None:
+        # Everything not reachable from the exported methods would be removed
+        # by the lowering pipeline anyway, so don't spend time importing it.
+        import_options = ImportOptions()
+        import_options.importReachableFunctionsOnly = True
+
+    pipeline = get_torch_lowering_pipeline(
+        "torchscript-module-to-torch-backend-pipeline", backend_legal_ops,
+        fast_compile)
+    cache_path = None
+    if cache_dir is not None:
+        cache_key = _get_backend_contract_cache_key(scripted, class_annotator,
+                                                    import_options, pipeline)
+        if cache_key is not None:
+            cache_path = os.path.join(cache_dir, cache_key + ".mlir")
+    if cache_path is not None and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            # The ModuleBuilder has registered all the dialects we need.
+            return Module.parse(f.read(), mb.context)
 
     # TODO: Find a way to make each of these calls own its own
     # "debuggable error report" situation.
@@ -69,7 +188,7 @@ def convert_torchscript_module_to_torch_backend_contract_mlir(program: torch.nn.
         original_stderr = sys.stderr
         sys.stderr = StringIO()
         # Import the TorchScript module to MLIR
-        mb.import_module(scripted._c, class_annotator)
+        mb.import_module(scripted._c, class_annotator, import_options)
     except Exception as e:
         raise Exception(f"""
 PyTorch TorchScript module -> torch-mlir Object Graph IR import failed with:
@@ -81,9 +200,20 @@ Diagnostics:
     finally:
         sys.stderr = original_stderr
 
+    profile = get_active_compile_profile()
+    if profile is not None:
+        profile.import_statistics = mb.import_statistics
+
     run_pipeline_with_repro_report(
         mb.module,
-        "torchscript-module-to-torch-backend-pipeline",
-        "Lowering TorchScript Object Graph IR -> Torch Backend IR")
+        pipeline,
+        "Lowering TorchScript Object Graph IR -> Torch Backend IR",
+        pass_manager_cache=pass_manager_cache)
 
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_file_atomically(
+            cache_path,
+            mb.module.operation.get_asm(large_elements_limit=None,
+                                        enable_debug_info=True))
     return mb.module
@@ -30,6 +30,7 @@ import traceback
 import torch
 
 from .annotations import apply_serializable_annotations
+from ..profiling import CompileProfile, collect_compile_profile
 
 
 TorchScriptValue = Union[int, float, List['TorchScriptValue'],
@@ -255,6 +256,9 @@ class TestResult(NamedTuple):
     trace: Optional[Trace]
     # The golden trace which `trace` is expected to match.
     golden_trace: Optional[Trace]
+    # Pass pipeline timings recorded while compiling, if profiling was
+    # requested from `run_tests`.
+    compile_profile: Optional[CompileProfile] = None
 
 
 class _Tracer:
@@ -293,14 +297,32 @@ def generate_golden_trace(test: Test) -> Trace:
     return trace
 
 
-def run_tests(tests: List[Test], config: TestConfig) -> List[TestResult]:
-    """Invoke the given `Test`'s with the provided `TestConfig`."""
+def run_tests(tests: List[Test],
+              config: TestConfig,
+              profile_compile: bool = False,
+              compile_only: bool = False) -> List[TestResult]:
+    """Invoke the given `Test`'s with the provided `TestConfig`.
+
+    If `profile_compile` is True, the pass pipelines run by `config.compile`
+    are profiled and the result is attached to each `TestResult`.
+
+    If `compile_only` is True, the tests are only compiled, not run, and the
+    `trace` and `golden_trace` of the results are None. This is useful to
+    profile the compilation.
+    """
     results = []
     for test in tests:
+        compile_profile = None
         # TODO: Precompile everything in parallel.
         try:
-            golden_trace = generate_golden_trace(test)
-            compiled = config.compile(test.program_factory())
+            if not compile_only:
+                golden_trace = generate_golden_trace(test)
+            program = test.program_factory()
+            if profile_compile:
+                with collect_compile_profile() as compile_profile:
+                    compiled = config.compile(program)
+            else:
+                compiled = config.compile(program)
         except Exception as e:
             results.append(
                 TestResult(unique_name=test.unique_name,
@@ -308,7 +330,17 @@ def run_tests(tests: List[Test], config: TestConfig) -> List[TestResult]:
                                type(e), e, e.__traceback__)),
                            runtime_error=None,
                            trace=None,
-                           golden_trace=None))
+                           golden_trace=None,
+                           compile_profile=compile_profile))
+            continue
+        if compile_only:
+            results.append(
+                TestResult(unique_name=test.unique_name,
+                           compilation_error=None,
+                           runtime_error=None,
+                           trace=None,
+                           golden_trace=None,
+                           compile_profile=compile_profile))
             continue
         # TODO: Run in parallel.
         try:
@@ -320,7 +352,8 @@ def run_tests(tests: List[Test], config: TestConfig) -> List[TestResult]:
                            runtime_error="".join(traceback.format_exception(
                                type(e), e, e.__traceback__)),
                            trace=None,
-                           golden_trace=None))
+                           golden_trace=None,
+                           compile_profile=compile_profile))
             continue
 
         results.append(
@@ -328,5 +361,6 @@ def run_tests(tests: List[Test], config: TestConfig) -> List[TestResult]:
                        compilation_error=None,
                        runtime_error=None,
                        trace=trace,
-                       golden_trace=golden_trace))
+                       golden_trace=golden_trace,
+                       compile_profile=compile_profile))
     return results
@@ -333,3 +333,94 @@ def report_results(results: List[TestResult],
         if results_by_outcome[key]:
             print(f'    {OUTCOME_MEANINGS[key]}: {len(results_by_outcome[key])}')
     return had_unexpected_results
+
+
+def report_compile_profile(results: List[TestResult], num_passes: int = 20):
+    """Print the compile time of the suite, aggregated by pass.
+
+    Only results with a `compile_profile` (see the `profile_compile` argument
+    of `run_tests`) contribute to the report. The `num_passes` most expensive
+    passes are listed, followed by the per-pipeline totals.
+    """
+    profiles = [r.compile_profile for r in results if r.compile_profile]
+    seconds_by_pass = collections.defaultdict(float)
+    seconds_by_pipeline = collections.defaultdict(float)
+    for profile in profiles:
+        for name, seconds in profile.seconds_by_pass().items():
+            seconds_by_pass[name] += seconds
+        for pipeline in profile.pipelines:
+            seconds_by_pipeline[pipeline.description] += pipeline.seconds
+    total_seconds = sum(seconds_by_pipeline.values())
+
+    print(f'\nCompile profile ({len(profiles)} tests, '
+          f'{total_seconds:.3f}s in pass pipelines):')
+    by_time = sorted(seconds_by_pass.items(), key=lambda x: x[1], reverse=True)
+    for name, seconds in by_time[:num_passes]:
+        percent = 100 * seconds / total_seconds if total_seconds else 0
+        print(f'    {seconds:10.3f}s {percent:5.1f}%  {name}')
+    print('\nCompile time by pipeline:')
+    for description, seconds in seconds_by_pipeline.items():
+        print(f'    {seconds:10.3f}s  {description}')
+
+    import_statistics = collections.Counter()
+    for profile in profiles:
+        if profile.import_statistics:
+            import_statistics.update(profile.import_statistics)
+    if import_statistics:
+        print('\nTorchScript import:')
+        for name, value in import_statistics.items():
+            if isinstance(value, float):
+                print(f'    {value:10.3f}s  {name}')
+            else:
+                print(f'    {value:11d}  {name}')
+
+
+def report_fast_compile_savings(fast_results: List[TestResult],
+                                default_results: List[TestResult],
+                                num_passes: int = 10):
+    """Print the compile time saved by compiling with `fast_compile`.
+
+    `fast_results` and `default_results` are the profiled results (see the
+    `profile_compile` argument of `run_tests`) of the same tests compiled with
+    and without `fast_compile`. Only tests that compiled in both runs are
+    compared. The `num_passes` passes that account for most of the savings
+    are listed, followed by the per-pipeline savings.
+    """
+    default_profiles = {
+        r.unique_name: r.compile_profile
+        for r in default_results
+        if r.compile_profile and r.compilation_error is None
+    }
+    pairs = [(r.compile_profile, default_profiles[r.unique_name])
+             for r in fast_results
+             if r.compile_profile and r.compilation_error is None and
+             r.unique_name in default_profiles]
+    saved_by_pass = collections.defaultdict(float)
+    fast_by_pipeline = collections.defaultdict(float)
+    default_by_pipeline = collections.defaultdict(float)
+    for fast, default in pairs:
+        for name, seconds in default.seconds_by_pass().items():
+            saved_by_pass[name] += seconds
+        for name, seconds in fast.seconds_by_pass().items():
+            saved_by_pass[name] -= seconds
+        for pipeline in fast.pipelines:
+            fast_by_pipeline[pipeline.description] += pipeline.seconds
+        for pipeline in default.pipelines:
+            default_by_pipeline[pipeline.description] += pipeline.seconds
+    fast_seconds = sum(fast_by_pipeline.values())
+    default_seconds = sum(default_by_pipeline.values())
+    saved_seconds = default_seconds - fast_seconds
+    percent = 100 * saved_seconds / default_seconds if default_seconds else 0
+
+    print(f'\nFast compile savings ({len(pairs)} tests): '
+          f'{fast_seconds:.3f}s in pass pipelines instead of '
+          f'{default_seconds:.3f}s, saving {saved_seconds:.3f}s '
+          f'({percent:.1f}%)')
+    by_savings = sorted(saved_by_pass.items(), key=lambda x: x[1],
+                        reverse=True)
+    for name, seconds in by_savings[:num_passes]:
+        print(f'    {seconds:10.3f}s  {name}')
+    print('\nFast compile savings by pipeline:')
+    for description, seconds in default_by_pipeline.items():
+        saved = seconds - fast_by_pipeline[description]
+        print(f'    {saved:10.3f}s of {seconds:10.3f}s  {description}')
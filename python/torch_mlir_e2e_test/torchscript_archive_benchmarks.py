@@ -0,0 +1,111 @@
+# Part of the LLVM Project, under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+# Also available under a BSD-style license. See LICENSE.
+"""
+Memory benchmark for importing TorchScript archives.
+
+Saves a module with large weights, then measures how much the peak memory use
+of a fresh process grows while loading it with `torch.jit.load`, and while
+loading and importing it with `load_torchscript_archive`. The latter should
+not materialize the weights, so the benchmark exits with a non-zero status if
+it uses more than `--max-fraction` of the memory of `torch.jit.load`.
+
+This measures peak RSS in subprocesses and needs weights of a few hundred MiB
+to rise above the noise of the interpreter, so it is not part of the lit
+tests.
+
+Usage:
+  python -m torch_mlir_e2e_test.torchscript_archive_benchmarks --mebibytes 256
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import torch
+
+# Prints how much the peak memory use of the process grows while loading (and
+# importing, for `load_torchscript_archive`) the archive `sys.argv[2]` with the
+# loader `sys.argv[1]`.
+_MEASURE_SCRIPT = """
+import resource
+import sys
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+from torch_mlir.dialects.torch.importer.jit_ir.torchscript_archive import load_torchscript_archive
+
+def get_peak_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # `ru_maxrss` is in bytes on macOS, and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+mb = ModuleBuilder()
+before = get_peak_bytes()
+if sys.argv[1] == "archive":
+    import_options = ImportOptions()
+    scripted = load_torchscript_archive(sys.argv[2], import_options)
+    mb.import_module(scripted._c, importOptions=import_options)
+else:
+    torch.jit.load(sys.argv[2])
+print(get_peak_bytes() - before)
+"""
+
+
+class _WeightsModule(torch.nn.Module):
+    def __init__(self, num_bytes: int):
+        super().__init__()
+        self.weight = torch.nn.Parameter(torch.ones(num_bytes // 4))
+
+
+def measure_peak_bytes(loader: str, archive_path: str) -> int:
+    """Returns the growth of peak RSS while loading `archive_path`.
+
+    `loader` is "jit" for `torch.jit.load` or "archive" for
+    `load_torchscript_archive` followed by an import.
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", _MEASURE_SCRIPT, loader, archive_path])
+    return int(output.decode().strip().splitlines()[-1])
+
+
+def _get_argparse():
+    parser = argparse.ArgumentParser(
+        description="Measure the memory use of importing TorchScript archives.")
+    parser.add_argument("--mebibytes",
+                        type=int,
+                        default=256,
+                        help="Size of the weights of the saved module.")
+    parser.add_argument(
+        "--max-fraction",
+        type=float,
+        default=0.25,
+        help="Largest allowed ratio of the memory growth of "
+        "load_torchscript_archive to that of torch.jit.load.")
+    return parser
+
+
+def main():
+    args = _get_argparse().parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, "model.pt")
+        module = torch.jit.script(_WeightsModule(args.mebibytes * 1024 * 1024))
+        torch.jit.save(module, archive_path)
+        del module
+        jit_bytes = measure_peak_bytes("jit", archive_path)
+        archive_bytes = measure_peak_bytes("archive", archive_path)
+    mib = 1024 * 1024
+    print(f"torch.jit.load:           {jit_bytes / mib:8.1f} MiB")
+    print(f"load_torchscript_archive: {archive_bytes / mib:8.1f} MiB")
+    if archive_bytes > args.max_fraction * jit_bytes:
+        print(f"load_torchscript_archive used more than {args.max_fraction} "
+              "of the memory of torch.jit.load")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
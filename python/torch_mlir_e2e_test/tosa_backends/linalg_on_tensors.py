@@ -8,8 +8,9 @@ from torch_mlir.passmanager import *
 # Imported for side effects.
 import torch_mlir.all_passes_registration
 
-from torch_mlir_e2e_test.utils import run_pipeline_with_repro_report
-from torch_mlir_e2e_test.linalg_on_tensors_backends.refbackend import RefBackendLinalgOnTensorsBackend
+from torch_mlir_e2e_test.utils import BackendPassManagerCache, run_pipeline_with_repro_report
+from torch_mlir_e2e_test.linalg_on_tensors_backends.refbackend import (
+    LOWERING_PIPELINE, RefBackendLinalgOnTensorsBackend)
 
 from .abc import TosaBackend
 
@@ -17,14 +18,36 @@ __all__ = [
     "LinalgOnTensorsTosaBackend",
 ]
 
+# TOSA legalization may emit tosa.const() ops. These are legalized
+# by tosa-to-standard to arith.constants. This mechanical transformation
+# must be done prior to TOSA-to-LinAlg so that the latter does not fail.
+# This is an artifact of legalizations spread across a collection of simple
+# ones in TOSA-to-Standard and the main conversions TOSA-to-LinAlg,
+# that depend on TOSA as well as TOSA-to-Standard.
+TOSA_TO_LINALG_PIPELINE = "builtin.func(" + ",".join([
+    "tosa-to-standard",
+    # Named ops must be legalized prior to general tosa-to-linalg
+    "tosa-to-linalg-named",
+    "tosa-to-linalg",
+]) + ")"
+
+
 class LinalgOnTensorsTosaBackend(TosaBackend):
     """Main entry-point for the linalg-on-tensors based TOSA backend.
 
     This currently uses the linalg-on-tensors RefBackend for actual execution.
+    The lowering to linalg-on-tensors and the RefBackend lowering run as a
+    single pass pipeline.
     """
-    def __init__(self):
+    def __init__(self, cache_pass_managers: bool = False):
+        """
+        Args:
+          cache_pass_managers: If True, reuse the parsed pass pipeline across
+            `compile` calls on modules in the same MLIR context.
+        """
         super().__init__()
         self.refbackend = RefBackendLinalgOnTensorsBackend()
+        self._pass_manager_cache = BackendPassManagerCache(cache_pass_managers)
 
     def compile(self, imported_module: Module):
         """Compiles an imported module that satisfied the TOSA backend contract.
@@ -36,29 +59,12 @@ class LinalgOnTensorsTosaBackend(TosaBackend):
           An opaque, backend specific compiled artifact object that can be
           passed to `load`.
         """
-
-        # TOSA legalization may emit tosa.const() ops. These are legalized
-        # by tosa-to-standard to arith.constants. This mechanical transformation 
-        # must be done prior to TOSA-to-LinAlg so that the latter does not fail. 
-        # This is an artifact of legalizations spread across a collection of simple
-        # ones in TOSA-to-Standard and the main conversions TOSA-to-LinAlg, 
-        # that depend on TOSA as well as TOSA-to-Standard.  
-        run_pipeline_with_repro_report(
-            imported_module,
-            "builtin.func(tosa-to-standard)",
-            "Lowering TOSA to Standard")
-
-        # Named ops must be legalized prior to general tosa-to-linalg
-        run_pipeline_with_repro_report(
-            imported_module,
-            "builtin.func(tosa-to-linalg-named)",
-            "Lowering TOSA to Linalg-on-Tensors for Named Ops")
-
         run_pipeline_with_repro_report(
             imported_module,
-            "builtin.func(tosa-to-linalg)",
-            "Lowering TOSA to Linalg-on-Tensors")
-        return self.refbackend.compile(imported_module)
+            TOSA_TO_LINALG_PIPELINE + "," + LOWERING_PIPELINE,
+            "Lowering TOSA to LLVM with RefBackend",
+            pass_manager_cache=self._pass_manager_cache.get(imported_module))
+        return imported_module
 
     def load(self, module):
         """Loads a compiled artifact into the runtime."""
@@ -7,8 +7,15 @@ from io import StringIO
 import os
 import sys
 import tempfile
+import time
+import uuid
+from typing import Optional
 from torch_mlir.passmanager import PassManager
-from torch_mlir.ir import StringAttr
+from torch_mlir.ir import Context, StringAttr
+from torch_mlir._mlir_libs._torchMlir import (
+    enable_crash_reproducer_generation, enable_pass_profiling)
+
+from .profiling import PipelineProfile, get_active_compile_profile
 
 def get_module_name_for_debug_dump(module):
     """Gets a name suitable for a debug dump.
@@ -19,32 +26,157 @@ def get_module_name_for_debug_dump(module):
         return "UnnammedModule"
     return StringAttr(module.operation.attributes["torch.debug_module_name"]).value
 
+def _get_repro_filename(module_name: str) -> str:
+    """Gets a fresh path for a repro of `module_name`.
+
+    The file is not created, so that successful runs don't clutter up the
+    temporary directory.
+    """
+    return os.path.join(tempfile.gettempdir(),
+                        f"{module_name}-{uuid.uuid4().hex[:12]}.mlir")
+
+class _ReproPassManager:
+    """A parsed pass pipeline, set up to write a repro if it fails."""
+    def __init__(self, pipeline: str, repro_filename: str):
+        self.pipeline = pipeline
+        self.repro_filename = repro_filename
+        self.pass_manager = PassManager.parse(pipeline)
+        enable_crash_reproducer_generation(self.pass_manager, repro_filename)
+        # Profiling instrumentation is only attached once it is first needed.
+        self._pass_profile = None
+
+    def run(self, module, description: str):
+        compile_profile = get_active_compile_profile()
+        if compile_profile is None:
+            self.pass_manager.run(module)
+            return
+        if self._pass_profile is None:
+            self._pass_profile = enable_pass_profiling(self.pass_manager)
+        # The instrumentation accumulates across runs of a cached pass
+        # manager, so only record what this run added.
+        seconds_before = self._pass_profile.pass_seconds
+        statistics_before = self._pass_profile.pass_statistics
+        start = time.perf_counter()
+        self.pass_manager.run(module)
+        seconds = time.perf_counter() - start
+        compile_profile.pipelines.append(
+            PipelineProfile(
+                description=description,
+                pipeline=self.pipeline,
+                seconds=seconds,
+                pass_seconds={
+                    k: v - seconds_before.get(k, 0.0)
+                    for k, v in self._pass_profile.pass_seconds.items()
+                },
+                pass_statistics={
+                    k: v - statistics_before.get(k, 0)
+                    for k, v in self._pass_profile.pass_statistics.items()
+                }))
+
+class PassManagerCache:
+    """A cache of parsed pass pipelines for a single MLIR context.
+
+    Passing a cache to `run_pipeline_with_repro_report` avoids re-parsing the
+    pipeline and re-creating its pass manager on every call, which matters
+    when compiling many small programs in the same context.
+
+    Each cached pipeline writes its repro to a fixed file, which
+    `run_pipeline_with_repro_report` clears before each run and moves to a
+    fresh file when the run fails.
+    """
+    def __init__(self, context):
+        self.context = context
+        self._pass_managers = {}
+
+    def get(self, pipeline: str) -> _ReproPassManager:
+        pass_manager = self._pass_managers.get(pipeline)
+        if pass_manager is None:
+            with self.context:
+                pass_manager = _ReproPassManager(
+                    pipeline, _get_repro_filename("CachedPipeline"))
+            self._pass_managers[pipeline] = pass_manager
+        return pass_manager
+
+class CompilationSession:
+    """State shared across many compilations.
+
+    A session owns a single MLIR context and a `PassManagerCache` for it, so
+    that compiling many programs doesn't pay for creating a context, loading
+    dialects, and parsing the standard pipelines each time. Pipelines are
+    parsed the first time they run in the session.
+
+    Since attributes (including imported weights) are uniqued in the context
+    and never freed, a long-lived session grows with the programs compiled in
+    it. Create a new session to release that memory.
+    """
+    def __init__(self, enable_multithreading: bool = True):
+        self.context = Context()
+        self.context.enable_multithreading(enable_multithreading)
+        self.pass_manager_cache = PassManagerCache(self.context)
+
+class BackendPassManagerCache:
+    """The `PassManagerCache` of a backend, for the context it last compiled in.
+
+    Only the most recently used context is cached, so that the cache does not
+    keep contexts alive indefinitely.
+    """
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._cache = None
+
+    def get(self, module) -> Optional[PassManagerCache]:
+        """Returns the cache to compile `module` with, or None if disabled."""
+        if not self.enabled:
+            return None
+        if self._cache is None or self._cache.context is not module.context:
+            self._cache = PassManagerCache(module.context)
+        return self._cache
+
 def run_pipeline_with_repro_report(module,
                                    pipeline: str,
-                                   description: str):
-    """Runs `pipeline` on `module`, with a nice repro report if it fails."""
+                                   description: str,
+                                   pass_manager_cache: PassManagerCache = None):
+    """Runs `pipeline` on `module`, with a nice repro report if it fails.
+
+    The repro is captured lazily: the pass manager's crash reproducer keeps an
+    in-memory clone of the input module and only serializes it on failure.
+
+    If `pass_manager_cache` is given, it must belong to the module's context,
+    and the pass manager for `pipeline` is reused from it.
+    """
     module_name = get_module_name_for_debug_dump(module)
+    filename = _get_repro_filename(module_name)
+    cached_repro_filename = None
     try:
         original_stderr = sys.stderr 
         sys.stderr = StringIO()
-        asm_for_error_report = module.operation.get_asm(
-            large_elements_limit=10, enable_debug_info=True)
         # Lower module in place to make it ready for compiler backends.
         with module.context:
-            pm = PassManager.parse(pipeline)
-            pm.run(module)
+            if pass_manager_cache is None:
+                pm = _ReproPassManager(pipeline, filename)
+            else:
+                assert pass_manager_cache.context is module.context, \
+                    "PassManagerCache used with a module from another context"
+                pm = pass_manager_cache.get(pipeline)
+                # The cached pass manager writes its repro to a fixed file.
+                # Remove the repro of an earlier failure, so that it is not
+                # reported as the repro of this run.
+                cached_repro_filename = pm.repro_filename
+                if os.path.exists(cached_repro_filename):
+                    os.remove(cached_repro_filename)
+            pm.run(module, description)
     except Exception as e:
-        # TODO: More robust.
-        # - don't arbitrarily clutter up /tmp. When a test suite has many
-        #   tests, this can be a big disk cost (also, /tmp/ is frequently a
-        #   RAM fs, which increases worries about capacity).
-        # - don't have colliding filenames (hard to do without cluttering
-        #   up /tmp)
-        # - if we do have have colliding filenames, writes should at least
-        #   avoid being racy.
-        filename = os.path.join(tempfile.gettempdir(), module_name + ".mlir")
-        with open(filename, 'w') as f:
-            f.write(asm_for_error_report)
+        # Move the repro of a cached pass manager to a fresh file, so that
+        # later failures of the same pipeline don't overwrite it.
+        if cached_repro_filename is not None and \
+                os.path.exists(cached_repro_filename):
+            os.replace(cached_repro_filename, filename)
+        # If the failure happened before any pass ran (such as a malformed
+        # pipeline), no reproducer was written, but the module is unchanged.
+        if not os.path.exists(filename):
+            with open(filename, 'w') as f:
+                f.write(module.operation.get_asm(
+                    large_elements_limit=10, enable_debug_info=True))
         debug_options="-print-ir-after-all -mlir-disable-threading"
         raise Exception(f"""
 {description} failed with the following diagnostics:
@@ -84,3 +84,22 @@ func @elementwise$static_1(%arg0: !torch.vtensor<[?],f32>, %arg1: !torch.vtensor
   %1 = torch.aten.mul.Tensor %arg0, %arg1 : !torch.vtensor<[?],f32>, !torch.vtensor<[1],f32> -> !torch.vtensor<[?],f32>
   return %1 : !torch.vtensor<[?],f32>
 }
+
+// The sizes of %0 are the sizes of %arg0, so no broadcast checks are needed.
+// CHECK-LABEL:   func @elementwise$symbolic_dims(
+// CHECK-SAME:                                    %[[ARG:.*]]: !torch.vtensor<[?,?],f32>) -> !torch.vtensor<[?,?],f32> {
+// CHECK:           %[[BUILTIN_ARG:.*]] = torch_c.to_builtin_tensor %[[ARG]] : !torch.vtensor<[?,?],f32> -> tensor<?x?xf32>
+// CHECK-NOT:       assert
+// CHECK:           linalg.init_tensor
+// CHECK-NOT:       assert
+// CHECK:           %[[DIM0:.*]] = tensor.dim %[[BUILTIN_ARG]], %{{.*}} : tensor<?x?xf32>
+// CHECK:           %[[DIM1:.*]] = tensor.dim %[[BUILTIN_ARG]], %{{.*}} : tensor<?x?xf32>
+// CHECK-NOT:       assert
+// CHECK:           linalg.init_tensor [%[[DIM0]], %[[DIM1]]] : tensor<?x?xf32>
+// CHECK-NOT:       assert
+// CHECK:           return
+func @elementwise$symbolic_dims(%arg0: !torch.vtensor<[?,?],f32>) -> !torch.vtensor<[?,?],f32> {
+  %0 = torch.aten.tanh %arg0 : !torch.vtensor<[?,?],f32> -> !torch.vtensor<[?,?],f32>
+  %1 = torch.aten.mul.Tensor %0, %arg0 : !torch.vtensor<[?,?],f32>, !torch.vtensor<[?,?],f32> -> !torch.vtensor<[?,?],f32>
+  return %1 : !torch.vtensor<[?,?],f32>
+}
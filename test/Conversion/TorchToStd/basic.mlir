@@ -75,6 +75,24 @@ func @torch.vtensor.literal() -> !torch.vtensor<[],f32> {
   return %0 : !torch.vtensor<[],f32>
 }
 
+// CHECK-LABEL:   func @torch.vtensor.literal$sparse() -> !torch.vtensor<[2,3],si64> {
+// CHECK:           %[[CST:.*]] = arith.constant sparse<{{\[}}[0, 1], [1, 2]], [4, -5]> : tensor<2x3xi64>
+// CHECK:           %[[VTENSOR:.*]] = torch_c.from_builtin_tensor %[[CST]] : tensor<2x3xi64> -> !torch.vtensor<[2,3],si64>
+// CHECK:           return %[[VTENSOR]] : !torch.vtensor<[2,3],si64>
+func @torch.vtensor.literal$sparse() -> !torch.vtensor<[2,3],si64> {
+  %0 = torch.vtensor.literal(sparse<[[0, 1], [1, 2]], [4, -5]> : tensor<2x3xsi64>) : !torch.vtensor<[2,3],si64>
+  return %0 : !torch.vtensor<[2,3],si64>
+}
+
+// CHECK-LABEL:   func @torch.vtensor.external_literal() -> !torch.vtensor<[2,3],si64> {
+// CHECK:           %[[LITERAL:.*]] = torch_c.external_literal "weights.bin"[128] : tensor<2x3xi64>
+// CHECK:           %[[VTENSOR:.*]] = torch_c.from_builtin_tensor %[[LITERAL]] : tensor<2x3xi64> -> !torch.vtensor<[2,3],si64>
+// CHECK:           return %[[VTENSOR]] : !torch.vtensor<[2,3],si64>
+func @torch.vtensor.external_literal() -> !torch.vtensor<[2,3],si64> {
+  %0 = torch.vtensor.external_literal "weights.bin"[128] : !torch.vtensor<[2,3],si64>
+  return %0 : !torch.vtensor<[2,3],si64>
+}
+
 // CHECK-LABEL:   func @torch.constant.bool() -> !torch.bool {
 // CHECK:           %[[CST:.*]] = arith.constant true
 // CHECK:           %[[BOOL:.*]] = torch_c.from_i1 %[[CST]]
@@ -0,0 +1,6 @@
+// RUN: torch-mlir-opt -torch-decompose-complex-ops="legal-ops=torch.aten.softmax" -verify-diagnostics %s
+
+// expected-error@+1 {{unknown op 'torch.aten.softmax' in legal-ops}}
+func @unknown_legal_op(%t: !torch.vtensor<[2,3],f32>) -> !torch.vtensor<[2,3],f32> {
+  return %t : !torch.vtensor<[2,3],f32>
+}
@@ -0,0 +1,27 @@
+// RUN: torch-mlir-opt -torch-decompose-complex-ops="legal-ops=torch.aten.softmax.int" -split-input-file %s | FileCheck %s
+
+// CHECK-LABEL:   func @torch.aten.softmax.int$legal(
+// CHECK-SAME:                                       %[[T:.*]]: !torch.vtensor<[2,3],f32>) -> !torch.vtensor<[2,3],f32> {
+// CHECK:           %[[DIM:.*]] = torch.constant.int 1
+// CHECK:           %[[DTYPE:.*]] = torch.constant.none
+// CHECK:           %[[RET:.*]] = torch.aten.softmax.int %[[T]], %[[DIM]], %[[DTYPE]] : !torch.vtensor<[2,3],f32>, !torch.int, !torch.none -> !torch.vtensor<[2,3],f32>
+// CHECK:           return %[[RET]] : !torch.vtensor<[2,3],f32>
+func @torch.aten.softmax.int$legal(%t: !torch.vtensor<[2,3],f32>) -> !torch.vtensor<[2,3],f32> {
+  %dim = torch.constant.int 1
+  %dtype = torch.constant.none
+  %ret = torch.aten.softmax.int %t, %dim, %dtype : !torch.vtensor<[2,3],f32>, !torch.int, !torch.none -> !torch.vtensor<[2,3],f32>
+  return %ret : !torch.vtensor<[2,3],f32>
+}
+
+// -----
+
+// Ops that are not listed are still decomposed.
+// CHECK-LABEL:   func @torch.aten.log_softmax.int$not_legal(
+// CHECK-NOT:       torch.aten.log_softmax.int
+// CHECK:           return
+func @torch.aten.log_softmax.int$not_legal(%t: !torch.vtensor<[2,3],f32>) -> !torch.vtensor<[2,3],f32> {
+  %dim = torch.constant.int 1
+  %dtype = torch.constant.none
+  %ret = torch.aten.log_softmax.int %t, %dim, %dtype : !torch.vtensor<[2,3],f32>, !torch.int, !torch.none -> !torch.vtensor<[2,3],f32>
+  return %ret : !torch.vtensor<[2,3],f32>
+}
@@ -0,0 +1,71 @@
+// RUN: torch-mlir-opt -torch-evaluate-constant-tensor-ops -split-input-file %s | FileCheck %s
+// RUN: torch-mlir-opt -torch-evaluate-constant-tensor-ops="max-size-in-bytes=8" -split-input-file %s | FileCheck %s --check-prefix=LIMIT
+
+// CHECK-LABEL:   func @transpose() -> !torch.vtensor<[3,2],f32> {
+// CHECK:           %[[LITERAL:.*]] = torch.vtensor.literal(dense<{{\[\[}}0.000000e+00, 3.000000e+00], [1.000000e+00, 4.000000e+00], [2.000000e+00, 5.000000e+00]]> : tensor<3x2xf32>) : !torch.vtensor<[3,2],f32>
+// CHECK:           return %[[LITERAL]] : !torch.vtensor<[3,2],f32>
+// LIMIT-LABEL:   func @transpose
+// LIMIT:           torch.aten.transpose.int
+func @transpose() -> !torch.vtensor<[3,2],f32> {
+  %int0 = torch.constant.int 0
+  %int1 = torch.constant.int 1
+  %0 = torch.vtensor.literal(dense<[[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]> : tensor<2x3xf32>) : !torch.vtensor<[2,3],f32>
+  %1 = torch.aten.transpose.int %0, %int0, %int1 : !torch.vtensor<[2,3],f32>, !torch.int, !torch.int -> !torch.vtensor<[3,2],f32>
+  return %1 : !torch.vtensor<[3,2],f32>
+}
+
+// -----
+
+// CHECK-LABEL:   func @permute() -> !torch.vtensor<[3,1,2],si64> {
+// CHECK:           %[[LITERAL:.*]] = torch.vtensor.literal(dense<{{\[\[\[}}0, 3]], {{\[\[}}1, 4]], {{\[\[}}2, 5]]]> : tensor<3x1x2xsi64>) : !torch.vtensor<[3,1,2],si64>
+// CHECK:           return %[[LITERAL]] : !torch.vtensor<[3,1,2],si64>
+func @permute() -> !torch.vtensor<[3,1,2],si64> {
+  %int0 = torch.constant.int 0
+  %int1 = torch.constant.int 1
+  %int2 = torch.constant.int 2
+  %0 = torch.prim.ListConstruct %int2, %int1, %int0 : (!torch.int, !torch.int, !torch.int) -> !torch.list<int>
+  %1 = torch.vtensor.literal(dense<[[[0, 1, 2]], [[3, 4, 5]]]> : tensor<2x1x3xsi64>) : !torch.vtensor<[2,1,3],si64>
+  %2 = torch.aten.permute %1, %0 : !torch.vtensor<[2,1,3],si64>, !torch.list<int> -> !torch.vtensor<[3,1,2],si64>
+  return %2 : !torch.vtensor<[3,1,2],si64>
+}
+
+// -----
+
+// The view of a splat is always evaluated, since it stays small.
+// CHECK-LABEL:   func @view$splat() -> !torch.vtensor<[6],f32> {
+// CHECK:           %[[LITERAL:.*]] = torch.vtensor.literal(dense<1.000000e+00> : tensor<6xf32>) : !torch.vtensor<[6],f32>
+// CHECK:           return %[[LITERAL]] : !torch.vtensor<[6],f32>
+// LIMIT-LABEL:   func @view$splat
+// LIMIT-NOT:       torch.aten.view
+func @view$splat() -> !torch.vtensor<[6],f32> {
+  %int6 = torch.constant.int 6
+  %0 = torch.prim.ListConstruct %int6 : (!torch.int) -> !torch.list<int>
+  %1 = torch.vtensor.literal(dense<1.0> : tensor<2x3xf32>) : !torch.vtensor<[2,3],f32>
+  %2 = torch.aten.view %1, %0 : !torch.vtensor<[2,3],f32>, !torch.list<int> -> !torch.vtensor<[6],f32>
+  return %2 : !torch.vtensor<[6],f32>
+}
+
+// -----
+
+// CHECK-LABEL:   func @to_dtype$transpose() -> !torch.vtensor<[2,2],f32> {
+// CHECK:           %[[LITERAL:.*]] = torch.vtensor.literal(dense<{{\[\[}}-1.000000e+00, 3.000000e+00], [2.000000e+00, 4.000000e+00]]> : tensor<2x2xf32>) : !torch.vtensor<[2,2],f32>
+// CHECK:           return %[[LITERAL]] : !torch.vtensor<[2,2],f32>
+func @to_dtype$transpose() -> !torch.vtensor<[2,2],f32> {
+  %int6 = torch.constant.int 6
+  %false = torch.constant.bool false
+  %none = torch.constant.none
+  %0 = torch.vtensor.literal(dense<[[-1, 2], [3, 4]]> : tensor<2x2xsi64>) : !torch.vtensor<[2,2],si64>
+  %1 = torch.aten.t %0 : !torch.vtensor<[2,2],si64> -> !torch.vtensor<[2,2],si64>
+  %2 = torch.aten.to.dtype %1, %int6, %false, %false, %none : !torch.vtensor<[2,2],si64>, !torch.int, !torch.bool, !torch.bool, !torch.none -> !torch.vtensor<[2,2],f32>
+  return %2 : !torch.vtensor<[2,2],f32>
+}
+
+// -----
+
+// CHECK-LABEL:   func @dynamic_result(
+// CHECK:           torch.aten.t
+func @dynamic_result() -> !torch.vtensor<[?,?],f32> {
+  %0 = torch.vtensor.literal(dense<[[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]> : tensor<2x3xf32>) : !torch.vtensor<[2,3],f32>
+  %1 = torch.aten.t %0 : !torch.vtensor<[2,3],f32> -> !torch.vtensor<[?,?],f32>
+  return %1 : !torch.vtensor<[?,?],f32>
+}
@@ -0,0 +1,66 @@
+// RUN: torch-mlir-opt -torch-fold-batch-norm -split-input-file %s | FileCheck %s
+
+// scale = [4.0 / sqrt(3.0 + 1.0), 1.0 / sqrt(0.0 + 1.0)] = [2.0, 1.0]
+// CHECK-LABEL:   func @conv2d(
+// CHECK-SAME:                 %[[INPUT:.*]]: !torch.vtensor<[1,1,3,3],f32>) -> !torch.vtensor<[1,2,3,3],f32> {
+// CHECK-DAG:       %[[WEIGHT:.*]] = torch.vtensor.literal(dense<{{\[\[\[\[}}2.000000e+00]]], {{\[\[\[}}3.000000e+00]]]]> : tensor<2x1x1x1xf32>) : !torch.vtensor<[2,1,1,1],f32>
+// CHECK-DAG:       %[[BIAS:.*]] = torch.vtensor.literal(dense<[3.000000e+00, 0.000000e+00]> : tensor<2xf32>) : !torch.vtensor<[2],f32>
+// CHECK:           %[[CONV:.*]] = torch.aten.conv2d %[[INPUT]], %[[WEIGHT]], %[[BIAS]], {{.*}} -> !torch.vtensor<[1,2,3,3],f32>
+// CHECK-NOT:       torch.aten.batch_norm
+// CHECK:           return %[[CONV]] : !torch.vtensor<[1,2,3,3],f32>
+func @conv2d(%arg0: !torch.vtensor<[1,1,3,3],f32>) -> !torch.vtensor<[1,2,3,3],f32> {
+  %int0 = torch.constant.int 0
+  %int1 = torch.constant.int 1
+  %false = torch.constant.bool false
+  %true = torch.constant.bool true
+  %float1.000000e-01 = torch.constant.float 1.000000e-01
+  %float1.000000e00 = torch.constant.float 1.000000e+00
+  %0 = torch.prim.ListConstruct %int1, %int1 : (!torch.int, !torch.int) -> !torch.list<int>
+  %1 = torch.prim.ListConstruct %int0, %int0 : (!torch.int, !torch.int) -> !torch.list<int>
+  %weight = torch.vtensor.literal(dense<[[[[1.0]]], [[[3.0]]]]> : tensor<2x1x1x1xf32>) : !torch.vtensor<[2,1,1,1],f32>
+  %bias = torch.vtensor.literal(dense<[1.0, 2.0]> : tensor<2xf32>) : !torch.vtensor<[2],f32>
+  %bn_weight = torch.vtensor.literal(dense<[4.0, 1.0]> : tensor<2xf32>) : !torch.vtensor<[2],f32>
+  %bn_bias = torch.vtensor.literal(dense<[1.0, 0.0]> : tensor<2xf32>) : !torch.vtensor<[2],f32>
+  %mean = torch.vtensor.literal(dense<[0.0, 2.0]> : tensor<2xf32>) : !torch.vtensor<[2],f32>
+  %var = torch.vtensor.literal(dense<[3.0, 0.0]> : tensor<2xf32>) : !torch.vtensor<[2],f32>
+  %2 = torch.aten.conv2d %arg0, %weight, %bias, %0, %1, %0, %int1 : !torch.vtensor<[1,1,3,3],f32>, !torch.vtensor<[2,1,1,1],f32>, !torch.vtensor<[2],f32>, !torch.list<int>, !torch.list<int>, !torch.list<int>, !torch.int -> !torch.vtensor<[1,2,3,3],f32>
+  %3 = torch.aten.batch_norm %2, %bn_weight, %bn_bias, %mean, %var, %false, %float1.000000e-01, %float1.000000e00, %true : !torch.vtensor<[1,2,3,3],f32>, !torch.vtensor<[2],f32>, !torch.vtensor<[2],f32>, !torch.vtensor<[2],f32>, !torch.vtensor<[2],f32>, !torch.bool, !torch.float, !torch.float, !torch.bool -> !torch.vtensor<[1,2,3,3],f32>
+  return %3 : !torch.vtensor<[1,2,3,3],f32>
+}
+
+// -----
+
+// CHECK-LABEL:   func @linear$no_bias(
+// CHECK-SAME:                         %[[INPUT:.*]]: !torch.vtensor<[4,2],f32>) -> !torch.vtensor<[4,1],f32> {
+// CHECK-DAG:       %[[WEIGHT:.*]] = torch.vtensor.literal(dense<{{\[\[}}5.000000e-01, 1.000000e+00]]> : tensor<1x2xf32>) : !torch.vtensor<[1,2],f32>
+// CHECK-DAG:       %[[BIAS:.*]] = torch.vtensor.literal(dense<-1.000000e+00> : tensor<1xf32>) : !torch.vtensor<[1],f32>
+// CHECK:           %[[LINEAR:.*]] = torch.aten.linear %[[INPUT]], %[[WEIGHT]], %[[BIAS]] : !torch.vtensor<[4,2],f32>, !torch.vtensor<[1,2],f32>, !torch.vtensor<[1],f32> -> !torch.vtensor<[4,1],f32>
+// CHECK:           return %[[LINEAR]] : !torch.vtensor<[4,1],f32>
+func @linear$no_bias(%arg0: !torch.vtensor<[4,2],f32>) -> !torch.vtensor<[4,1],f32> {
+  %none = torch.constant.none
+  %false = torch.constant.bool false
+  %float1.000000e-01 = torch.constant.float 1.000000e-01
+  %float0.000000e00 = torch.constant.float 0.000000e+00
+  %weight = torch.vtensor.literal(dense<[[1.0, 2.0]]> : tensor<1x2xf32>) : !torch.vtensor<[1,2],f32>
+  %mean = torch.vtensor.literal(dense<2.0> : tensor<1xf32>) : !torch.vtensor<[1],f32>
+  %var = torch.vtensor.literal(dense<4.0> : tensor<1xf32>) : !torch.vtensor<[1],f32>
+  %0 = torch.aten.linear %arg0, %weight, %none : !torch.vtensor<[4,2],f32>, !torch.vtensor<[1,2],f32>, !torch.none -> !torch.vtensor<[4,1],f32>
+  %1 = torch.aten.batch_norm %0, %none, %none, %mean, %var, %false, %float1.000000e-01, %float0.000000e00, %false : !torch.vtensor<[4,1],f32>, !torch.none, !torch.none, !torch.vtensor<[1],f32>, !torch.vtensor<[1],f32>, !torch.bool, !torch.float, !torch.float, !torch.bool -> !torch.vtensor<[4,1],f32>
+  return %1 : !torch.vtensor<[4,1],f32>
+}
+
+// -----
+
+// CHECK-LABEL:   func @training(
+// CHECK:           torch.aten.batch_norm
+func @training(%arg0: !torch.vtensor<[4,1],f32>) -> !torch.vtensor<[4,1],f32> {
+  %none = torch.constant.none
+  %true = torch.constant.bool true
+  %float1.000000e-01 = torch.constant.float 1.000000e-01
+  %mean = torch.vtensor.literal(dense<2.0> : tensor<1xf32>) : !torch.vtensor<[1],f32>
+  %var = torch.vtensor.literal(dense<4.0> : tensor<1xf32>) : !torch.vtensor<[1],f32>
+  %w = torch.vtensor.literal(dense<1.0> : tensor<1x1xf32>) : !torch.vtensor<[1,1],f32>
+  %0 = torch.aten.linear %arg0, %w, %none : !torch.vtensor<[4,1],f32>, !torch.vtensor<[1,1],f32>, !torch.none -> !torch.vtensor<[4,1],f32>
+  %1 = torch.aten.batch_norm %0, %none, %none, %mean, %var, %true, %float1.000000e-01, %float1.000000e-01, %true : !torch.vtensor<[4,1],f32>, !torch.none, !torch.none, !torch.vtensor<[1],f32>, !torch.vtensor<[1],f32>, !torch.bool, !torch.float, !torch.float, !torch.bool -> !torch.vtensor<[4,1],f32>
+  return %1 : !torch.vtensor<[4,1],f32>
+}
@@ -0,0 +1,43 @@
+// RUN: torch-mlir-opt -torch-inline-shape-functions %s | FileCheck %s
+
+// CHECK-NOT: func private @__torch_mlir_shape_fn.aten.tanh(
+// CHECK-NOT: func private @shape_helper(
+func private @shape_helper(%arg0: !torch.list<int>) -> !torch.list<int> {
+  return %arg0 : !torch.list<int>
+}
+func private @__torch_mlir_shape_fn.aten.tanh(%arg0: !torch.list<int>) -> !torch.list<int> {
+  %0 = call @shape_helper(%arg0) : (!torch.list<int>) -> !torch.list<int>
+  return %0 : !torch.list<int>
+}
+
+// CHECK-LABEL:   func private @user_function(
+// CHECK-SAME:                                %[[ARG:.*]]: !torch.vtensor) -> !torch.vtensor {
+// CHECK:           return %[[ARG]] : !torch.vtensor
+func private @user_function(%arg0: !torch.vtensor) -> !torch.vtensor {
+  return %arg0 : !torch.vtensor
+}
+
+// CHECK-LABEL:   func @basic(
+// CHECK-SAME:                %[[ARG:.*]]: !torch.vtensor) -> !torch.vtensor {
+// CHECK:           %[[CALL:.*]] = call @user_function(%[[ARG]]) : (!torch.vtensor) -> !torch.vtensor
+// CHECK:           %[[RESULT:.*]] = torch.shape.calculate {
+// CHECK:             %[[TANH:.*]] = torch.aten.tanh %[[CALL]] : !torch.vtensor -> !torch.vtensor
+// CHECK:             torch.shape.calculate.yield %[[TANH]] : !torch.vtensor
+// CHECK:           } shapes {
+// CHECK:             %[[SHAPE:.*]] = torch.aten.size %[[CALL]] : !torch.vtensor -> !torch.list<int>
+// CHECK-NOT:         call
+// CHECK:             torch.shape.calculate.yield.shapes %[[SHAPE]] : !torch.list<int>
+// CHECK:           } : !torch.vtensor
+// CHECK:           return %[[RESULT]] : !torch.vtensor
+func @basic(%arg0: !torch.vtensor) -> !torch.vtensor {
+  %0 = call @user_function(%arg0) : (!torch.vtensor) -> !torch.vtensor
+  %1 = torch.shape.calculate {
+    %2 = torch.aten.tanh %0 : !torch.vtensor -> !torch.vtensor
+    torch.shape.calculate.yield %2 : !torch.vtensor
+  } shapes {
+    %2 = torch.aten.size %0 : !torch.vtensor -> !torch.list<int>
+    %3 = call @__torch_mlir_shape_fn.aten.tanh(%2) : (!torch.list<int>) -> !torch.list<int>
+    torch.shape.calculate.yield.shapes %3 : !torch.list<int>
+  } : !torch.vtensor
+  return %1 : !torch.vtensor
+}
@@ -163,6 +163,14 @@ builtin.func @torch.tensor() {
 
 // -----
 
+builtin.func @torch.vtensor.external_literal() {
+  // expected-error@+1 {{result type must have static sizes and a dtype}}
+  %0 = torch.vtensor.external_literal "weights.bin"[0] : !torch.vtensor<[?],f32>
+  return
+}
+
+// -----
+
 builtin.func @torch.prim.ListConstruct() {
   %int2 = torch.constant.int 2
   // expected-error@+1 {{operand types should have the same type as the list contained type}}
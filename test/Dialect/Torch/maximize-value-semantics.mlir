@@ -232,6 +232,24 @@ func @viewlike$two_inputs_one_copy(%arg0: !torch.vtensor) -> !torch.vtensor {
   return %2 : !torch.vtensor
 }
 
+// An op using two aliases from the slice is only rewritten once.
+// CHECK-LABEL:   func @viewlike$two_aliases_from_the_slice(
+// CHECK-SAME:                                              %[[ARG:.*]]: !torch.vtensor) -> !torch.vtensor {
+// CHECK:           %[[INT0:.*]] = torch.constant.int 0
+// CHECK:           %[[UNSQUEEZE0:.*]] = torch.aten.unsqueeze %[[ARG]], %[[INT0]] : !torch.vtensor, !torch.int -> !torch.vtensor
+// CHECK:           %[[UNSQUEEZE1:.*]] = torch.aten.unsqueeze %[[ARG]], %[[INT0]] : !torch.vtensor, !torch.int -> !torch.vtensor
+// CHECK:           %[[EXPAND_AS:.*]] = torch.aten.expand_as %[[UNSQUEEZE0]], %[[UNSQUEEZE1]] : !torch.vtensor, !torch.vtensor -> !torch.vtensor
+// CHECK:           return %[[EXPAND_AS]] : !torch.vtensor
+func @viewlike$two_aliases_from_the_slice(%arg0: !torch.vtensor) -> !torch.vtensor {
+  %int0 = torch.constant.int 0
+  %0 = torch.copy.to_tensor %arg0 : !torch.tensor
+  %1 = torch.aten.unsqueeze %0, %int0 : !torch.tensor, !torch.int -> !torch.tensor
+  %2 = torch.aten.unsqueeze %0, %int0 : !torch.tensor, !torch.int -> !torch.tensor
+  %3 = torch.aten.expand_as %1, %2 : !torch.tensor, !torch.tensor -> !torch.tensor
+  %4 = torch.copy.to_vtensor %3 : !torch.vtensor
+  return %4 : !torch.vtensor
+}
+
 // CHECK-LABEL:   func @viewlike$two_inputs_two_copies(
 // CHECK-SAME:                                         %[[ARG0:.*]]: !torch.vtensor,
 // CHECK-SAME:                                         %[[ARG1:.*]]: !torch.vtensor) -> !torch.vtensor {
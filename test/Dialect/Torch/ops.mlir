@@ -54,6 +54,13 @@ func @torch.vtensor.literal() {
   return
 }
 
+// CHECK-LABEL:   func @torch.vtensor.external_literal() {
+func @torch.vtensor.external_literal() {
+  // CHECK: torch.vtensor.external_literal "weights.bin"[64] : !torch.vtensor<[3,2],f32>
+  %0 = torch.vtensor.external_literal "weights.bin"[64] : !torch.vtensor<[3,2],f32>
+  return
+}
+
 func @derefine(%arg0: !torch.tensor) -> !torch.optional<tensor> {
   %0 = torch.derefine %arg0 : !torch.tensor to !torch.optional<tensor>
   return %0 : !torch.optional<tensor>
@@ -0,0 +1,17 @@
+// RUN: torch-mlir-opt -torch-function-to-torch-backend-pipeline %s | FileCheck %s
+
+// User calls are inlined, as the backends expect.
+// CHECK-LABEL:   func @forward(
+// CHECK-SAME:                  %[[ARG:.*]]: !torch.vtensor<[2],f32>) -> !torch.vtensor<[2],f32> {
+// CHECK:           %[[TANH:.*]] = torch.aten.tanh %[[ARG]] : !torch.vtensor<[2],f32> -> !torch.vtensor<[2],f32>
+// CHECK:           return %[[TANH]] : !torch.vtensor<[2],f32>
+// CHECK-NOT:     call
+// CHECK-NOT:     @helper
+func @forward(%arg0: !torch.vtensor<[2],f32>) -> !torch.vtensor<[2],f32> {
+  %0 = call @helper(%arg0) : (!torch.vtensor<[2],f32>) -> !torch.vtensor<[2],f32>
+  return %0 : !torch.vtensor<[2],f32>
+}
+func private @helper(%arg0: !torch.vtensor<[2],f32>) -> !torch.vtensor<[2],f32> {
+  %0 = torch.aten.tanh %arg0 : !torch.vtensor<[2],f32> -> !torch.vtensor<[2],f32>
+  return %0 : !torch.vtensor<[2],f32>
+}
@@ -0,0 +1,24 @@
+// RUN: torch-mlir-opt -torch-backend-to-linalg-on-tensors-backend-pipeline %s | FileCheck %s
+// RUN: torch-mlir-opt -torch-backend-to-linalg-on-tensors-backend-pipeline="optimize=false" %s | FileCheck %s --check-prefix=NOOPT
+// RUN: torch-mlir-opt -torch-backend-to-linalg-on-tensors-backend-pipeline="fast-compile=true" %s | FileCheck %s --check-prefix=NOOPT
+
+// The chain of elementwise ops, including the broadcasting add, is fused into
+// a single loop nest.
+// CHECK-LABEL:   func @elementwise_chain(
+// CHECK-SAME:                            %[[ARG0:.*]]: tensor<?x?xf32>,
+// CHECK-SAME:                            %[[ARG1:.*]]: tensor<?xf32>) -> tensor<?x?xf32> {
+// CHECK:           %[[GENERIC:.*]] = linalg.generic {{.*}} ins(%[[ARG0]], %[[ARG1]] : tensor<?x?xf32>, tensor<?xf32>)
+// CHECK:             arith.mulf
+// CHECK:             arith.addf
+// CHECK:             math.tanh
+// CHECK-NOT:       linalg.generic
+// CHECK:           return
+// NOOPT-LABEL:   func @elementwise_chain(
+// NOOPT-COUNT-3:   linalg.generic
+func @elementwise_chain(%arg0: !torch.vtensor<[?,?],f32>, %arg1: !torch.vtensor<[?],f32>) -> !torch.vtensor<[?,?],f32> {
+  %int1 = torch.constant.int 1
+  %0 = torch.aten.mul.Tensor %arg0, %arg0 : !torch.vtensor<[?,?],f32>, !torch.vtensor<[?,?],f32> -> !torch.vtensor<[?,?],f32>
+  %1 = torch.aten.add.Tensor %0, %arg1, %int1 : !torch.vtensor<[?,?],f32>, !torch.vtensor<[?],f32>, !torch.int -> !torch.vtensor<[?,?],f32>
+  %2 = torch.aten.tanh %1 : !torch.vtensor<[?,?],f32> -> !torch.vtensor<[?,?],f32>
+  return %2 : !torch.vtensor<[?,?],f32>
+}
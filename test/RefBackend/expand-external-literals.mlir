@@ -0,0 +1,18 @@
+// RUN: torch-mlir-opt %s -refback-expand-external-literals | FileCheck %s
+
+// CHECK-LABEL: module attributes {refback.external_literals = [
+// CHECK-SAME:    {element_type = "f32", name = "refbackend_external_literal_0", offset = 0 : i64, path = "weights.bin", shape = [3, 4]},
+// CHECK-SAME:    {element_type = "i64", name = "refbackend_external_literal_1", offset = 64 : i64, path = "weights.bin", shape = [2]}]}
+// CHECK-LABEL:   func @f() -> (tensor<3x4xf32>, tensor<2xi64>) {
+// CHECK:           %[[W0:.*]] = call @refbackend_external_literal_0() : () -> tensor<3x4xf32>
+// CHECK:           %[[W1:.*]] = call @refbackend_external_literal_1() : () -> tensor<2xi64>
+// CHECK:           return %[[W0]], %[[W1]] : tensor<3x4xf32>, tensor<2xi64>
+// CHECK:         func private @refbackend_external_literal_0() -> tensor<3x4xf32> attributes {llvm.emit_c_interface}
+// CHECK:         func private @refbackend_external_literal_1() -> tensor<2xi64> attributes {llvm.emit_c_interface}
+module {
+  func @f() -> (tensor<3x4xf32>, tensor<2xi64>) {
+    %0 = torch_c.external_literal "weights.bin"[0] : tensor<3x4xf32>
+    %1 = torch_c.external_literal "weights.bin"[64] : tensor<2xi64>
+    return %0, %1 : tensor<3x4xf32>, tensor<2xi64>
+  }
+}
@@ -0,0 +1,37 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ClassAnnotator, ModuleBuilder
+from torch_mlir.dialects.torch.importer.jit_ir.torchscript_annotations import annotate_args_from_example_inputs
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+    def forward(self, a, b, c: float):
+        return a + b.float() * c
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+
+annotator = ClassAnnotator()
+# CHECK: func private @__torch__.TestModule.forward(
+# CHECK-SAME: %arg0: !torch.nn.Module<"__torch__.TestModule">,
+# CHECK-SAME: %arg1: !torch.tensor {torch.type_bound = !torch.vtensor<[?,3,4],f32>},
+# CHECK-SAME: %arg2: !torch.tensor {torch.type_bound = !torch.tensor<[4],si64>},
+# CHECK-SAME: %arg3: !torch.float
+annotate_args_from_example_inputs(
+    recursivescriptmodule, annotator,
+    [torch.rand(2, 3, 4), torch.arange(4), 2.0],
+    dynamic_dims={0: [0]},
+    value_semantics=[True, False, False])
+
+# # TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+mb.import_module(recursivescriptmodule._c, annotator)
+mb.module.operation.print()
@@ -0,0 +1,60 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ClassAnnotator, ImportOptions, ModuleBuilder
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+def called_from_forward(x):
+    return x
+
+# Ends up in the same compilation unit as `TestModule`, but is never called.
+@torch.jit.script
+def unrelated(x):
+    return x
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+    def forward(self, x):
+        return self.called_method(called_from_forward(x))
+    @torch.jit.export
+    def called_method(self, x):
+        return x
+    @torch.jit.export
+    def uncalled_method(self, x):
+        return x
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+
+annotator = ClassAnnotator()
+class_type = recursivescriptmodule._c._type()
+annotator.exportNone(class_type)
+annotator.exportPath(class_type, ['forward'])
+
+import_options = ImportOptions()
+import_options.importReachableFunctionsOnly = True
+
+# CHECK-LABEL:   torch.class_type @__torch__.TestModule  {
+# CHECK-NOT:       "uncalled_method"
+# CHECK-DAG:       torch.method "forward", @__torch__.TestModule.forward
+# CHECK-DAG:       torch.method private "called_method", @__torch__.TestModule.called_method
+# CHECK-NOT:       "uncalled_method"
+# CHECK:         }
+# CHECK-NOT:     func private @__torch__.TestModule.uncalled_method
+# CHECK-NOT:     func private @__torch__.unrelated
+# CHECK-DAG:     func private @__torch__.TestModule.forward
+# CHECK-DAG:     func private @__torch__.TestModule.called_method
+# CHECK-DAG:     func private @__torch__.called_from_forward
+# CHECK-NOT:     func private @__torch__.TestModule.uncalled_method
+# CHECK-NOT:     func private @__torch__.unrelated
+
+# # TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+mb.import_module(recursivescriptmodule._c, annotator, import_options)
+mb.module.operation.print()
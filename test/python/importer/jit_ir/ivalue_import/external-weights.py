@@ -0,0 +1,62 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import os
+import tempfile
+
+import numpy as np
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.small = torch.ones(1)
+        self.big = torch.arange(16.0).reshape(4, 4)
+        self.big_int = torch.arange(5)
+
+# CHECK: %[[SMALL:.*]] = torch.tensor.literal(dense<1.000000e+00> : tensor<1xf32>) : !torch.tensor<[1],f32>
+# CHECK: %[[BIG:.*]] = torch.vtensor.external_literal "{{.*}}weights.bin"[0] : !torch.vtensor<[4,4],f32>
+# CHECK: %[[BIG_TENSOR:.*]] = torch.copy.to_tensor %[[BIG]] : !torch.tensor<[4,4],f32>
+# CHECK: %[[BIG_INT:.*]] = torch.vtensor.external_literal "{{.*}}weights.bin"[64] : !torch.vtensor<[5],si64>
+# CHECK: %[[BIG_INT_TENSOR:.*]] = torch.copy.to_tensor %[[BIG_INT]] : !torch.tensor<[5],si64>
+# CHECK: torch.nn_module  {
+# CHECK:   torch.slot "small", %[[SMALL]] : !torch.tensor<[1],f32>
+# CHECK:   torch.slot "big", %[[BIG_TENSOR]] : !torch.tensor<[4,4],f32>
+# CHECK:   torch.slot "big_int", %[[BIG_INT_TENSOR]] : !torch.tensor<[5],si64>
+# CHECK: }
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    import_options = ImportOptions()
+    import_options.externalWeightsPath = os.path.join(temp_dir, "weights.bin")
+    import_options.externalWeightsThreshold = 32
+    mb.import_module(recursivescriptmodule._c, importOptions=import_options)
+    # The data is written at aligned offsets, in import order.
+    data = open(import_options.externalWeightsPath, "rb").read()
+    assert len(data) == 64 + 5 * 8
+    assert np.array_equal(np.frombuffer(data[:64], dtype=np.float32),
+                          np.arange(16.0, dtype=np.float32))
+    assert np.array_equal(np.frombuffer(data[64:], dtype=np.int64),
+                          np.arange(5))
+
+    # Importing again with the same options appends to the file, leaving the
+    # data referenced by the first module intact.
+    mb2 = ModuleBuilder()
+    mb2.import_module(recursivescriptmodule._c, importOptions=import_options)
+    module2 = str(mb2.module)
+    assert 'weights.bin"[128]' in module2, module2
+    assert 'weights.bin"[192]' in module2, module2
+    data2 = open(import_options.externalWeightsPath, "rb").read()
+    assert len(data2) == 192 + 5 * 8
+    assert data2[:len(data)] == data
+    assert data2[128:192] == data[:64]
+
+mb.module.operation.print()
@@ -0,0 +1,54 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+# Functions imported on multiple threads are emitted in the same order as when
+# imported sequentially.
+
+def import_with_threads(num_threads):
+    mb = ModuleBuilder()
+    import_options = ImportOptions()
+    import_options.numThreads = num_threads
+    # TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+    mb.import_module(recursivescriptmodule._c, importOptions=import_options)
+    return str(mb.module)
+
+# CHECK-LABEL:     func private @__torch__.TestModule.forward
+# CHECK:             constant @__torch__.f0
+# CHECK:             constant @__torch__.f1
+# CHECK:             constant @__torch__.f2
+# CHECK:             constant @__torch__.f3
+# CHECK-LABEL:     func private @__torch__.f0
+# CHECK-LABEL:     func private @__torch__.f1
+# CHECK-LABEL:     func private @__torch__.f2
+# CHECK-LABEL:     func private @__torch__.f3
+
+def f0(x):
+    return x
+def f1(x):
+    return x
+def f2(x):
+    return x
+def f3(x):
+    return x
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+    def forward(self, x):
+        return f3(f2(f1(f0(x))))
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+
+sequential = import_with_threads(1)
+assert import_with_threads(4) == sequential
+assert import_with_threads(0) == sequential
+print(sequential)
@@ -0,0 +1,45 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ModuleBuilder
+
+# RUN: %PYTHON %s | FileCheck %s
+
+mb = ModuleBuilder()
+
+def unused(x):
+    return x
+
+torch.jit.script(unused)
+
+def identity(x):
+    return x
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.t1 = torch.ones(2, 3)
+        self.t2 = torch.ones(4, dtype=torch.int64)
+    def forward(self, x):
+        return identity(x)
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+# TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+mb.import_module(recursivescriptmodule._c)
+statistics = mb.import_statistics
+
+# CHECK: num_class_types 1
+# CHECK: num_methods 1
+# CHECK: num_tensors 2
+# CHECK: tensor_bytes 56
+for name in ["num_class_types", "num_methods", "num_tensors", "tensor_bytes"]:
+    print(name, statistics[name])
+# CHECK: num_functions_unreachable True
+print("num_functions_unreachable", statistics["num_functions_unreachable"] >= 1)
+# CHECK: seconds True
+print("seconds", statistics["total_seconds"] >= statistics["tensors_seconds"] >= 0)
@@ -0,0 +1,42 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.t1 = torch.arange(4.0)
+        self.t2 = torch.arange(4.0)
+        self.t3 = torch.arange(4)
+        self.t4 = torch.arange(4.0).reshape(2, 2)
+
+# CHECK: %[[F32:.*]] = torch.vtensor.literal(dense<[0.000000e+00, 1.000000e+00, 2.000000e+00, 3.000000e+00]> : tensor<4xf32>) : !torch.vtensor<[4],f32>
+# CHECK: %[[T1:.*]] = torch.copy.to_tensor %[[F32]] : !torch.tensor<[4],f32>
+# CHECK: %[[T2:.*]] = torch.copy.to_tensor %[[F32]] : !torch.tensor<[4],f32>
+# CHECK: %[[SI64:.*]] = torch.vtensor.literal(dense<[0, 1, 2, 3]> : tensor<4xsi64>) : !torch.vtensor<[4],si64>
+# CHECK: %[[T3:.*]] = torch.copy.to_tensor %[[SI64]] : !torch.tensor<[4],si64>
+# CHECK: %[[F32_2D:.*]] = torch.vtensor.literal({{.*}} : tensor<2x2xf32>) : !torch.vtensor<[2,2],f32>
+# CHECK: %[[T4:.*]] = torch.copy.to_tensor %[[F32_2D]] : !torch.tensor<[2,2],f32>
+# CHECK: torch.nn_module  {
+# CHECK:   torch.slot "t1", %[[T1]] : !torch.tensor<[4],f32>
+# CHECK:   torch.slot "t2", %[[T2]] : !torch.tensor<[4],f32>
+# CHECK:   torch.slot "t3", %[[T3]] : !torch.tensor<[4],si64>
+# CHECK:   torch.slot "t4", %[[T4]] : !torch.tensor<[2,2],f32>
+# CHECK: }
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+import_options = ImportOptions()
+import_options.deduplicateTensorContents = True
+# TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+mb.import_module(recursivescriptmodule._c, importOptions=import_options)
+mb.module.operation.print()
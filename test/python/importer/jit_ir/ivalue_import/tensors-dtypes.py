@@ -0,0 +1,38 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ModuleBuilder
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.t_bool = torch.tensor([True, False, True, True, False, False, True, False, True])
+        self.t_bool_splat = torch.ones(2, 5, dtype=torch.bool)
+        self.t_uint8 = torch.tensor([0, 1, 255], dtype=torch.uint8)
+        self.t_int8 = torch.tensor([-128, 0, 127], dtype=torch.int8)
+        self.t_int16 = torch.tensor([-32768, 0, 32767], dtype=torch.int16)
+        self.t_float16 = torch.tensor([0.0, 1.0, -2.5], dtype=torch.float16)
+        self.t_bfloat16 = torch.tensor([0.0, 1.0, -2.5], dtype=torch.bfloat16)
+
+# CHECK-DAG: torch.tensor.literal(dense<[true, false, true, true, false, false, true, false, true]> : tensor<9xi1>) : !torch.tensor<[9],i1>
+# CHECK-DAG: torch.tensor.literal(dense<true> : tensor<2x5xi1>) : !torch.tensor<[2,5],i1>
+# CHECK-DAG: torch.tensor.literal(dense<[0, 1, 255]> : tensor<3xui8>) : !torch.tensor<[3],ui8>
+# CHECK-DAG: torch.tensor.literal(dense<[-128, 0, 127]> : tensor<3xsi8>) : !torch.tensor<[3],si8>
+# CHECK-DAG: torch.tensor.literal(dense<[-32768, 0, 32767]> : tensor<3xsi16>) : !torch.tensor<[3],si16>
+# CHECK-DAG: torch.tensor.literal(dense<[0.000000e+00, 1.000000e+00, -2.500000e+00]> : tensor<3xf16>) : !torch.tensor<[3],f16>
+# CHECK-DAG: torch.tensor.literal(dense<[0.000000e+00, 1.000000e+00, -2.500000e+00]> : tensor<3xbf16>) : !torch.tensor<[3],bf16>
+
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+# TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+mb.import_module(recursivescriptmodule._c)
+mb.module.operation.print()
@@ -0,0 +1,30 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ModuleBuilder
+
+# RUN: not %PYTHON %s 2>&1 | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        # Sparse tensors are checked for aliasing through the storages of their
+        # indices and values.
+        # CHECK: Unhandled tensor that shares storage with another tensor.
+        # CHECK-NEXT: Found at path '<root>.coo' from root object '__torch__.TestModule'
+        self.values = torch.tensor([1.0, 2.0])
+        self.coo = torch.sparse_coo_tensor(torch.tensor([[0, 1], [1, 0]]),
+                                           self.values, (2, 2))
+
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+# TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+mb.import_module(recursivescriptmodule._c)
+mb.module.operation.print()
@@ -0,0 +1,33 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import typing
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ModuleBuilder
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        # Deliberately uncoalesced, to check that the importer coalesces it.
+        self.coo = torch.sparse_coo_tensor(
+            torch.tensor([[1, 0, 1], [2, 1, 2]]), torch.tensor([1.0, 2.0, 3.0]),
+            (2, 3))
+        self.csr = torch.sparse_csr_tensor(
+            torch.tensor([0, 1, 1, 3]), torch.tensor([2, 0, 1]),
+            torch.tensor([4, 5, 6]), (3, 3))
+
+# CHECK-DAG: torch.tensor.literal(sparse<{{\[}}[0, 1], [1, 2]], [2.000000e+00, 4.000000e+00]> : tensor<2x3xf32>) : !torch.tensor<[2,3],f32>
+# CHECK-DAG: torch.tensor.literal(sparse<{{\[}}[0, 2], [2, 0], [2, 1]], [4, 5, 6]> : tensor<3x3xsi64>) : !torch.tensor<[3,3],si64>
+
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+# TODO: Automatically handle unpacking Python class RecursiveScriptModule into the underlying ScriptModule.
+mb.import_module(recursivescriptmodule._c)
+mb.module.operation.print()
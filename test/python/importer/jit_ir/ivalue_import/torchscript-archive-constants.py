@@ -0,0 +1,46 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import os
+import tempfile
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+from torch_mlir.dialects.torch.importer.jit_ir.torchscript_archive import load_torchscript_archive
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.weight = torch.nn.Parameter(torch.arange(3.0))
+        self.t = torch.arange(5)
+        self.transposed = torch.arange(6.0).reshape(2, 3).t()
+
+    def forward(self, x):
+        return x * self.weight
+
+# Freezing turns `weight` into a constant of the code, which is imported with
+# its data. The preserved attribute `t` still references the archive, while
+# the non-contiguous `transposed` can't, so it is loaded with its data.
+# CHECK-DAG: torch.tensor.literal(dense<[0.000000e+00, 1.000000e+00, 2.000000e+00]> : tensor<3xf32>)
+# CHECK-DAG: torch.vtensor.external_literal "{{.*}}model.pt"[{{[0-9]+}}] : !torch.vtensor<[5],si64>
+# CHECK-DAG: torch.tensor.literal(dense<{{.*}}> : tensor<3x2xf32>)
+
+test_module = TestModule().eval()
+frozen = torch.jit.freeze(torch.jit.script(test_module), preserved_attrs=["t", "transposed"])
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    archive_path = os.path.join(temp_dir, "model.pt")
+    torch.jit.save(frozen, archive_path)
+    import_options = ImportOptions()
+    scripted = load_torchscript_archive(archive_path, import_options)
+    assert scripted.t.is_meta
+    assert torch.equal(scripted.transposed, test_module.transposed)
+    assert sorted(import_options.externalTensorLocations.keys()) == ["t"]
+    mb.import_module(scripted._c, importOptions=import_options)
+
+mb.module.operation.print()
@@ -0,0 +1,43 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import os
+import tempfile
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+from torch_mlir.dialects.torch.importer.jit_ir.torchscript_archive import load_torchscript_archive
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.l = [torch.arange(2.0), torch.arange(3.0)]
+        self.t = (torch.arange(4), 1)
+        self.d = {"a": torch.ones(5)}
+
+# Tensors in containers are named by their index or key, as the importer
+# does, so they also reference the archive.
+# CHECK-DAG: torch.vtensor.external_literal "{{.*}}model.pt"[{{[0-9]+}}] : !torch.vtensor<[2],f32>
+# CHECK-DAG: torch.vtensor.external_literal "{{.*}}model.pt"[{{[0-9]+}}] : !torch.vtensor<[3],f32>
+# CHECK-DAG: torch.vtensor.external_literal "{{.*}}model.pt"[{{[0-9]+}}] : !torch.vtensor<[4],si64>
+# CHECK-DAG: torch.vtensor.external_literal "{{.*}}model.pt"[{{[0-9]+}}] : !torch.vtensor<[5],f32>
+# CHECK-NOT: torch.tensor.literal
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    archive_path = os.path.join(temp_dir, "model.pt")
+    torch.jit.save(recursivescriptmodule, archive_path)
+    import_options = ImportOptions()
+    scripted = load_torchscript_archive(archive_path, import_options)
+    locations = import_options.externalTensorLocations
+    assert sorted(locations.keys()) == ["d.a", "l.0", "l.1", "t.0"], locations
+    mb.import_module(scripted._c, importOptions=import_options)
+
+mb.module.operation.print()
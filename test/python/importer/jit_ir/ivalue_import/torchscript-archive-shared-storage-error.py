@@ -0,0 +1,38 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import os
+import tempfile
+
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+from torch_mlir.dialects.torch.importer.jit_ir.torchscript_archive import load_torchscript_archive
+
+# RUN: not %PYTHON %s 2>&1 | FileCheck %s
+
+mb = ModuleBuilder()
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        base = torch.arange(6.0).reshape(2, 3)
+        # Both parameters are views of `base`, so they share one storage
+        # record in the archive.
+        self.a = torch.nn.Parameter(base[0])
+        self.b = torch.nn.Parameter(base[1])
+
+# CHECK: Unhandled tensor that shares storage with another tensor.
+# CHECK-NEXT: Found at path '<root>.b' (sharing with '<root>.a')
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    archive_path = os.path.join(temp_dir, "model.pt")
+    torch.jit.save(recursivescriptmodule, archive_path)
+    import_options = ImportOptions()
+    scripted = load_torchscript_archive(archive_path, import_options)
+    mb.import_module(scripted._c, importOptions=import_options)
+
+mb.module.operation.print()
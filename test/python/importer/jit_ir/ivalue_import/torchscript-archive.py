@@ -0,0 +1,53 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import os
+import tempfile
+
+import numpy as np
+import torch
+from torch_mlir.dialects.torch.importer.jit_ir import ImportOptions, ModuleBuilder
+from torch_mlir.dialects.torch.importer.jit_ir.torchscript_archive import load_torchscript_archive
+
+# RUN: %PYTHON %s | torch-mlir-opt | FileCheck %s
+
+mb = ModuleBuilder()
+
+class Submodule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.weight = torch.nn.Parameter(torch.arange(6.0).reshape(2, 3))
+
+class TestModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.s = Submodule()
+        self.t = torch.arange(5)
+
+# CHECK-DAG: %[[WEIGHT:.*]] = torch.vtensor.external_literal "{{.*}}model.pt"[{{[0-9]+}}] : !torch.vtensor<[2,3],f32>
+# CHECK-DAG: %[[T:.*]] = torch.vtensor.external_literal "{{.*}}model.pt"[{{[0-9]+}}] : !torch.vtensor<[5],si64>
+# CHECK-NOT: torch.tensor.literal
+
+test_module = TestModule()
+recursivescriptmodule = torch.jit.script(test_module)
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    archive_path = os.path.join(temp_dir, "model.pt")
+    torch.jit.save(recursivescriptmodule, archive_path)
+    import_options = ImportOptions()
+    scripted = load_torchscript_archive(archive_path, import_options)
+    assert scripted.t.is_meta
+    # The locations point at the tensor data in the archive itself.
+    locations = import_options.externalTensorLocations
+    assert sorted(locations.keys()) == ["s.weight", "t"]
+    with open(archive_path, "rb") as f:
+        f.seek(locations["s.weight"][1])
+        assert np.array_equal(np.frombuffer(f.read(6 * 4), dtype=np.float32),
+                              np.arange(6.0, dtype=np.float32))
+        f.seek(locations["t"][1])
+        assert np.array_equal(np.frombuffer(f.read(5 * 8), dtype=np.int64),
+                              np.arange(5))
+    mb.import_module(scripted._c, importOptions=import_options)
+
+mb.module.operation.print()
@@ -0,0 +1,28 @@
+# -*- Python -*-
+# This file is licensed under a pytorch-style license
+# See LICENSE.pytorch for license information.
+
+import sys
+
+from torch_mlir.ir import Context, Module
+from torch_mlir.dialects.torch.importer.jit_ir import ModuleBuilder
+
+# RUN: %PYTHON %s | FileCheck %s
+
+# Building several modules in the same context sets the context up only once,
+# so diagnostics are reported once instead of once per ModuleBuilder.
+context = Context()
+for _ in range(3):
+    mb = ModuleBuilder(context)
+
+sys.stderr = sys.stdout
+try:
+    Module.parse("func @f() {", context)
+except Exception:
+    pass
+sys.stderr = sys.__stderr__
+
+# CHECK: error:
+# CHECK-NOT: error:
+# CHECK: DONE
+print("DONE")
@@ -0,0 +1,12 @@
+#!/bin/bash
+set -euo pipefail
+
+src_dir="$(realpath $(dirname $0)/..)"
+
+cd "$src_dir"
+
+# Ensure PYTHONPATH is set for export to child processes, even if empty.
+export PYTHONPATH=${PYTHONPATH-}
+source .env
+
+python -m torch_mlir_e2e_test.compile_time_benchmarks "$@"